@@ -0,0 +1,51 @@
+import sys
+import time
+from pathlib import Path
+
+# Os benchmarks importam os módulos do projeto direto das pastas do repositório
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "projetos" / "integrador-crm"))
+
+import caminhos  # noqa: E402,F401
+from cliente_http import criar_sessao, metricas_conexoes  # noqa: E402
+from enriquecimento import enriquecer_leads  # noqa: E402
+from servidor_fake import ServidorFake  # noqa: E402
+
+# --- BENCHMARK: ENRIQUECIMENTO CONCORRENTE ---
+# Mede quantos leads por segundo conseguimos processar com diferentes
+# níveis de concorrência, contra o servidor fake (latência fixa por requisição).
+# Uso: python benchmarks/bench_enriquecimento.py
+
+TOTAL_IDS = 400
+LATENCIA = 0.02  # 20 ms por requisição
+NIVEIS_CONCORRENCIA = [1, 4, 16, 64]
+
+
+def medir(base_url, ids, max_concorrencia):
+    with criar_sessao(max_por_host=max_concorrencia) as sessao:
+        inicio = time.perf_counter()
+        resultados = list(enriquecer_leads(ids, max_concorrencia, base_url, sessao))
+        duracao = time.perf_counter() - inicio
+        conexoes = metricas_conexoes(sessao)
+
+    # Conferindo que a ordem de saída é a mesma da entrada
+    assert [r.id_usuario for r in resultados] == ids
+    return duracao, conexoes
+
+
+if __name__ == "__main__":
+    # Metade dos IDs existe, metade devolve 404 (exercita os dois caminhos)
+    ids = list(range(1, TOTAL_IDS + 1))
+
+    with ServidorFake(latencia=LATENCIA, total_usuarios=TOTAL_IDS // 2) as servidor:
+        print(f"{TOTAL_IDS} IDs, latência de {LATENCIA * 1000:.0f} ms por requisição\n")
+        print(f"{'concorrência':>12} | {'tempo (s)':>9} | {'leads/s':>8} | {'ganho':>6} | conexões abertas")
+
+        base = None
+        for nivel in NIVEIS_CONCORRENCIA:
+            duracao, conexoes = medir(servidor.base_url, ids, nivel)
+            base = base or duracao
+            print(
+                f"{nivel:>12} | {duracao:>9.2f} | {TOTAL_IDS / duracao:>8.0f} | {base / duracao:>5.1f}x"
+                f" | {conexoes.conexoes_abertas}"
+            )
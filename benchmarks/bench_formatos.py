@@ -0,0 +1,73 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "snippets"))
+
+from escrita_relatorios import salvar_dataframe  # noqa: E402
+
+# --- BENCHMARK: FORMATOS DE RELATÓRIO ---
+# Grava e lê o mesmo relatório (no formato do Integrador CRM) em CSV, XLSX, Parquet e Arrow,
+# comparando tempo de escrita, tempo de leitura (pandas) e tamanho do arquivo.
+# Uso: python benchmarks/bench_formatos.py [linhas] [--sem-xlsx]
+# (o XLSX com 1 milhão de linhas leva alguns minutos: --sem-xlsx pula ele)
+
+LINHAS_PADRAO = 1_000_000
+
+TIPOS = {"ID": "int64", "Nome": "string", "Email": "string", "Cidade": "string", "Status": "category"}
+
+CIDADES = ["São Paulo", "Rio de Janeiro", "Belo Horizonte", "Curitiba", "Porto Alegre", "Recife", "Salvador"]
+
+LEITORES = {
+    ".csv": pd.read_csv,
+    ".xlsx": pd.read_excel,
+    ".parquet": pd.read_parquet,
+    ".arrow": pd.read_feather,
+}
+
+
+def gerar_relatorio(linhas, semente=42):
+    gerador = np.random.default_rng(semente)
+    ids = np.arange(1, linhas + 1)
+    nomes = pd.Series(ids).map("Cliente {:07d}".format)
+    # 3% de "Não Encontrado", como os 404 do integrador
+    nao_encontrado = gerador.random(linhas) < 0.03
+    return pd.DataFrame(
+        {
+            "ID": ids,
+            "Nome": nomes.where(~nao_encontrado, "Não Encontrado"),
+            "Email": ("cliente" + pd.Series(ids).astype(str) + "@exemplo.com.br").where(~nao_encontrado, "-"),
+            "Cidade": pd.Series(gerador.choice(CIDADES, size=linhas)).where(~nao_encontrado, "-"),
+            "Status": pd.Series(np.where(nao_encontrado, "Erro na Consulta", "Ativo")),
+        }
+    )
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    argumentos = [argumento for argumento in sys.argv[1:] if not argumento.startswith("--")]
+    linhas = int(argumentos[0]) if argumentos else LINHAS_PADRAO
+    sufixos = [sufixo for sufixo in LEITORES if not (sufixo == ".xlsx" and "--sem-xlsx" in sys.argv)]
+
+    df = gerar_relatorio(linhas)
+    print(f"{linhas:,} linhas (pandas {pd.__version__})\n")
+    print(f"{'formato':<10} {'escrita(s)':>10} {'leitura(s)':>10} {'tamanho(MB)':>12}")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for sufixo in sufixos:
+            arquivo = Path(pasta) / f"relatorio{sufixo}"
+            _, t_escrita = medir(lambda: salvar_dataframe(df, arquivo, tipos=TIPOS))
+            lido, t_leitura = medir(lambda: LEITORES[sufixo](arquivo))
+            assert len(lido) == linhas and list(lido.columns) == list(df.columns)
+            tamanho = arquivo.stat().st_size / 1024 / 1024
+            print(f"{sufixo[1:]:<10} {t_escrita:>10.2f} {t_leitura:>10.2f} {tamanho:>12.1f}")
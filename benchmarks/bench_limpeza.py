@@ -0,0 +1,94 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "snippets"))
+
+from limpeza_dados import converter_data, converter_moeda_brl  # noqa: E402
+
+# --- BENCHMARK: LIMPEZA DE MOEDA E DATAS ---
+# Compara a cadeia de .str.replace da seção 7 do arsenal_pandas.py
+# com as funções vetorizadas de snippets/limpeza_dados.py.
+# Uso: python benchmarks/bench_limpeza.py [linhas]
+
+LINHAS_PADRAO = 1_000_000
+
+
+def gerar_dados(linhas, distintos, semente=42):
+    gerador = np.random.default_rng(semente)
+    # 'distintos' controla quantos valores diferentes existem (exportações repetem muito)
+    centavos = gerador.integers(0, distintos, size=linhas) * 37
+    # Formatando "R$ 12.345,67"
+    valores = pd.Series(centavos // 100).map("{:,}".format).str.replace(",", ".")
+    moeda = "R$ " + valores + "," + pd.Series(centavos % 100).map("{:02d}".format)
+    dias = pd.Timestamp("2020-01-01") + pd.to_timedelta(gerador.integers(0, 1500, size=linhas), unit="D")
+    datas = pd.Series(dias.strftime("%Y-%m-%d"))
+    # 1% de lixo, para exercitar o caminho de valor inválido
+    lixo = gerador.random(linhas) < 0.01
+    moeda[lixo] = "valor_invalido"
+    datas[lixo] = "invalid_date"
+    return moeda, datas
+
+
+def moeda_cadeia_replace(serie):
+    # Igual ao arsenal_pandas.py, mas com errors="coerce" (o astype(float) quebraria no lixo)
+    texto = serie.str.replace("R$ ", "").str.replace(".", "").str.replace(",", ".")
+    return pd.to_numeric(texto, errors="coerce")
+
+
+def medir(funcao, serie, repeticoes=3):
+    # Melhor de N execuções: reduz o ruído de outros processos na máquina
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(serie)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return resultado, melhor
+
+
+def comparar(nome, antiga, nova, serie, conferir):
+    r_antigo, t_antigo = medir(antiga, serie)
+    r_novo, t_novo = medir(nova, serie)
+    conferir(r_antigo, r_novo)
+    print(f"{nome:<42} {t_antigo:>9.3f} {t_novo:>9.3f} {t_antigo / t_novo:>7.1f}x")
+
+
+def mesmos_numeros(a, b):
+    assert np.allclose(a.to_numpy(dtype=float), b.to_numpy(dtype=float), equal_nan=True)
+
+
+def mesmas_datas(a, b):
+    assert (a.isna() == b.isna()).all() and (a.dropna() == b.dropna()).all()
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else LINHAS_PADRAO
+    print(f"{linhas:,} linhas (pandas {pd.__version__})\n")
+    print(f"{'cenário':<42} {'antigo(s)':>9} {'novo(s)':>9} {'ganho':>8}")
+
+    for distintos in (linhas, 5_000):
+        moeda, datas = gerar_dados(linhas, distintos)
+        rotulo = "todos distintos" if distintos == linhas else f"{distintos:,} distintos"
+
+        # dtype object (pandas 1.x/2.x) e string do pyarrow (padrão do pandas 3)
+        for dtype in (object, "string[pyarrow]"):
+            nome_dtype = "object" if dtype is object else "string"
+            comparar(
+                f"moeda [{nome_dtype}, {rotulo}]",
+                moeda_cadeia_replace,
+                converter_moeda_brl,
+                moeda.astype(dtype),
+                mesmos_numeros,
+            )
+
+        comparar(
+            f"datas [{datas.nunique():,} distintas]",
+            lambda serie: pd.to_datetime(serie, errors="coerce"),
+            converter_data,
+            datas,
+            mesmas_datas,
+        )
@@ -0,0 +1,70 @@
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "snippets"))
+
+from observador_inbox import ObservadorInbox, consumidor_mover, consumir, inotify_disponivel  # noqa: E402
+
+# --- BENCHMARK: LATÊNCIA INBOX -> PROCESSADOS ---
+# Solta arquivos na inbox (um a cada 20 ms, com outros milhares parados em subpastas)
+# e mede quanto tempo cada um leva até sair da pasta para processed/.
+# Compara o observador com inotify e com polling (varredura completa a cada intervalo).
+# Uso: python benchmarks/bench_observador.py [arquivos_parados]
+
+ARQUIVOS_PARADOS_PADRAO = 20_000
+ARQUIVOS_MEDIDOS = 50
+
+
+def medir(pasta, usar_inotify, intervalo_polling=1.0):
+    inbox, processados = pasta / "inbox", pasta / "processed"
+    criados = {}
+    movidos = {}
+
+    def consumidor(lote):
+        resultado = mover(lote)
+        agora = time.monotonic()
+        for caminho in lote:
+            movidos.setdefault(caminho, agora)
+        return resultado
+
+    mover = consumidor_mover(inbox, processados)
+    with ObservadorInbox(inbox, "*.txt", usar_inotify=usar_inotify, intervalo_polling=intervalo_polling) as observador:
+        consumo = threading.Thread(target=consumir, args=(observador, consumidor))
+        consumo.start()
+        time.sleep(0.5)
+        for i in range(ARQUIVOS_MEDIDOS):
+            caminho = inbox / f"novo_{i:03d}.txt"
+            caminho.write_text("pedido")
+            criados[str(caminho)] = time.monotonic()
+            time.sleep(0.02)
+        while len(movidos) < ARQUIVOS_MEDIDOS and time.monotonic() - min(criados.values()) < 30:
+            time.sleep(0.1)
+    consumo.join()
+
+    latencias = sorted((movidos[caminho] - criado) * 1000 for caminho, criado in criados.items() if caminho in movidos)
+    p95 = latencias[int(len(latencias) * 0.95) - 1]
+    print(
+        f"{observador.modo:<16} {statistics.median(latencias):>8.0f} {p95:>8.0f} "
+        f"{observador.varreduras_completas:>11}"
+    )
+
+
+if __name__ == "__main__":
+    parados = int(sys.argv[1]) if len(sys.argv) > 1 else ARQUIVOS_PARADOS_PADRAO
+    print(f"{ARQUIVOS_MEDIDOS} arquivos novos, {parados:,} arquivos parados em subpastas (.csv, não casam)\n")
+    print(f"{'modo':<16} {'p50(ms)':>8} {'p95(ms)':>8} {'varreduras':>11}")
+
+    modos = ([True] if inotify_disponivel() else []) + [False]
+    for usar_inotify in modos:
+        with tempfile.TemporaryDirectory() as pasta:
+            pasta = Path(pasta)
+            for i in range(parados):
+                subpasta = pasta / "inbox" / f"arquivo_morto_{i // 1000:03d}"
+                subpasta.mkdir(parents=True, exist_ok=True)
+                (subpasta / f"antigo_{i:06d}.csv").write_text("x")
+            medir(pasta, usar_inotify)
@@ -0,0 +1,95 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "snippets"))
+
+from escrita_relatorios import abrir_escritor  # noqa: E402
+from limpeza_dados import converter_data, converter_moeda_brl  # noqa: E402
+from pipeline import Pipeline  # noqa: E402
+
+# --- BENCHMARK: PIPELINE x ETAPAS EM SEQUÊNCIA ---
+# Simula a automação de sempre em blocos: "consulta" (espera de rede, com sleep),
+# limpeza de moeda/datas com pandas (limpeza_dados.py) e escrita do relatório.
+# Em sequência, cada bloco passa pelas três etapas antes do próximo começar;
+# na pipeline (snippets/pipeline.py) elas se sobrepõem, ligadas por filas limitadas.
+# O segundo cenário grava em .xlsx (escrita lenta): a pipeline fica limitada pela escrita,
+# e o relatório de utilização aponta a escrita como gargalo.
+# Uso: python benchmarks/bench_pipeline.py [blocos]
+
+BLOCOS_PADRAO = 100
+LINHAS_POR_BLOCO = 2_000
+LATENCIA_CONSULTA_S = 0.05
+TRABALHADORES_CONSULTA = 8
+COLUNAS = ["id", "valor", "data"]
+
+
+def gerar_bloco(numero, semente=42):
+    gerador = np.random.default_rng(semente + numero)
+    centavos = gerador.integers(0, 5_000, size=LINHAS_POR_BLOCO) * 37
+    valores = pd.Series(centavos // 100).map("{:,}".format).str.replace(",", ".")
+    moeda = "R$ " + valores + "," + pd.Series(centavos % 100).map("{:02d}".format)
+    dias = pd.Timestamp("2020-01-01") + pd.to_timedelta(gerador.integers(0, 1500, size=LINHAS_POR_BLOCO), unit="D")
+    inicio = numero * LINHAS_POR_BLOCO
+    ids = range(inicio, inicio + LINHAS_POR_BLOCO)
+    return pd.DataFrame({"id": ids, "valor": moeda, "data": dias.strftime("%d/%m/%Y")})
+
+
+def consultar(dados):
+    # A "API": só espera (como a rede) e devolve o bloco já montado
+    time.sleep(LATENCIA_CONSULTA_S)
+    return dados
+
+
+def limpar(df):
+    df = df.copy()
+    df["valor"] = converter_moeda_brl(df["valor"])
+    df["data"] = converter_data(df["data"])
+    return df
+
+
+def em_sequencia(blocos, escritor):
+    for bloco in blocos:
+        escritor.escrever_bloco(limpar(consultar(bloco)))
+
+
+def em_pipeline(blocos, escritor):
+    pipeline = Pipeline(tamanho_fila=4)
+    pipeline.etapa("consulta", consultar, trabalhadores=TRABALHADORES_CONSULTA)
+    pipeline.etapa("limpeza", limpar)
+    pipeline.etapa("escrita", escritor.escrever_bloco, em_ordem=True)
+    return pipeline.executar(blocos)
+
+
+def medir(funcao, blocos, sufixo):
+    with tempfile.TemporaryDirectory() as pasta:
+        destino = Path(pasta) / f"relatorio{sufixo}"
+        inicio = time.perf_counter()
+        with abrir_escritor(destino, COLUNAS) as escritor:
+            retorno = funcao(blocos, escritor)
+        segundos = time.perf_counter() - inicio
+        linhas = escritor.linhas_escritas
+    return segundos, linhas, retorno
+
+
+if __name__ == "__main__":
+    total_blocos = int(sys.argv[1]) if len(sys.argv) > 1 else BLOCOS_PADRAO
+    # Blocos gerados antes do cronômetro: medimos só consulta + limpeza + escrita
+    blocos = [gerar_bloco(numero) for numero in range(total_blocos)]
+    print(
+        f"{total_blocos} blocos x {LINHAS_POR_BLOCO:,} linhas | consulta: {LATENCIA_CONSULTA_S * 1000:.0f} ms "
+        f"por bloco, {TRABALHADORES_CONSULTA} threads na pipeline\n"
+    )
+
+    for sufixo in (".parquet", ".xlsx"):
+        t_sequencia, linhas, _ = medir(em_sequencia, blocos, sufixo)
+        t_pipeline, linhas_pipeline, relatorio = medir(em_pipeline, blocos, sufixo)
+        assert linhas == linhas_pipeline == total_blocos * LINHAS_POR_BLOCO
+        ganho = t_sequencia / t_pipeline
+        print(f"{sufixo:<9} em sequência: {t_sequencia:6.2f}s | pipeline: {t_pipeline:6.2f}s ({ganho:.1f}x)")
+        print(f"{relatorio}\n")
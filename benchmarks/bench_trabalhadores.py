@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "snippets"))
+
+from trabalhadores_python import PoolPython  # noqa: E402
+
+# --- BENCHMARK: PYTHON FRIO (subprocess.run) x TRABALHADORES QUENTES ---
+# Roda o mesmo script pequeno (com env e cwd próprios, como no arsenal_subprocess.py)
+# N vezes, e compara tarefas por segundo:
+# - frio: um "python -c" novo por tarefa (serial e com 'paralelo' ao mesmo tempo)
+# - quente: PoolPython com 'paralelo' trabalhadores e pandas/requests já importados
+# Uso: python benchmarks/bench_trabalhadores.py [tarefas] [paralelo]
+
+TAREFAS_PADRAO = 200
+
+SCRIPTS = {
+    "script leve": "import os, json; print(json.dumps({'cwd': os.getcwd(), 'senha': os.environ['SENHA_BANCO']}))",
+    "script com pandas": (
+        "import os; import pandas as pd; "
+        "print(pd.DataFrame({'valor': [1.5, 2.5]})['valor'].sum(), os.environ['SENHA_BANCO'])"
+    ),
+}
+
+
+def rodar_frio(codigo, ambiente, pasta):
+    resultado = subprocess.run([sys.executable, "-c", codigo], env=ambiente, cwd=pasta, capture_output=True, text=True)
+    assert resultado.returncode == 0, resultado.stderr
+    return resultado.stdout
+
+
+def medir(funcao, tarefas):
+    inicio = time.perf_counter()
+    funcao()
+    return tarefas / (time.perf_counter() - inicio)
+
+
+if __name__ == "__main__":
+    tarefas = int(sys.argv[1]) if len(sys.argv) > 1 else TAREFAS_PADRAO
+    paralelo = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 4
+
+    ambiente = os.environ.copy()
+    ambiente["SENHA_BANCO"] = "123456"
+
+    with tempfile.TemporaryDirectory() as pasta:
+        inicio = time.perf_counter()
+        pool = PoolPython(tamanho=paralelo).iniciar()
+        print(f"{tarefas} tarefas, {paralelo} em paralelo | partida do pool: {time.perf_counter() - inicio:.2f}s\n")
+        print(f"{'cenário':<20} {'frio serial':>12} {'frio paralelo':>14} {'quente':>10} {'ganho':>7}  (tarefas/s)")
+
+        with ThreadPoolExecutor(max_workers=paralelo) as executor:
+            for nome, codigo in SCRIPTS.items():
+                # Os frios com pandas são lentos: medimos com menos tarefas e convertemos para tarefas/s
+                amostra = max(paralelo, tarefas // 5)
+                frio_serial = medir(lambda: [rodar_frio(codigo, ambiente, pasta) for _ in range(amostra)], amostra)
+                frio_paralelo = medir(
+                    lambda: list(executor.map(lambda _: rodar_frio(codigo, ambiente, pasta), range(amostra))), amostra
+                )
+
+                def quente():
+                    for resultado in pool.mapear([codigo] * tarefas, env=ambiente, cwd=pasta):
+                        assert resultado.sucesso, resultado.erros
+
+                vazao_quente = medir(quente, tarefas)
+                print(
+                    f"{nome:<20} {frio_serial:>12.1f} {frio_paralelo:>14.1f} {vazao_quente:>10.1f} "
+                    f"{vazao_quente / max(frio_serial, frio_paralelo):>6.0f}x"
+                )
+        pool.fechar()
@@ -0,0 +1,72 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "snippets"))
+
+from movimentacao_arquivos import mover_arquivos  # noqa: E402
+from varredura_arquivos import varrer  # noqa: E402
+
+# --- BENCHMARK: VARREDURA E MOVIMENTAÇÃO DA INBOX ---
+# Compara o fluxo do arsenal_pathlib.py (rglob + exists() + replace(), um arquivo por vez)
+# com varredura_arquivos.varrer + movimentacao_arquivos.mover_arquivos.
+# Uso: python benchmarks/bench_varredura.py [arquivos] [pasta_base]
+# (pasta_base permite medir num disco de rede/compartilhamento, onde o paralelismo mais ajuda)
+
+ARQUIVOS_PADRAO = 100_000
+ARQUIVOS_POR_PASTA = 500
+
+
+def criar_inbox(inbox, arquivos):
+    # Duas camadas de subpastas: inbox/loja_003/dia_07/pedido_000123.txt
+    for i in range(arquivos):
+        pasta = inbox / f"loja_{i // (ARQUIVOS_POR_PASTA * 10):03d}" / f"dia_{i // ARQUIVOS_POR_PASTA % 10:02d}"
+        if i % ARQUIVOS_POR_PASTA == 0:
+            pasta.mkdir(parents=True, exist_ok=True)
+        (pasta / f"pedido_{i:06d}.txt").write_text("x")
+
+
+def mover_serial(inbox, processados):
+    movidos = 0
+    for arquivo in inbox.rglob("*.txt"):
+        if arquivo.exists():
+            destino = processados / arquivo.relative_to(inbox)
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            arquivo.replace(destino)
+            movidos += 1
+    return movidos
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    arquivos = int(sys.argv[1]) if len(sys.argv) > 1 else ARQUIVOS_PADRAO
+    pasta_base = sys.argv[2] if len(sys.argv) > 2 else None
+
+    with tempfile.TemporaryDirectory(dir=pasta_base) as pasta:
+        pasta = Path(pasta)
+        print(f"{arquivos:,} arquivos em {pasta}\n")
+
+        criar_inbox(pasta / "inbox_serial", arquivos)
+        criar_inbox(pasta / "inbox_paralelo", arquivos)
+
+        encontrados, t_rglob = medir(lambda: sum(1 for _ in (pasta / "inbox_serial").rglob("*.txt")))
+        print(f"varredura rglob:          {t_rglob:6.2f}s ({encontrados:,} arquivos)")
+        encontrados, t_varrer = medir(lambda: sum(1 for _ in varrer(pasta / "inbox_paralelo", "*.txt")))
+        print(f"varredura scandir (pool): {t_varrer:6.2f}s ({encontrados:,} arquivos)  {t_rglob / t_varrer:.1f}x\n")
+
+        movidos, t_serial = medir(lambda: mover_serial(pasta / "inbox_serial", pasta / "processed_serial"))
+        print(f"mover serial:   {t_serial:6.2f}s ({movidos / t_serial:,.0f} arquivos/s)")
+        resultado, t_paralelo = medir(
+            lambda: mover_arquivos(
+                varrer(pasta / "inbox_paralelo", "*.txt"), pasta / "inbox_paralelo", pasta / "processed_paralelo"
+            )
+        )
+        print(f"mover em lotes: {t_paralelo:6.2f}s | {resultado}  {t_serial / t_paralelo:.1f}x")
+        assert resultado.movidos == movidos == arquivos
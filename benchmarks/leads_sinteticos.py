@@ -0,0 +1,46 @@
+import random
+import sys
+from pathlib import Path
+
+# --- LISTAS DE LEADS SINTÉTICAS ---
+# Gera listas de IDs parecidas com as que o Marketing manda (ordem embaralhada, alguns repetidos),
+# sempre iguais para a mesma semente: o benchmark de hoje e o de daqui a um mês medem a mesma entrada.
+# Os arquivos seguem o formato do observar_inbox.py (um ID por linha, # para comentário).
+# Uso: python benchmarks/leads_sinteticos.py [pasta_destino]
+# (gera leads_1k.txt, leads_10k.txt, leads_100k.txt e leads_1m.txt)
+
+TAMANHOS = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+PASTA_PADRAO = Path(__file__).resolve().parent / "dados"
+
+
+def gerar_ids(quantidade, total_usuarios=None, fracao_repetidos=0.01, semente=42):
+    """
+    'quantidade' IDs entre 1 e total_usuarios (padrão: a própria quantidade), em ordem embaralhada.
+
+    Uma fração 'fracao_repetidos' são IDs que já apareceram antes na lista (planilhas coladas
+    umas nas outras). Os 404 ficam por conta do servidor fake (taxa_404), não da lista.
+    """
+    total_usuarios = total_usuarios or quantidade
+    sorteador = random.Random(semente)
+    distintos = quantidade - int(quantidade * fracao_repetidos)
+    ids = sorteador.sample(range(1, total_usuarios + 1), min(distintos, total_usuarios))
+    while len(ids) < quantidade:
+        ids.append(ids[sorteador.randrange(len(ids))])
+    return ids
+
+
+def salvar_lista(ids, arquivo):
+    arquivo = Path(arquivo)
+    arquivo.parent.mkdir(parents=True, exist_ok=True)
+    with open(arquivo, "w", encoding="utf-8") as saida:
+        saida.write(f"# {len(ids)} IDs sintéticos (benchmarks/leads_sinteticos.py)\n")
+        saida.writelines(f"{id_usuario}\n" for id_usuario in ids)
+    return arquivo
+
+
+if __name__ == "__main__":
+    pasta = Path(sys.argv[1]) if len(sys.argv) > 1 else PASTA_PADRAO
+    for rotulo, quantidade in TAMANHOS.items():
+        arquivo = salvar_lista(gerar_ids(quantidade), pasta / f"leads_{rotulo}.txt")
+        print(f"{quantidade:>9,} IDs -> {arquivo}")
@@ -0,0 +1,295 @@
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# --- SERVIDOR FAKE (IMITAÇÃO DA JSONPLACEHOLDER) ---
+# Um servidor HTTP local para medir os scripts sem depender da internet.
+# Responde /users/{id} com o mesmo formato da API real, e também /users (listagem completa)
+# e /users?id=1&id=3 (filtro em lote), que devolvem uma lista só com os usuários existentes.
+# Apenas os IDs de 1 a TOTAL_USUARIOS existem; o resto devolve 404 (igual ao ID 150).
+# Respostas 200 têm ETag: um If-None-Match igual devolve 304 (Not Modified), sem corpo.
+# Com limite_por_segundo, o excesso de requisições recebe 429 + Retry-After (como uma API real).
+# Também responde /posts, /posts?userId=3 e /posts/{id} (10 posts por usuário, como a API real).
+#
+# Para os benchmarks ficarem parecidos com a API de verdade (e repetíveis):
+# - latencia + variacao_latencia: cada resposta demora latencia + um sorteio entre 0 e variacao_latencia.
+# - taxa_404: fração dos usuários que "não existe" (sempre os mesmos IDs para a mesma semente).
+# - taxa_429 / taxa_500: fração das requisições que falha de forma passageira (a retentativa passa).
+# - tamanho_payload: bytes extras de texto em cada usuário/post (respostas maiores = mais JSON para ler).
+# Os sorteios usam a 'semente': duas execuções com a mesma configuração recebem as mesmas falhas.
+
+TOTAL_USUARIOS = 10
+POSTS_POR_USUARIO = 10
+
+ROTA_USUARIO = re.compile(r"^/users/(\d+)$")
+ROTA_POST = re.compile(r"^/posts/(\d+)$")
+
+
+def montar_usuario(id_usuario, tamanho_payload=0):
+    usuario = {
+        "id": id_usuario,
+        "name": f"Usuário {id_usuario}",
+        "username": f"usuario{id_usuario}",
+        "email": f"usuario{id_usuario}@exemplo.com",
+        "address": {
+            "street": "Rua Exemplo",
+            "suite": f"Apto. {id_usuario}",
+            "city": "São Paulo",
+            "zipcode": "01000-000",
+            "geo": {"lat": "-23.5505", "lng": "-46.6333"},
+        },
+        "phone": "11 99999-0000",
+        "website": "exemplo.com",
+        "company": {"name": "Empresa Exemplo", "catchPhrase": "-", "bs": "-"},
+    }
+    if tamanho_payload:
+        usuario["about"] = _texto(tamanho_payload)
+    return usuario
+
+
+def montar_post(id_post, tamanho_payload=0):
+    return {
+        "userId": (id_post - 1) // POSTS_POR_USUARIO + 1,
+        "id": id_post,
+        "title": f"Post {id_post}",
+        "body": _texto(tamanho_payload) if tamanho_payload else "Conteúdo de exemplo.",
+    }
+
+
+def _texto(tamanho):
+    return ("lorem ipsum " * (tamanho // 12 + 1))[:tamanho]
+
+
+def _sorteio_fixo(semente, valor):
+    # Número entre 0 e 1 que depende só de (semente, valor): o mesmo ID sorteia sempre igual,
+    # não importa a ordem (ou a thread) em que as requisições chegam
+    resumo = hashlib.blake2b(f"{semente}:{valor}".encode(), digest_size=8).digest()
+    return int.from_bytes(resumo, "big") / 2**64
+
+
+class ManipuladorFake(BaseHTTPRequestHandler):
+    # HTTP/1.1 permite keep-alive (reaproveitar a conexão entre requisições)
+    protocol_version = "HTTP/1.1"
+    # Headers e corpo saem em escritas separadas; sem isso o algoritmo de Nagle
+    # + ACK atrasado somam ~40 ms a cada resposta numa conexão reaproveitada
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if not self.server.dentro_do_limite():
+            self.responder_vazio(429, {"Retry-After": "1"})
+            return
+
+        # Simula o tempo de resposta de uma API real na internet
+        time.sleep(self.server.sortear_latencia())
+        self.server.contar_requisicao()
+
+        falha = self.server.sortear_falha()
+        if falha is not None:
+            self.responder_vazio(falha, {"Retry-After": "0"} if falha == 429 else {})
+            return
+
+        servidor = self.server
+        url = urlsplit(self.path)
+        filtros = parse_qs(url.query)
+
+        if url.path == "/users":
+            ids_filtro = filtros.get("id")
+            if ids_filtro is None:
+                ids = range(1, servidor.total_usuarios + 1)
+            else:
+                ids = [int(i) for i in dict.fromkeys(ids_filtro) if i.isdigit()]
+            self.responder(200, [servidor.usuario(i) for i in ids if servidor.existe(i)])
+            return
+
+        if url.path == "/posts":
+            usuarios = filtros.get("userId")
+            if usuarios is None:
+                ids = range(1, servidor.total_usuarios * POSTS_POR_USUARIO + 1)
+            else:
+                ids = [
+                    (int(usuario) - 1) * POSTS_POR_USUARIO + n
+                    for usuario in dict.fromkeys(usuarios)
+                    if usuario.isdigit() and servidor.existe(int(usuario))
+                    for n in range(1, POSTS_POR_USUARIO + 1)
+                ]
+            self.responder(200, [montar_post(i, servidor.tamanho_payload) for i in ids])
+            return
+
+        encontrado = ROTA_USUARIO.match(url.path)
+        if encontrado and servidor.existe(int(encontrado.group(1))):
+            self.responder(200, servidor.usuario(int(encontrado.group(1))))
+            return
+
+        encontrado = ROTA_POST.match(url.path)
+        if encontrado and servidor.existe((int(encontrado.group(1)) - 1) // POSTS_POR_USUARIO + 1):
+            self.responder(200, montar_post(int(encontrado.group(1)), servidor.tamanho_payload))
+            return
+
+        self.responder(404, {})
+
+    def responder(self, status, corpo):
+        dados = json.dumps(corpo).encode("utf-8")
+        etag = f'"{hashlib.md5(dados).hexdigest()}"'
+
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            self.responder_vazio(304, {"ETag": etag})
+            return
+
+        self.server.contar_status(status)
+        self.send_response(status)
+        if status == 200:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def responder_vazio(self, status, headers):
+        self.server.contar_status(status)
+        self.send_response(status)
+        for nome, valor in headers.items():
+            self.send_header(nome, valor)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        # Silencia o log padrão (uma linha por requisição poluiria o benchmark)
+        pass
+
+
+class ServidorFake(ThreadingHTTPServer):
+    daemon_threads = True
+    # Fila de conexões maior, para aguentar muitos clientes simultâneos
+    request_queue_size = 256
+
+    def __init__(
+        self,
+        latencia=0.05,
+        total_usuarios=TOTAL_USUARIOS,
+        porta=0,
+        limite_por_segundo=None,
+        variacao_latencia=0.0,
+        taxa_404=0.0,
+        taxa_429=0.0,
+        taxa_500=0.0,
+        tamanho_payload=0,
+        semente=42,
+    ):
+        super().__init__(("127.0.0.1", porta), ManipuladorFake)
+        self.latencia = latencia
+        self.variacao_latencia = variacao_latencia
+        self.total_usuarios = total_usuarios
+        self.limite_por_segundo = limite_por_segundo
+        self.taxa_404 = taxa_404
+        self.taxa_429 = taxa_429
+        self.taxa_500 = taxa_500
+        self.tamanho_payload = tamanho_payload
+        self.semente = semente
+        # 429 do limite_por_segundo (não conta os 429 sorteados por taxa_429)
+        self.respostas_429 = 0
+        self.requisicoes = 0
+        self.respostas_por_status = Counter()
+        self._janela = (0, 0)  # (segundo atual, requisições nesse segundo)
+        self._sorteador = random.Random(semente)
+        self._trava = threading.Lock()
+
+    def existe(self, id_usuario):
+        if not 1 <= id_usuario <= self.total_usuarios:
+            return False
+        return not self.taxa_404 or _sorteio_fixo(self.semente, id_usuario) >= self.taxa_404
+
+    def usuario(self, id_usuario):
+        return montar_usuario(id_usuario, self.tamanho_payload)
+
+    def sortear_latencia(self):
+        if not self.variacao_latencia:
+            return self.latencia
+        with self._trava:
+            return self.latencia + self._sorteador.uniform(0, self.variacao_latencia)
+
+    def sortear_falha(self):
+        if not (self.taxa_429 or self.taxa_500):
+            return None
+        with self._trava:
+            sorteio = self._sorteador.random()
+        if sorteio < self.taxa_429:
+            return 429
+        if sorteio < self.taxa_429 + self.taxa_500:
+            return 500
+        return None
+
+    def contar_requisicao(self):
+        with self._trava:
+            self.requisicoes += 1
+
+    def contar_status(self, status):
+        with self._trava:
+            self.respostas_por_status[status] += 1
+
+    def dentro_do_limite(self):
+        if self.limite_por_segundo is None:
+            return True
+        with self._trava:
+            segundo = int(time.monotonic())
+            inicio, contagem = self._janela
+            contagem = contagem + 1 if inicio == segundo else 1
+            self._janela = (segundo, contagem)
+            if contagem > self.limite_por_segundo:
+                self.respostas_429 += 1
+                return False
+            return True
+
+    @property
+    def base_url(self):
+        host, porta = self.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    # Context Manager: sobe o servidor numa thread e desliga ao sair do 'with'
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    # Ex: python benchmarks/servidor_fake.py --usuarios 100000 --taxa-404 0.03 --taxa-500 0.01
+    parser = argparse.ArgumentParser(description="Servidor fake da API de usuários (para testes e benchmarks).")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--usuarios", type=int, default=TOTAL_USUARIOS, help="IDs de 1 a N existem")
+    parser.add_argument("--latencia", type=float, default=0.05, help="segundos por resposta")
+    parser.add_argument("--variacao-latencia", type=float, default=0.0, help="segundos extras sorteados (0 a N)")
+    parser.add_argument("--limite-por-segundo", type=int, default=None)
+    parser.add_argument("--taxa-404", type=float, default=0.0)
+    parser.add_argument("--taxa-429", type=float, default=0.0)
+    parser.add_argument("--taxa-500", type=float, default=0.0)
+    parser.add_argument("--tamanho-payload", type=int, default=0, help="bytes extras por usuário/post")
+    parser.add_argument("--semente", type=int, default=42)
+    opcoes = parser.parse_args()
+
+    with ServidorFake(
+        latencia=opcoes.latencia,
+        total_usuarios=opcoes.usuarios,
+        porta=opcoes.porta,
+        limite_por_segundo=opcoes.limite_por_segundo,
+        variacao_latencia=opcoes.variacao_latencia,
+        taxa_404=opcoes.taxa_404,
+        taxa_429=opcoes.taxa_429,
+        taxa_500=opcoes.taxa_500,
+        tamanho_payload=opcoes.tamanho_payload,
+        semente=opcoes.semente,
+    ) as servidor:
+        print(f"Servidor fake rodando em {servidor.base_url} (Ctrl+C para parar)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
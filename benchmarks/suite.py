@@ -0,0 +1,378 @@
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from leads_sinteticos import gerar_ids
+from servidor_fake import ServidorFake
+
+# --- SUÍTE DE BENCHMARKS (REPETÍVEL, SEM INTERNET) ---
+# Mede as três partes que pesam no integrador, sempre com a mesma entrada:
+# - busca: enriquecer_leads contra o servidor fake (latência variável, 404/429/500, payload de 1 KB);
+# - limpeza: conversão de moeda (R$) e datas do limpeza_dados.py (pandas);
+# - escrita: relatório em Parquet e CSV pelo escrita_relatorios.py.
+# Cada cenário roda N vezes e guardamos a melhor execução. O resultado vai para
+# benchmarks/resultados/<commit>_<perfil>.json, e --comparar mostra a diferença para outro commit
+# (se ele ainda não tiver resultado salvo, a suíte roda nele numa cópia temporária: git worktree).
+# Piora acima da tolerância (padrão 10%) e do ruído entre as repetições conta como regressão
+# (código de saída 1, para usar num script de CI).
+#
+# Uso:
+#     python benchmarks/suite.py --perfil rapido             # mede o código atual
+#     python benchmarks/suite.py --comparar HEAD~1           # mede e compara com o commit anterior
+#     python benchmarks/suite.py --commit 3d03251            # mede só um commit antigo
+#     python benchmarks/suite.py --comparar resultados/x.json
+
+PASTA_BENCH = Path(__file__).resolve().parent
+RAIZ = PASTA_BENCH.parent
+PASTA_RESULTADOS = PASTA_BENCH / "resultados"
+
+# Tamanhos de cada cenário (linhas/IDs). Só faz sentido comparar resultados do mesmo perfil.
+PERFIS = {
+    "rapido": {"busca": 1_000, "limpeza": 100_000, "escrita": 100_000},
+    "padrao": {"busca": 10_000, "limpeza": 1_000_000, "escrita": 1_000_000},
+    "completo": {"busca": 100_000, "limpeza": 1_000_000, "escrita": 1_000_000},
+}
+
+# API "realista": 5 a 15 ms por resposta, 3% de IDs inexistentes e 2% de falhas passageiras
+CONFIG_SERVIDOR = {
+    "latencia": 0.005,
+    "variacao_latencia": 0.01,
+    "taxa_404": 0.03,
+    "taxa_429": 0.01,
+    "taxa_500": 0.01,
+    "tamanho_payload": 1024,
+}
+MAX_CONCORRENCIA = 16
+
+TOLERANCIA_PADRAO = 0.10
+
+CIDADES = ["São Paulo", "Rio de Janeiro", "Belo Horizonte", "Curitiba", "Porto Alegre", "Recife", "Salvador"]
+
+
+# --- Cenários ---
+# Os imports do código medido ficam DENTRO dos cenários: com --raiz, eles vêm de outra cópia do repositório.
+
+
+def cenario_busca(quantidade):
+    from cliente_http import criar_sessao
+    from controle_taxa import PoliticaRetry
+    from enriquecimento import enriquecer_leads
+
+    ids = gerar_ids(quantidade)
+    latencias = []
+    status = Counter()
+
+    def registrar(response, *args, **kwargs):
+        # elapsed: do envio até chegarem os headers (não depende da instrumentação do código medido)
+        latencias.append(response.elapsed.total_seconds())
+        status[response.status_code] += 1
+
+    # Backoff curto: queremos medir o cliente, não a espera das retentativas
+    politica = PoliticaRetry(espera_base=0.01)
+    with (
+        ServidorFake(total_usuarios=quantidade, **CONFIG_SERVIDOR) as servidor,
+        criar_sessao(max_por_host=MAX_CONCORRENCIA, politica_retry=politica) as sessao,
+    ):
+        sessao.hooks["response"].append(registrar)
+        inicio = time.perf_counter()
+        nao_encontrados = 0
+        for resultado in enriquecer_leads(ids, MAX_CONCORRENCIA, servidor.base_url, sessao):
+            if resultado.linha is not None and resultado.linha["Status"] != "Ativo":
+                nao_encontrados += 1
+        segundos = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        "metricas": {
+            "leads_por_s": quantidade / segundos,
+            "p50_ms": latencias[len(latencias) // 2] * 1000,
+            "p95_ms": latencias[int(len(latencias) * 0.95)] * 1000,
+            "p99_ms": latencias[int(len(latencias) * 0.99)] * 1000,
+        },
+        "info": {
+            "ids": quantidade,
+            "requisicoes": len(latencias),
+            "por_status": {str(codigo): n for codigo, n in sorted(status.items())},
+            "nao_encontrados": nao_encontrados,
+        },
+    }
+
+
+def _dados_limpeza(linhas, semente=42):
+    import numpy as np
+    import pandas as pd
+
+    gerador = np.random.default_rng(semente)
+    # 5 mil valores distintos: exportações repetem muito
+    centavos = gerador.integers(0, 5_000, size=linhas) * 37
+    valores = pd.Series(centavos // 100).map("{:,}".format).str.replace(",", ".")
+    moeda = "R$ " + valores + "," + pd.Series(centavos % 100).map("{:02d}".format)
+    dias = pd.Timestamp("2020-01-01") + pd.to_timedelta(gerador.integers(0, 1500, size=linhas), unit="D")
+    return moeda, pd.Series(dias.strftime("%d/%m/%Y"))
+
+
+def cenario_limpeza(linhas):
+    from limpeza_dados import converter_data, converter_moeda_brl
+
+    moeda, datas = _dados_limpeza(linhas)
+    inicio = time.perf_counter()
+    converter_moeda_brl(moeda)
+    meio = time.perf_counter()
+    converter_data(datas)
+    fim = time.perf_counter()
+    return {
+        "metricas": {"moeda_linhas_por_s": linhas / (meio - inicio), "datas_linhas_por_s": linhas / (fim - meio)},
+        "info": {"linhas": linhas},
+    }
+
+
+def _linhas_relatorio(linhas):
+    # Mesmo formato das linhas do integrador (RegistroLead.como_dict), com 3% de "Não Encontrado"
+    for id_usuario in range(1, linhas + 1):
+        if id_usuario % 33 == 0:
+            yield {
+                "ID": id_usuario,
+                "Nome": "Não Encontrado",
+                "Email": "-",
+                "Cidade": "-",
+                "Status": "Erro na Consulta",
+            }
+        else:
+            yield {
+                "ID": id_usuario,
+                "Nome": f"Cliente {id_usuario:07d}",
+                "Email": f"cliente{id_usuario}@exemplo.com.br",
+                "Cidade": CIDADES[id_usuario % len(CIDADES)],
+                "Status": "Ativo",
+            }
+
+
+def cenario_escrita(linhas, sufixo):
+    import enriquecimento
+    from escrita_relatorios import abrir_escritor
+
+    # Linhas montadas antes do cronômetro: medimos só a escrita
+    dados = list(_linhas_relatorio(linhas))
+    tipos = getattr(enriquecimento, "TIPOS_RELATORIO", None)
+    opcoes = {"tipos": tipos} if tipos else {}
+    with tempfile.TemporaryDirectory() as pasta:
+        destino = Path(pasta) / f"relatorio{sufixo}"
+        inicio = time.perf_counter()
+        with abrir_escritor(destino, enriquecimento.COLUNAS_RELATORIO, **opcoes) as relatorio:
+            for linha in dados:
+                relatorio.escrever(linha)
+        segundos = time.perf_counter() - inicio
+        tamanho = destino.stat().st_size
+    return {
+        "metricas": {"linhas_por_s": linhas / segundos},
+        "info": {"linhas": linhas, "tamanho_mb": round(tamanho / 1024 / 1024, 2)},
+    }
+
+
+def montar_cenarios(tamanhos):
+    return {
+        "busca": lambda: cenario_busca(tamanhos["busca"]),
+        "limpeza": lambda: cenario_limpeza(tamanhos["limpeza"]),
+        "escrita_parquet": lambda: cenario_escrita(tamanhos["escrita"], ".parquet"),
+        "escrita_csv": lambda: cenario_escrita(tamanhos["escrita"], ".csv"),
+    }
+
+
+def _rodar_uma_vez(funcao):
+    # Como o timeit: coleta de lixo desligada durante a medição (ela dispara em momentos aleatórios)
+    gc.collect()
+    gc.disable()
+    try:
+        return funcao()
+    finally:
+        gc.enable()
+
+
+def rodar_cenario(funcao, repeticoes):
+    try:
+        execucoes = [_rodar_uma_vez(funcao) for _ in range(repeticoes)]
+    except Exception:
+        # Ex: um commit antigo sem o módulo (ou com outra assinatura): registramos e seguimos
+        return {"erro": traceback.format_exc(limit=3)}
+    # Melhor de N (como no bench_limpeza.py): o ruído de outros processos só piora os números,
+    # então a melhor execução é a mais estável entre uma medição e outra
+    metricas, ruido = {}, {}
+    for nome in execucoes[0]["metricas"]:
+        valores = [execucao["metricas"][nome] for execucao in execucoes]
+        metricas[nome] = round(max(valores) if maior_e_melhor(nome) else min(valores), 2)
+        # Ruído: quanto as repetições variaram entre si (usado na comparação)
+        ruido[nome] = round((max(valores) - min(valores)) / metricas[nome], 3) if metricas[nome] else 0.0
+    return {"metricas": metricas, "ruido": ruido, "info": execucoes[-1]["info"]}
+
+
+# --- Commits e resultados ---
+
+
+def _git(raiz, *argumentos):
+    comando = ["git", "-C", str(raiz), *argumentos]
+    return subprocess.run(comando, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def identificar_commit(raiz):
+    commit = _git(raiz, "rev-parse", "--short", "HEAD")
+    # Só o código medido conta como "sujo" (resultados e dados gerados não)
+    alterado = _git(raiz, "status", "--porcelain", "--", "snippets", "projetos")
+    return commit, bool(alterado)
+
+
+def arquivo_resultado(commit, perfil):
+    return PASTA_RESULTADOS / f"{commit}_{perfil}.json"
+
+
+def medir(raiz, perfil, repeticoes, cenarios=None):
+    # O código medido vem de 'raiz' (na frente de tudo no sys.path)
+    for pasta in ("snippets", "projetos/integrador-crm"):
+        sys.path.insert(0, str(Path(raiz) / pasta))
+
+    commit, sujo = identificar_commit(raiz)
+    resultado = {
+        "commit": commit,
+        "sujo": sujo,
+        "perfil": perfil,
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "repeticoes": repeticoes,
+        "cenarios": {},
+    }
+    for nome, funcao in montar_cenarios(PERFIS[perfil]).items():
+        if cenarios and nome not in cenarios:
+            continue
+        print(f"  {nome}...", flush=True)
+        resultado["cenarios"][nome] = rodar_cenario(funcao, repeticoes)
+
+    PASTA_RESULTADOS.mkdir(parents=True, exist_ok=True)
+    destino = arquivo_resultado(commit + ("-sujo" if sujo else ""), perfil)
+    destino.write_text(json.dumps(resultado, ensure_ascii=False, indent=2), encoding="utf-8")
+    return resultado, destino
+
+
+def medir_commit(referencia, perfil, repeticoes, cenarios=None):
+    """Roda a suíte (esta versão dela) num checkout temporário de outro commit."""
+    commit = _git(RAIZ, "rev-parse", "--short", referencia)
+    with tempfile.TemporaryDirectory() as pasta:
+        copia = Path(pasta) / commit
+        _git(RAIZ, "worktree", "add", "--detach", str(copia), commit)
+        try:
+            # Processo separado: os módulos do commit antigo não se misturam com os daqui
+            comando = [sys.executable, __file__, "--raiz", str(copia), "--perfil", perfil]
+            comando += ["--repeticoes", str(repeticoes)]
+            for cenario in cenarios or []:
+                comando += ["--cenario", cenario]
+            subprocess.run(comando, check=True)
+        finally:
+            _git(RAIZ, "worktree", "remove", "--force", str(copia))
+    return json.loads(arquivo_resultado(commit, perfil).read_text(encoding="utf-8"))
+
+
+def carregar_base(referencia, perfil, repeticoes, cenarios=None):
+    caminho = Path(referencia)
+    if caminho.is_file():
+        return json.loads(caminho.read_text(encoding="utf-8"))
+    salvo = arquivo_resultado(_git(RAIZ, "rev-parse", "--short", referencia), perfil)
+    if salvo.is_file():
+        return json.loads(salvo.read_text(encoding="utf-8"))
+    print(f"Sem resultado salvo para {referencia}: medindo agora (git worktree)...")
+    return medir_commit(referencia, perfil, repeticoes, cenarios)
+
+
+# --- Relatórios ---
+
+
+def mostrar(resultado):
+    sujo = " (com alterações não commitadas)" if resultado["sujo"] else ""
+    print(f"\nCommit {resultado['commit']}{sujo} | perfil {resultado['perfil']} | Python {resultado['python']}")
+    for nome, cenario in resultado["cenarios"].items():
+        if "erro" in cenario:
+            print(f"  {nome:<16} ERRO: {cenario['erro'].strip().splitlines()[-1]}")
+            continue
+        metricas = " | ".join(f"{metrica}={valor:,.1f}" for metrica, valor in cenario["metricas"].items())
+        print(f"  {nome:<16} {metricas}")
+        print(f"  {'':<16} {cenario['info']}")
+
+
+def maior_e_melhor(metrica):
+    # Vazão (..._por_s): quanto maior, melhor. Latência/tempo (..._ms, ..._s): quanto menor, melhor.
+    return metrica.endswith("_por_s")
+
+
+def comparar(base, atual, tolerancia=TOLERANCIA_PADRAO):
+    """
+    Mostra a variação de cada métrica e devolve a lista de regressões.
+
+    Numa máquina barulhenta, as repetições de um mesmo commit já variam entre si:
+    só é regressão a piora maior que a tolerância E que o ruído medido nas duas execuções.
+    """
+    print(f"\n{base['commit']} -> {atual['commit']} (tolerância {tolerancia:.0%})")
+    print(f"  {'cenário / métrica':<36} {'antes':>12} {'depois':>12} {'variação':>9} {'ruído':>6}")
+    regressoes = []
+    for nome, cenario in atual["cenarios"].items():
+        anterior = base["cenarios"].get(nome, {})
+        if "metricas" not in cenario or "metricas" not in anterior:
+            continue
+        for metrica, valor in cenario["metricas"].items():
+            valor_base = anterior["metricas"].get(metrica)
+            if not valor_base:
+                continue
+            variacao = valor / valor_base - 1
+            piorou = -variacao if maior_e_melhor(metrica) else variacao
+            ruido = max(anterior.get("ruido", {}).get(metrica, 0), cenario.get("ruido", {}).get(metrica, 0))
+            limite = max(tolerancia, ruido)
+            marca = ""
+            if piorou > limite:
+                marca = "  <- REGRESSÃO"
+                regressoes.append(f"{nome}.{metrica}")
+            elif -piorou > limite:
+                marca = "  (melhorou)"
+            print(
+                f"  {nome + ' / ' + metrica:<36} {valor_base:>12,.1f} {valor:>12,.1f} "
+                f"{variacao:>+9.1%} {ruido:>6.0%}{marca}"
+            )
+    return regressoes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks repetíveis do integrador CRM (sem internet).")
+    parser.add_argument("--perfil", choices=PERFIS, default="rapido")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--cenario", action="append", help="roda só este cenário (pode repetir)")
+    parser.add_argument("--comparar", metavar="COMMIT_OU_ARQUIVO", help="compara com outro commit ou resultado salvo")
+    parser.add_argument("--commit", help="mede outro commit (git worktree) em vez do código atual")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO)
+    parser.add_argument("--raiz", default=str(RAIZ), help=argparse.SUPPRESS)
+    opcoes = parser.parse_args()
+
+    if opcoes.commit:
+        # O processo filho já mostra o resultado
+        medir_commit(opcoes.commit, opcoes.perfil, opcoes.repeticoes, opcoes.cenario)
+        sys.exit(0)
+
+    base = None
+    if opcoes.comparar:
+        # A base primeiro: se precisar de worktree, ela não disputa CPU com a medição atual
+        base = carregar_base(opcoes.comparar, opcoes.perfil, opcoes.repeticoes, opcoes.cenario)
+
+    print(f"Medindo {opcoes.raiz} (perfil {opcoes.perfil}, {opcoes.repeticoes} repetições)")
+    atual, destino = medir(opcoes.raiz, opcoes.perfil, opcoes.repeticoes, opcoes.cenario)
+    mostrar(atual)
+    print(f"\nResultado salvo em: {destino}")
+
+    if base is not None:
+        regressoes = comparar(base, atual, opcoes.tolerancia)
+        if regressoes:
+            print(f"\n{len(regressoes)} regressão(ões): {', '.join(regressoes)}")
+            sys.exit(1)
@@ -0,0 +1,267 @@
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import requests
+
+import caminhos  # noqa: F401  (coloca snippets/ no sys.path)
+from cliente_http import ler_json
+
+# --- CACHE DE RESPOSTAS EM DISCO (SQLITE) ---
+# Rodamos o relatório várias vezes por dia e a maioria dos usuários não muda.
+# Guardamos cada resposta da API num arquivo SQLite (vem junto com o Python, sem instalar nada):
+# - TTL: enquanto a entrada está "fresca", nem vamos na API.
+# - Revalidação: entrada vencida com ETag/Last-Modified vira uma requisição condicional;
+#   se o servidor responder 304 (Not Modified), reaproveitamos o corpo guardado.
+# - Cache negativo: 404 também é guardado, então o ID 150 não custa uma ida à API toda vez.
+# - LRU: passando de max_entradas, as entradas acessadas há mais tempo são apagadas.
+#   O horário de acesso não é gravado a cada acerto (seria um UPDATE + commit por lead):
+#   só quando a entrada não é usada há ATUALIZAR_ACESSO_S, e em lotes de LOTE_ACESSOS numa transação.
+# - Vários processos (execucao_particionada.py) podem usar o mesmo arquivo: quem encontra o banco
+#   ocupado espera até ESPERA_BANCO_S; se ainda assim não der, a gravação é descartada
+#   (o cache é só um atalho: a resposta já está com quem pediu).
+
+TTL_PADRAO = 6 * 60 * 60            # 6 horas para respostas 200
+TTL_NEGATIVO_PADRAO = 24 * 60 * 60  # 24 horas para respostas 404
+MAX_ENTRADAS_PADRAO = 100_000
+# Para a ordem de remoção, 1 hora de precisão no horário de acesso basta
+ATUALIZAR_ACESSO_S = 60 * 60
+LOTE_ACESSOS = 500
+# Quanto esperar por outro processo que está gravando no mesmo arquivo (busy_timeout do SQLite)
+ESPERA_BANCO_S = 30.0
+
+ESQUEMA = """
+-- WAL + synchronous=NORMAL: gravações bem mais rápidas, ainda seguras contra travamentos
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+CREATE TABLE IF NOT EXISTS respostas (
+    url TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    corpo TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    expira_em REAL NOT NULL,
+    ultimo_acesso REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ultimo_acesso ON respostas (ultimo_acesso);
+"""
+
+
+@dataclass
+class ContadoresCache:
+    acertos: int = 0
+    acertos_negativos: int = 0
+    revalidados: int = 0
+    falhas: int = 0
+    removidos: int = 0
+    # Gravações descartadas porque outro processo segurou o arquivo além de ESPERA_BANCO_S
+    gravacoes_perdidas: int = 0
+
+    def __str__(self):
+        return (
+            f"{self.acertos} acertos | {self.acertos_negativos} acertos negativos (404) | "
+            f"{self.revalidados} revalidados (304) | {self.falhas} falhas | "
+            f"{self.removidos} removidos (LRU) | {self.gravacoes_perdidas} gravações perdidas"
+        )
+
+
+def _banco_ocupado(erro):
+    # "database is locked": outro processo segurou o arquivo mais tempo que o timeout
+    return getattr(erro, "sqlite_errorcode", None) in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+
+
+class CacheRespostas:
+    """Cache persistente de respostas JSON, compartilhável entre threads."""
+
+    def __init__(
+        self,
+        arquivo,
+        ttl=TTL_PADRAO,
+        ttl_negativo=TTL_NEGATIVO_PADRAO,
+        max_entradas=MAX_ENTRADAS_PADRAO,
+    ):
+        self.ttl = ttl
+        self.ttl_negativo = ttl_negativo
+        self.max_entradas = max_entradas
+        self.contadores = ContadoresCache()
+
+        # Uma conexão só, protegida por um Lock: as threads do enriquecimento
+        # usam o cache ao mesmo tempo, mas a rede fica FORA do lock.
+        self._trava = threading.Lock()
+        # timeout: quanto o SQLite espera (busy_timeout) quando outro processo está gravando
+        self._conexao = sqlite3.connect(arquivo, timeout=ESPERA_BANCO_S, check_same_thread=False)
+        self._conexao.executescript(ESQUEMA)
+        self._total = self._conexao.execute("SELECT COUNT(*) FROM respostas").fetchone()[0]
+        # url -> horário de acesso ainda não gravado (ver _registrar_acesso)
+        self._acessos = {}
+
+    def obter_json(self, sessao, url):
+        """
+        Devolve o JSON da URL, usando o cache quando possível.
+
+        Funciona como sessao.get(url) + raise_for_status() + .json():
+        erros HTTP (inclusive um 404 vindo do cache) lançam requests.exceptions.HTTPError.
+        """
+        agora = time.time()
+        entrada = self._ler(url, agora)
+
+        if entrada is not None and entrada["expira_em"] > agora:
+            if entrada["status"] == 404:
+                self._contar("acertos_negativos")
+                # Montamos uma resposta 404 "de mentira" para quem chamou tratar igual a uma real
+                resposta = requests.Response()
+                resposta.status_code = 404
+                resposta.url = url
+                raise requests.exceptions.HTTPError(
+                    f"404 Client Error: Not Found (cache) for url: {url}", response=resposta
+                )
+            self._contar("acertos")
+            return ler_json(entrada["corpo"])
+
+        # Entrada vencida: se temos ETag/Last-Modified, perguntamos "mudou desde então?"
+        headers = {}
+        if entrada is not None and entrada["status"] == 200:
+            if entrada["etag"]:
+                headers["If-None-Match"] = entrada["etag"]
+            if entrada["last_modified"]:
+                headers["If-Modified-Since"] = entrada["last_modified"]
+
+        response = sessao.get(url, headers=headers)
+
+        if response.status_code == 304:
+            self._contar("revalidados")
+            self._renovar(url, time.time() + self.ttl)
+            return ler_json(entrada["corpo"])
+
+        self._contar("falhas")
+
+        if response.status_code == 404:
+            self._gravar(url, 404, None, None, None, time.time() + self.ttl_negativo)
+        elif response.status_code == 200:
+            self._gravar(
+                url,
+                200,
+                response.text,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                time.time() + self.ttl,
+            )
+
+        # Outros erros (429, 500...) NÃO vão para o cache: na próxima vez tentamos de novo
+        response.raise_for_status()
+        return ler_json(response.content)
+
+    def tem_fresco(self, url):
+        """True se a URL tem entrada dentro do TTL (não conta como acerto nem falha)."""
+        with self._trava:
+            linha = self._conexao.execute("SELECT expira_em FROM respostas WHERE url = ?", (url,)).fetchone()
+        return linha is not None and linha[0] > time.time()
+
+    def guardar_json(self, url, dados):
+        """Guarda um JSON obtido por outro caminho (ex: consulta em lote) como resposta 200. Conta como falha."""
+        # O dado veio da API (o cache não tinha): para a taxa de acerto, é uma falha como outra qualquer
+        self._contar("falhas")
+        self._gravar(url, 200, json.dumps(dados), None, None, time.time() + self.ttl)
+
+    def fechar(self):
+        self._gravar_acessos()
+        with self._trava:
+            self._conexao.close()
+
+    # Context Manager: fecha o arquivo do cache ao sair do 'with'
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    # --- Operações internas (sempre com o lock) ---
+
+    @contextmanager
+    def _escrita(self):
+        """Lock + commit no fim. Com o banco ocupado além do timeout, desfaz e só conta a gravação perdida."""
+        with self._trava:
+            try:
+                yield self._conexao
+                self._conexao.commit()
+            except sqlite3.OperationalError as erro:
+                if not _banco_ocupado(erro):
+                    raise
+                self._conexao.rollback()
+                self.contadores.gravacoes_perdidas += 1
+
+    def _contar(self, contador):
+        with self._trava:
+            setattr(self.contadores, contador, getattr(self.contadores, contador) + 1)
+
+    def _ler(self, url, agora):
+        with self._trava:
+            linha = self._conexao.execute(
+                "SELECT status, corpo, etag, last_modified, expira_em, ultimo_acesso FROM respostas WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if linha is None:
+            return None
+
+        status, corpo, etag, last_modified, expira_em, ultimo_acesso = linha
+        # Registrar o acesso é o que faz a remoção ser LRU (menos usado recentemente)
+        if agora - ultimo_acesso > ATUALIZAR_ACESSO_S:
+            self._registrar_acesso(url, agora)
+        return {
+            "status": status,
+            "corpo": corpo,
+            "etag": etag,
+            "last_modified": last_modified,
+            "expira_em": expira_em,
+        }
+
+    def _registrar_acesso(self, url, agora):
+        with self._trava:
+            self._acessos[url] = agora
+            if len(self._acessos) < LOTE_ACESSOS:
+                return
+        self._gravar_acessos()
+
+    def _gravar_acessos(self):
+        with self._escrita() as conexao:
+            self._descarregar_acessos(conexao)
+
+    def _descarregar_acessos(self, conexao):
+        # Chamado já com o lock: todos os acessos pendentes num executemany (uma transação só)
+        if self._acessos:
+            conexao.executemany(
+                "UPDATE respostas SET ultimo_acesso = ? WHERE url = ?",
+                [(agora, url) for url, agora in self._acessos.items()],
+            )
+            self._acessos = {}
+
+    def _renovar(self, url, expira_em):
+        with self._escrita() as conexao:
+            conexao.execute("UPDATE respostas SET expira_em = ? WHERE url = ?", (expira_em, url))
+
+    def _gravar(self, url, status, corpo, etag, last_modified, expira_em):
+        with self._escrita() as conexao:
+            # Contamos as entradas "na mão" para não fazer um COUNT(*) a cada gravação
+            # (com outros processos no mesmo arquivo, a conta é aproximada; basta para o LRU)
+            existia = conexao.execute("SELECT 1 FROM respostas WHERE url = ?", (url,)).fetchone()
+            conexao.execute(
+                "INSERT OR REPLACE INTO respostas VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, status, corpo, etag, last_modified, expira_em, time.time()),
+            )
+            if existia is None:
+                self._total += 1
+
+            excesso = self._total - self.max_entradas
+            if excesso > 0:
+                # Os acessos pendentes entram antes: senão a remoção apagaria entradas que acabaram de ser usadas
+                self._descarregar_acessos(conexao)
+                conexao.execute(
+                    "DELETE FROM respostas WHERE url IN "
+                    "(SELECT url FROM respostas ORDER BY ultimo_acesso LIMIT ?)",
+                    (excesso,),
+                )
+                self._total -= excesso
+                self.contadores.removidos += excesso
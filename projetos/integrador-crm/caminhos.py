@@ -0,0 +1,13 @@
+import sys
+from pathlib import Path
+
+# --- CAMINHOS DO PROJETO ---
+# Os módulos compartilhados do repositório (ex: cliente_http.py) ficam na pasta snippets/.
+# Importar este módulo coloca essa pasta no sys.path, então o integrador
+# funciona independente do diretório de onde for executado.
+
+PASTA_PROJETO = Path(__file__).resolve().parent
+PASTA_SNIPPETS = PASTA_PROJETO.parents[1] / "snippets"
+
+if str(PASTA_SNIPPETS) not in sys.path:
+    sys.path.append(str(PASTA_SNIPPETS))
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+
+# --- CHECKPOINT (MODO INCREMENTAL) ---
+# Guarda, para cada ID, a última linha gerada no relatório e um hash dela.
+# Com isso, uma nova execução:
+# - só consulta na API os IDs novos ou "vencidos" (processados há mais de idade_maxima);
+# - retoma de onde parou se a execução anterior travou no meio (o progresso vai sendo gravado);
+# - sabe exatamente quais linhas mudaram (o hash é diferente) e quais ficaram iguais.
+
+IDADE_MAXIMA_PADRAO = 24 * 60 * 60  # reconsultar cada ID no máximo uma vez por dia
+
+# Gravar no disco a cada linha seria lento; a cada N linhas é um bom meio-termo.
+# Se travar, perdemos no máximo as últimas N consultas.
+LINHAS_POR_COMMIT = 500
+
+ESQUEMA = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+CREATE TABLE IF NOT EXISTS linhas (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL,
+    linha TEXT NOT NULL,
+    processado_em REAL NOT NULL
+);
+"""
+
+
+def hash_linha(linha):
+    # sort_keys garante o mesmo texto (e o mesmo hash) independente da ordem das chaves
+    texto = json.dumps(linha, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ContadoresCheckpoint:
+    novos: int = 0
+    alterados: int = 0
+    inalterados: int = 0
+
+    @property
+    def houve_mudanca(self):
+        return self.novos + self.alterados > 0
+
+    def __str__(self):
+        return f"{self.novos} novos | {self.alterados} alterados | {self.inalterados} inalterados"
+
+
+class Checkpoint:
+    """Registro persistente das linhas já processadas (usado por uma thread só)."""
+
+    def __init__(self, arquivo, idade_maxima=IDADE_MAXIMA_PADRAO):
+        self.idade_maxima = idade_maxima
+        self.contadores = ContadoresCheckpoint()
+        self._conexao = sqlite3.connect(arquivo)
+        self._conexao.executescript(ESQUEMA)
+        self._pendentes_commit = 0
+
+    def ids_pendentes(self, ids_usuarios):
+        """Filtra a lista, devolvendo (na ordem) só os IDs que precisam ir na API."""
+        limite = time.time() - self.idade_maxima
+        frescos = {
+            id_usuario
+            for (id_usuario,) in self._conexao.execute(
+                "SELECT id FROM linhas WHERE processado_em >= ?", (limite,)
+            )
+        }
+        return [id_usuario for id_usuario in ids_usuarios if id_usuario not in frescos]
+
+    def registrar(self, linha):
+        """Grava a linha do ID e devolve True se ela é nova ou mudou desde a última vez."""
+        novo_hash = hash_linha(linha)
+        anterior = self._conexao.execute("SELECT hash FROM linhas WHERE id = ?", (linha["ID"],)).fetchone()
+
+        if anterior is not None and anterior[0] == novo_hash:
+            # Nada mudou: só renovamos a data para não reconsultar tão cedo
+            self._conexao.execute(
+                "UPDATE linhas SET processado_em = ? WHERE id = ?", (time.time(), linha["ID"])
+            )
+            self.contadores.inalterados += 1
+            mudou = False
+        else:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO linhas VALUES (?, ?, ?, ?)",
+                (linha["ID"], novo_hash, json.dumps(linha, ensure_ascii=False), time.time()),
+            )
+            if anterior is None:
+                self.contadores.novos += 1
+            else:
+                self.contadores.alterados += 1
+            mudou = True
+
+        self._pendentes_commit += 1
+        if self._pendentes_commit >= LINHAS_POR_COMMIT:
+            self.salvar()
+        return mudou
+
+    def linhas(self, ids_usuarios):
+        """Devolve as linhas guardadas na ordem da lista (IDs nunca processados ficam de fora)."""
+        for id_usuario in ids_usuarios:
+            registro = self._conexao.execute("SELECT linha FROM linhas WHERE id = ?", (id_usuario,)).fetchone()
+            if registro is not None:
+                yield json.loads(registro[0])
+
+    def salvar(self):
+        self._conexao.commit()
+        self._pendentes_commit = 0
+
+    def fechar(self):
+        # Mesmo saindo por erro, o que já foi processado fica salvo (é o "checkpoint")
+        self.salvar()
+        self._conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
@@ -0,0 +1,261 @@
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+
+import requests
+
+import caminhos  # noqa: F401  (coloca snippets/ no sys.path)
+from cliente_http import criar_sessao, ler_json, url_base
+
+# --- MOTOR DE ENRIQUECIMENTO DE LEADS ---
+# Em vez de fazer uma requisição por vez (e esperar cada uma terminar),
+# disparamos várias consultas em paralelo usando um pool de threads.
+# Como o trabalho é quase todo ESPERA de rede (I/O), threads funcionam muito bem aqui.
+# Todas as threads compartilham UMA sessão (cliente_http.py), reaproveitando as conexões.
+#
+# Consultas em lote: quando a API aceita filtros como /users?id=1&id=3&id=5,
+# uma requisição traz dezenas de usuários. E se vamos pedir quase todo o catálogo,
+# sai mais barato baixar a listagem completa (/users) uma vez só.
+# IDs que não vierem na resposta em lote são confirmados com o GET individual de sempre,
+# então cada lead recebe exatamente o mesmo resultado do modo um-a-um.
+#
+# Cada lead vira um RegistroLead (dataclass com __slots__), e não um dict: com milhões de linhas,
+# as chaves repetidas em cada dict pesam. Do JSON da API (endereço, empresa, geo...) só lemos
+# os quatro campos do relatório; o resto é descartado assim que a resposta é lida.
+
+# Quantas requisições podem estar "no ar" ao mesmo tempo.
+# Valores altos demais podem sobrecarregar a API (ou fazer ela te bloquear).
+MAX_CONCORRENCIA_PADRAO = 16
+
+# Colunas de cada linha do relatório
+COLUNAS_RELATORIO = ["ID", "Nome", "Email", "Cidade", "Status"]
+
+# Tipos das colunas nos formatos colunares (Parquet/Arrow).
+# Status tem poucos valores distintos: "category" guarda cada texto uma vez só.
+TIPOS_RELATORIO = {"ID": "int64", "Nome": "string", "Email": "string", "Cidade": "string", "Status": "category"}
+
+# Status possíveis: as mesmas strings são reaproveitadas em todas as linhas
+STATUS_ATIVO = "Ativo"
+STATUS_NAO_ENCONTRADO = "Erro na Consulta"
+
+# Quantos IDs por requisição em lote (URLs muito longas são recusadas por alguns servidores)
+TAMANHO_LOTE_PADRAO = 50
+
+# A partir de que fração do catálogo compensa baixar a listagem completa
+FRACAO_LISTAGEM_PADRAO = 0.5
+
+
+@dataclass(slots=True)
+class RegistroLead:
+    """Uma linha do relatório. Com __slots__, cada registro ocupa bem menos memória que um dict."""
+
+    id: int
+    nome: str
+    email: str
+    cidade: str
+    status: str
+
+    def valores(self):
+        # Na ordem de COLUNAS_RELATORIO (para Escritor.escrever_valores)
+        return (self.id, self.nome, self.email, self.cidade, self.status)
+
+    def como_dict(self):
+        return dict(zip(COLUNAS_RELATORIO, self.valores()))
+
+
+@dataclass(slots=True)
+class ResultadoConsulta:
+    """Resultado de uma consulta: o registro do relatório ou o erro crítico que o impediu."""
+
+    id_usuario: int
+    registro: RegistroLead | None
+    erro: Exception | None = None
+
+    @property
+    def ignorado(self):
+        # Erros críticos (ex: sem internet) não entram no relatório, igual ao script original
+        return self.registro is None
+
+    @property
+    def linha(self):
+        # A linha como dict {coluna: valor} (ex: para o checkpoint); None se foi ignorado
+        return None if self.registro is None else self.registro.como_dict()
+
+
+def registro_nao_encontrado(id_usuario):
+    # Estratégia de Fallback: registramos o ID mesmo com erro,
+    # para o time saber que procuramos.
+    return RegistroLead(id_usuario, "Não Encontrado", "-", "-", STATUS_NAO_ENCONTRADO)
+
+
+def montar_registro(id_usuario, dados_api):
+    # Extraindo apenas o que o Marketing pediu
+    # O JSON da API user tem campos aninhados (address -> city)
+    # Poucas cidades se repetem em milhares de leads: sys.intern guarda cada nome uma vez só
+    return RegistroLead(
+        id_usuario,
+        dados_api["name"],
+        dados_api["email"],
+        sys.intern(dados_api["address"]["city"]),
+        STATUS_ATIVO,  # Campo extra que criamos
+    )
+
+
+def consultar_usuario(sessao, id_usuario, base_url=None, cache=None):
+    """Consulta um único usuário e devolve um ResultadoConsulta (nunca lança exceção)."""
+    url = f"{base_url or url_base()}/users/{id_usuario}"
+
+    try:
+        if cache is not None:
+            # O cache (cache_respostas.py) se comporta igual ao bloco abaixo,
+            # inclusive lançando HTTPError para 404 guardados
+            dados_api = cache.obter_json(sessao, url)
+        else:
+            # A sessão já aplica os headers de autenticação e o timeout padrão
+            response = sessao.get(url)
+            # 404 / 500 viram HTTPError (a Regra de Ouro)
+            response.raise_for_status()
+            dados_api = ler_json(response.content)
+
+        return ResultadoConsulta(id_usuario, montar_registro(id_usuario, dados_api))
+
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return ResultadoConsulta(id_usuario, registro_nao_encontrado(id_usuario))
+        # 429/5xx que continuaram mesmo depois das retentativas NÃO significam
+        # "usuário não existe": o lead fica de fora e é tentado de novo na próxima execução
+        return ResultadoConsulta(id_usuario, None, e)
+
+    except Exception as e:
+        # Erro crítico: devolvemos o erro para quem chamou decidir o que imprimir
+        return ResultadoConsulta(id_usuario, None, e)
+
+
+@dataclass
+class PlanoConsultas:
+    """Como os IDs serão buscados: listagem completa, lotes ou um a um."""
+
+    listagem_completa: bool = False
+    tamanho_lote: int = 1
+    motivo: str = ""
+
+
+def planejar_consultas(ids_usuarios, tamanho_lote=None, total_catalogo=None, fracao_listagem=FRACAO_LISTAGEM_PADRAO):
+    """
+    Decide a estratégia de busca.
+
+    tamanho_lote=None significa que a API não tem filtro em lote (um GET por ID).
+    total_catalogo (quantos usuários a API tem, se soubermos) habilita a listagem completa.
+    """
+    if total_catalogo and len(set(ids_usuarios)) >= fracao_listagem * total_catalogo:
+        return PlanoConsultas(listagem_completa=True, motivo="maioria do catálogo: listagem completa")
+    if tamanho_lote and tamanho_lote > 1:
+        return PlanoConsultas(tamanho_lote=tamanho_lote, motivo=f"lotes de até {tamanho_lote} IDs")
+    return PlanoConsultas(motivo="um GET por ID")
+
+
+def buscar_listagem(sessao, base_url=None, ids=None):
+    """GET /users (ou /users?id=..&id=.. quando 'ids' é passado). Devolve {id: dados}."""
+    params = {"id": list(dict.fromkeys(ids))} if ids is not None else None
+    response = sessao.get(f"{base_url or url_base()}/users", params=params)
+    response.raise_for_status()
+    return {usuario["id"]: usuario for usuario in ler_json(response.content)}
+
+
+def resolver_bloco(sessao, bloco, usuarios, base_url, cache):
+    """Monta os resultados do bloco a partir dos usuários já baixados; o resto vai um a um."""
+    resultados = []
+    for id_usuario in bloco:
+        dados_api = usuarios.get(id_usuario)
+        if dados_api is None:
+            # Não veio na resposta em lote: o GET individual confirma (e marca o 404)
+            resultados.append(consultar_usuario(sessao, id_usuario, base_url, cache))
+            continue
+
+        if cache is not None:
+            # Guardamos como se fosse um /users/{id}: a próxima execução acerta no cache
+            cache.guardar_json(f"{base_url}/users/{id_usuario}", dados_api)
+        resultados.append(ResultadoConsulta(id_usuario, montar_registro(id_usuario, dados_api)))
+    return resultados
+
+
+def consultar_bloco(sessao, bloco, base_url, cache, usuarios=None):
+    """Consulta um bloco de IDs (em lote se possível) e devolve os resultados na ordem do bloco."""
+    if len(bloco) == 1 and usuarios is None:
+        return [consultar_usuario(sessao, bloco[0], base_url, cache)]
+
+    if usuarios is None:
+        # IDs com resposta fresca no cache nem entram no lote (resolver_bloco acerta no cache)
+        faltando = [
+            id_usuario
+            for id_usuario in bloco
+            if cache is None or not cache.tem_fresco(f"{base_url}/users/{id_usuario}")
+        ]
+        try:
+            usuarios = buscar_listagem(sessao, base_url, ids=faltando) if faltando else {}
+        except Exception:
+            # A consulta em lote falhou (ex: API sem esse filtro): caímos para um a um
+            usuarios = {}
+    return resolver_bloco(sessao, bloco, usuarios, base_url, cache)
+
+
+def enriquecer_leads(
+    ids_usuarios,
+    max_concorrencia=MAX_CONCORRENCIA_PADRAO,
+    base_url=None,
+    sessao=None,
+    cache=None,
+    plano=None,
+):
+    """
+    Consulta os IDs em paralelo e devolve os resultados NA MESMA ORDEM da entrada.
+
+    É um gerador: os resultados saem assim que ficam prontos (respeitando a ordem),
+    então dá para processar listas enormes sem guardar tudo na memória.
+    Se nenhuma sessão for passada, uma é criada (e fechada) só para esta execução.
+    Com um CacheRespostas, as respostas guardadas em disco evitam idas à API.
+    O plano (ver planejar_consultas) define se a busca é em lote; o padrão é um GET por ID.
+    """
+    if max_concorrencia < 1:
+        raise ValueError("max_concorrencia precisa ser pelo menos 1")
+    # Sem base_url, usamos a API_BASE_URL (ambiente ou .env)
+    base_url = base_url or url_base()
+
+    if sessao is None:
+        # Pool com uma conexão por thread: ninguém fica esperando conexão livre
+        with criar_sessao(max_por_host=max_concorrencia) as sessao_propria:
+            yield from enriquecer_leads(ids_usuarios, max_concorrencia, base_url, sessao_propria, cache, plano)
+        return
+
+    plano = plano or PlanoConsultas()
+
+    usuarios = None
+    if plano.listagem_completa:
+        try:
+            usuarios = buscar_listagem(sessao, base_url)
+        except Exception:
+            # Sem listagem, seguimos em blocos normais (um a um ou em lote)
+            usuarios = None
+
+    # Blocos de IDs: cada bloco é UMA tarefa no pool (um GET, ou uma consulta em lote)
+    tamanho_bloco = plano.tamanho_lote if usuarios is None else TAMANHO_LOTE_PADRAO
+    ids = iter(ids_usuarios)
+    blocos = iter(lambda: list(islice(ids, tamanho_bloco)), [])
+
+    # Janela deslizante: nunca deixamos mais que 2x max_concorrencia tarefas pendentes.
+    # Assim uma lista de 50 mil IDs não vira 50 mil objetos Future de uma vez.
+    tamanho_janela = max_concorrencia * 2
+    pendentes = deque()
+
+    with ThreadPoolExecutor(max_workers=max_concorrencia) as executor:
+        for bloco in blocos:
+            pendentes.append(executor.submit(consultar_bloco, sessao, bloco, base_url, cache, usuarios))
+
+            if len(pendentes) >= tamanho_janela:
+                # O mais antigo sai primeiro: é isso que mantém a ordem de entrada
+                yield from pendentes.popleft().result()
+
+        while pendentes:
+            yield from pendentes.popleft().result()
@@ -0,0 +1,550 @@
+import argparse
+import heapq
+import json
+import math
+import multiprocessing
+import os
+import socket
+import sys
+import time
+import traceback
+import uuid
+import zlib
+from dataclasses import asdict, replace
+from operator import itemgetter
+from pathlib import Path
+
+import caminhos  # noqa: F401  (coloca snippets/ no sys.path)
+from escrita_relatorios import exportar_xlsx, ler_em_lotes
+from instrumentacao import Instrumentacao, configurar_log
+from integracao_crm import IDS_EXEMPLO, ConfiguracaoCRM, abrir_relatorio, ler_ids
+
+# --- EXECUÇÃO PARTICIONADA (VÁRIOS PROCESSOS OU VÁRIAS MÁQUINAS) ---
+# Um processo só (integracao_crm.py) esbarra em um núcleo de CPU: com a API respondendo rápido,
+# o gargalo passa a ser o parse do JSON e a montagem das linhas, e as threads não ajudam (GIL).
+# Aqui a lista de IDs é dividida em N partições, e cada partição é processada por um processo
+# independente, que grava o seu pedaço do relatório. No fim, os pedaços são juntados na ordem
+# ORIGINAL da lista.
+#
+# Tudo passa por uma pasta compartilhada (local ou de rede), então os processos podem estar
+# na mesma máquina (executar) ou em máquinas diferentes (cada uma roda "trabalhar"):
+#     plano.json               partições, modo de divisão e formato dos pedaços
+#     particao_0003.ids        "posição<TAB>id" de cada ID da partição
+#     particao_0003.trava      quem está processando (criada de forma atômica, renovada a cada 30s,
+#                              com um token: o dono confere que a trava ainda é dele antes de publicar)
+#     particao_0003.parquet    o pedaço do relatório (coluna extra "Posicao" = posição na lista original)
+#     particao_0003.json       partição concluída: linhas, ignorados, tempo, máquina e o resumo da execução
+#     particao_0003.erro       traceback da última falha (a partição pode ser tentada de novo sozinha)
+#
+# Uso:
+#     python execucao_particionada.py executar --ids-file ids.txt --pasta lote --processos 4 --out leads.parquet
+# Ou, com várias máquinas olhando a mesma pasta:
+#     python execucao_particionada.py planejar --ids-file ids.txt --pasta /mnt/lote --particoes 32
+#     python execucao_particionada.py trabalhar --pasta /mnt/lote          (em cada máquina)
+#     python execucao_particionada.py juntar --pasta /mnt/lote --out leads.parquet
+#     python execucao_particionada.py trabalhar --pasta /mnt/lote --particao 7   (refaz só a que falhou)
+#
+# Diferente do integracao_crm.py, aqui não há modo incremental: cada partição consulta todos os seus IDs
+# (o cache de respostas continua valendo, um por máquina).
+
+# "spawn": igual ao trabalhadores_python.py (interpretador limpo, mesmo comportamento em Linux/Mac/Windows)
+CONTEXTO = multiprocessing.get_context("spawn")
+
+# Uma trava não renovada há mais que isso é de um processo que morreu: outro pode assumir a partição
+TRAVA_EXPIRA_S = 5 * 60
+RENOVAR_TRAVA_S = 30
+
+COLUNA_POSICAO = "Posicao"
+
+
+class TravaPerdida(RuntimeError):
+    """Outro processo assumiu a partição (a nossa trava sumiu ou foi trocada)."""
+
+
+def _nome(indice):
+    return f"particao_{indice:04d}"
+
+
+def _gravar_json(arquivo, dados):
+    # Grava num temporário e renomeia: quem lê nunca vê um JSON pela metade
+    temporario = arquivo.with_name(f"{arquivo.name}.{os.getpid()}.tmp")
+    temporario.write_text(json.dumps(dados, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+    os.replace(temporario, arquivo)
+
+
+def ler_plano(pasta):
+    return json.loads((Path(pasta) / "plano.json").read_text(encoding="utf-8"))
+
+
+# --- 1. Divisão da lista ---
+
+
+def dividir_ids(ids, particoes, modo="faixa"):
+    """
+    Divide os IDs em listas de (posição, id).
+
+    "faixa": pedaços contíguos da lista, do mesmo tamanho (o merge no fim é quase uma concatenação).
+    "hash": o ID decide a partição (crc32), então IDs repetidos caem sempre na mesma partição
+    e a mesma divisão se repete de uma execução para outra, mesmo com a lista em outra ordem.
+    """
+    if particoes < 1:
+        raise ValueError("particoes precisa ser pelo menos 1")
+    divisao = [[] for _ in range(particoes)]
+    if modo == "faixa":
+        tamanho = math.ceil(len(ids) / particoes) or 1
+        for posicao, id_usuario in enumerate(ids):
+            divisao[posicao // tamanho].append((posicao, id_usuario))
+    elif modo == "hash":
+        for posicao, id_usuario in enumerate(ids):
+            divisao[zlib.crc32(str(id_usuario).encode()) % particoes].append((posicao, id_usuario))
+    else:
+        raise ValueError(f"Modo de divisão desconhecido: {modo} (use 'faixa' ou 'hash')")
+    return divisao
+
+
+def planejar(ids, pasta, particoes, modo="faixa", formato=".parquet"):
+    """Cria a pasta de trabalho com o plano e a lista de IDs de cada partição."""
+    pasta = Path(pasta)
+    pasta.mkdir(parents=True, exist_ok=True)
+    if (pasta / "plano.json").exists():
+        raise FileExistsError(f"{pasta} já tem um plano: use outra pasta (ou apague a antiga)")
+
+    for indice, itens in enumerate(dividir_ids(ids, particoes, modo)):
+        linhas = "".join(f"{posicao}\t{id_usuario}\n" for posicao, id_usuario in itens)
+        (pasta / f"{_nome(indice)}.ids").write_text(linhas, encoding="utf-8")
+    # O plano vai por último: enquanto ele não existe, nenhum trabalhador começa
+    _gravar_json(
+        pasta / "plano.json", {"total_ids": len(ids), "particoes": particoes, "modo": modo, "formato": formato}
+    )
+    return pasta
+
+
+# --- 2. Trava de cada partição ---
+
+
+def _ler_trava(trava):
+    """(conteúdo, st_mtime_ns) da trava, ou None se ela não existe."""
+    try:
+        with open(trava, encoding="utf-8") as entrada:
+            modificada = os.fstat(entrada.fileno()).st_mtime_ns
+            conteudo = entrada.read()
+    except FileNotFoundError:
+        return None
+    try:
+        dados = json.loads(conteudo)
+    except ValueError:
+        dados = {}  # recém-criada: o dono ainda está escrevendo
+    return dados, modificada
+
+
+def _e_minha(trava, token):
+    atual = _ler_trava(trava)
+    return atual is not None and atual[0].get("token") == token
+
+
+def _reivindicar(pasta, indice):
+    """Tenta pegar a partição para este processo. Devolve o token da trava, ou None se outro já está nela."""
+    trava = pasta / f"{_nome(indice)}.trava"
+    vista = _ler_trava(trava)
+    if vista is not None:
+        _, modificada = vista
+        if time.time() - modificada / 1e9 < TRAVA_EXPIRA_S:
+            return None
+        # Trava abandonada: o rename é atômico, então só UM processo consegue tirá-la do caminho
+        expirada = trava.with_name(f"{trava.name}.expirada.{socket.gethostname()}.{os.getpid()}")
+        try:
+            os.rename(trava, expirada)
+        except FileNotFoundError:
+            return None
+        if _ler_trava(expirada) != vista:
+            # Entre olhar e renomear, outro processo já tinha assumido e criado uma trava nova:
+            # renomeamos a trava DELE. Devolvemos e desistimos. (Se um terceiro criou outra trava nesse
+            # meio-tempo, ela é sobrescrita; o terceiro percebe pelo token na renovação e desiste.)
+            os.replace(expirada, trava)
+            return None
+        expirada.unlink()
+
+    try:
+        # O_CREAT | O_EXCL: o sistema operacional garante que só um processo cria o arquivo
+        descritor = os.open(trava, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return None
+    token = uuid.uuid4().hex
+    with os.fdopen(descritor, "w", encoding="utf-8") as saida:
+        json.dump(
+            {"maquina": socket.gethostname(), "pid": os.getpid(), "inicio": time.time(), "token": token}, saida
+        )
+    return token
+
+
+def _apagar_parciais(pasta, indice, pid=None):
+    # Os pedaços pela metade deste processo, ou do 'pid' (o nome leva máquina e pid, ver processar_particao)
+    for parcial in pasta.glob(f"{_nome(indice)}.parcial.{socket.gethostname()}.{pid or os.getpid()}.*"):
+        parcial.unlink(missing_ok=True)
+
+
+# --- 3. Processamento de uma partição ---
+
+
+def processar_particao(pasta, indice, config=None, log=None, limitador=None, token=None):
+    """
+    Consulta os IDs da partição e grava o seu pedaço do relatório. Devolve o status gravado no .json.
+
+    Passe o mesmo LimitadorTaxa para as partições seguintes do processo: a taxa que ele já
+    aprendeu continua valendo, em vez de recomeçar do zero em cada partição.
+    Com o token da trava (ver _reivindicar), lança TravaPerdida se outro processo assumir a partição.
+    """
+    from cache_respostas import CacheRespostas
+    from cliente_http import criar_sessao
+    from controle_taxa import LimitadorTaxa
+    from enriquecimento import COLUNAS_RELATORIO, TIPOS_RELATORIO, enriquecer_leads, planejar_consultas
+
+    pasta = Path(pasta)
+    config = config or ConfiguracaoCRM()
+    log = log or configurar_log("execucao_particionada", config.nivel_log, config.formato_log)
+    nome = _nome(indice)
+    plano = ler_plano(pasta)
+    trava = pasta / f"{nome}.trava"
+
+    itens = [linha.split("\t") for linha in (pasta / f"{nome}.ids").read_text(encoding="utf-8").splitlines()]
+    posicoes = [int(posicao) for posicao, _ in itens]
+    ids = [int(id_usuario) for _, id_usuario in itens]
+
+    instrumentacao = Instrumentacao(nome)
+    limitador = limitador or LimitadorTaxa(taxa_inicial=config.taxa_inicial, taxa_maxima=config.taxa_maxima)
+    colunas = [COLUNA_POSICAO, *COLUNAS_RELATORIO]
+    tipos = {COLUNA_POSICAO: "int64", **TIPOS_RELATORIO}
+    ignorados = 0
+    renovada = time.monotonic()
+
+    def conferir_trava():
+        if token is not None and not _e_minha(trava, token):
+            raise TravaPerdida(f"{nome}: outro processo assumiu a partição")
+
+    parcial = pasta / f"{nome}.parcial.{socket.gethostname()}.{os.getpid()}{plano['formato']}"
+    log.info(f"{nome}: {len(ids)} IDs")
+    with (
+        criar_sessao(
+            max_por_host=config.max_concorrencia, limitador=limitador, instrumentacao=instrumentacao
+        ) as sessao,
+        CacheRespostas(config.arquivo_cache) as cache,
+        # Escrevemos num arquivo ".parcial" só nosso: o pedaço só ganha o nome final quando estiver completo
+        abrir_relatorio(parcial, colunas, tipos, log) as pedaco,
+    ):
+        plano_consultas = planejar_consultas(ids, config.tamanho_lote, config.total_catalogo)
+        resultados = enriquecer_leads(
+            ids, max_concorrencia=config.max_concorrencia, sessao=sessao, cache=cache, plano=plano_consultas
+        )
+        # A ordem dos resultados é a mesma da entrada, então zip casa cada um com a sua posição
+        for posicao, resultado in zip(posicoes, instrumentacao.cronometrar(resultados, "consulta")):
+            if resultado.ignorado:
+                ignorados += 1
+                log.warning("ERRO CRÍTICO", extra={"campos": {"id": resultado.id_usuario, "erro": resultado.erro}})
+            else:
+                with instrumentacao.etapa("escrita"):
+                    pedaco.escrever_valores((posicao, *resultado.registro.valores()))
+
+            if time.monotonic() - renovada > RENOVAR_TRAVA_S:
+                # "Ainda estou vivo": sem isso, outro processo acharia que a trava foi abandonada
+                conferir_trava()
+                os.utime(trava)
+                renovada = time.monotonic()
+
+    # Só publica quem ainda é dono: a trava foi renovada há menos de 30 s, ninguém a assume antes disso
+    conferir_trava()
+    arquivo = pasta / f"{nome}{pedaco.arquivo.suffix}"
+    os.replace(pedaco.arquivo, arquivo)
+    status = {
+        "arquivo": arquivo.name,
+        "linhas": pedaco.linhas_escritas,
+        "ignorados": ignorados,
+        "maquina": socket.gethostname(),
+        "pid": os.getpid(),
+        # O arquivo do cache é compartilhado: gravacoes_perdidas > 0 indica disputa entre os processos
+        "cache": asdict(cache.contadores),
+        "resumo": instrumentacao.resumo(),
+    }
+    _gravar_json(pasta / f"{nome}.json", status)
+    (pasta / f"{nome}.erro").unlink(missing_ok=True)
+    log.info(f"✅ {nome}: {pedaco.linhas_escritas} linhas ({ignorados} com erro crítico)\n{instrumentacao}")
+    return status
+
+
+def trabalhar(pasta, config=None, particoes=None, refazer=False):
+    """
+    Processa partições pendentes da pasta até não sobrar nenhuma livre.
+
+    Vários trabalhadores (processos ou máquinas) podem rodar ao mesmo tempo: cada partição é
+    reivindicada por um só. 'particoes' limita a algumas (ex: tentar de novo a que falhou);
+    com refazer=True, até as já concluídas são processadas de novo.
+    Devolve quantas partições falharam neste trabalhador.
+    """
+    from controle_taxa import LimitadorTaxa
+
+    pasta = Path(pasta)
+    config = config or ConfiguracaoCRM()
+    log = configurar_log("execucao_particionada", config.nivel_log, config.formato_log)
+    plano = ler_plano(pasta)
+    limitador = LimitadorTaxa(taxa_inicial=config.taxa_inicial, taxa_maxima=config.taxa_maxima)
+    falhas = 0
+
+    for indice in range(plano["particoes"]) if particoes is None else particoes:
+        concluida = pasta / f"{_nome(indice)}.json"
+        if concluida.exists() and not refazer:
+            continue
+        token = _reivindicar(pasta, indice)
+        if token is None:
+            continue
+        trava = pasta / f"{_nome(indice)}.trava"
+        try:
+            concluida.unlink(missing_ok=True)
+            processar_particao(pasta, indice, config, log, limitador, token)
+        except TravaPerdida as erro:
+            # Não é falha da partição: outro processo está com ela (e a trava agora é dele)
+            _apagar_parciais(pasta, indice)
+            log.warning(f"⚠️  {erro}")
+        except Exception:
+            # A falha fica registrada e não derruba o trabalhador: as outras partições continuam
+            _apagar_parciais(pasta, indice)
+            falhas += 1
+            (pasta / f"{_nome(indice)}.erro").write_text(traceback.format_exc(), encoding="utf-8")
+            log.exception(f"❌ {_nome(indice)} falhou (tente de novo com --particao {indice})")
+        finally:
+            if _e_minha(trava, token):
+                trava.unlink()
+    return falhas
+
+
+# --- 4. Situação e junção ---
+
+
+def situacao(pasta):
+    """Devolve {indice: "concluida" | "em andamento" | "falhou" | "pendente"}."""
+    pasta = Path(pasta)
+    estados = {}
+    for indice in range(ler_plano(pasta)["particoes"]):
+        nome = _nome(indice)
+        if (pasta / f"{nome}.json").exists():
+            estados[indice] = "concluida"
+        elif (pasta / f"{nome}.trava").exists():
+            estados[indice] = "em andamento"
+        elif (pasta / f"{nome}.erro").exists():
+            estados[indice] = "falhou"
+        else:
+            estados[indice] = "pendente"
+    return estados
+
+
+def _linhas_do_pedaco(arquivo):
+    for lote in ler_em_lotes(arquivo):
+        for linha in lote:
+            # No CSV tudo volta como texto: a posição precisa ser número para ordenar
+            yield (int(linha[0]), *linha[1:])
+
+
+def juntar(pasta, destino, exportar_excel=False, log=None):
+    """
+    Junta os pedaços na ordem original da lista e grava 'destino' (formato pela extensão).
+
+    Cada pedaço já está em ordem de posição, então o heapq.merge só compara a linha da frente
+    de cada um: a memória fica estável mesmo com milhões de linhas.
+    """
+    from enriquecimento import COLUNAS_RELATORIO, TIPOS_RELATORIO
+
+    pasta = Path(pasta)
+    destino = Path(destino)
+    log = log or configurar_log("execucao_particionada")
+    faltando = [indice for indice, estado in situacao(pasta).items() if estado != "concluida"]
+    if faltando:
+        raise RuntimeError(f"Partições ainda não concluídas: {faltando} (veja o comando 'situacao')")
+
+    status = [
+        json.loads(arquivo.read_text(encoding="utf-8")) for arquivo in sorted(pasta.glob("particao_*.json"))
+    ]
+    leitores = [_linhas_do_pedaco(pasta / item["arquivo"]) for item in status]
+
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    with abrir_relatorio(destino, COLUNAS_RELATORIO, TIPOS_RELATORIO, log) as relatorio:
+        for linha in heapq.merge(*leitores, key=itemgetter(0)):
+            relatorio.escrever_valores(linha[1:])
+    log.info(f"✅ {len(status)} partições juntadas em: {relatorio.arquivo} ({relatorio.linhas_escritas} linhas)")
+
+    arquivo_excel = None
+    if exportar_excel and relatorio.arquivo.suffix != ".xlsx":
+        try:
+            arquivo_excel = exportar_xlsx(relatorio.arquivo, tipos=TIPOS_RELATORIO)
+            log.info(f"Cópia em Excel salva em: {arquivo_excel}")
+        except ModuleNotFoundError:
+            log.warning(
+                "⚠️  Biblioteca 'openpyxl' não encontrada: cópia em Excel não gerada (pip install openpyxl)."
+            )
+
+    return {
+        "relatorio": str(relatorio.arquivo),
+        "excel": arquivo_excel and str(arquivo_excel),
+        "linhas": relatorio.linhas_escritas,
+        "ignorados": sum(item["ignorados"] for item in status),
+        # A partição mais lenta define o tempo total: se uma destoa muito, divida em mais partições
+        "segundos_por_particao": [item["resumo"]["duracao_s"] for item in status],
+    }
+
+
+# --- 5. Tudo numa máquina só ---
+
+
+def _trabalhador(pasta, config):
+    # Roda no processo filho (precisa estar no nível do módulo para o "spawn" encontrar)
+    sys.exit(1 if trabalhar(pasta, config) else 0)
+
+
+def _conferir_filhos(pasta, filhos, log):
+    """Depois do join: aponta os processos que falharam e as partições que ficaram sem concluir."""
+    mortos = {filho.pid: filho.exitcode for filho in filhos if filho.exitcode != 0}
+    if not mortos:
+        return
+    for pid, codigo in mortos.items():
+        # Código 1: alguma partição falhou (ver .erro); negativo: morto por um sinal (ex: -9, falta de memória)
+        log.error(f"❌ processo {pid} terminou com código {codigo}")
+
+    nao_concluidas = []
+    for indice, estado in situacao(pasta).items():
+        if estado == "concluida":
+            continue
+        nome = _nome(indice)
+        nao_concluidas.append(indice)
+        trava = _ler_trava(pasta / f"{nome}.trava")
+        dono = trava[0] if trava is not None else {}
+        if estado == "em andamento" and dono.get("maquina") == socket.gethostname() and dono.get("pid") in mortos:
+            # O processo morreu com a partição na mão: soltamos a trava para refazer agora (sem esperar 5 min)
+            (pasta / f"{nome}.trava").unlink(missing_ok=True)
+            _apagar_parciais(pasta, indice, dono["pid"])
+            log.error(f"❌ {nome}: o processo {dono['pid']} morreu no meio dela")
+        elif estado == "falhou":
+            erro = (pasta / f"{nome}.erro").read_text(encoding="utf-8").strip().splitlines()
+            log.error(f"❌ {nome} falhou: {erro[-1] if erro else '?'}")
+        else:
+            log.error(f"❌ {nome}: {estado}")
+    if nao_concluidas:
+        raise RuntimeError(
+            f"Partições não concluídas: {nao_concluidas} "
+            f"(refaça com: trabalhar --pasta {pasta} --particao {' '.join(map(str, nao_concluidas))})"
+        )
+
+
+def executar(ids, pasta, destino, processos=None, particoes=None, modo="faixa", config=None):
+    """
+    Planeja, processa com 'processos' processos locais e junta. Devolve o resultado de juntar().
+
+    Com mais partições que processos (padrão: 4 por processo), quem termina antes pega a próxima,
+    e uma partição que falhou custa pouco para refazer.
+    O limite de requisições por segundo da API é dividido entre os processos.
+    """
+    config = config or ConfiguracaoCRM()
+    processos = processos or os.cpu_count() or 4
+    destino = Path(destino)
+    planejar(ids, pasta, particoes or processos * 4, modo, formato=destino.suffix)
+
+    config_processo = replace(
+        config, taxa_inicial=config.taxa_inicial / processos, taxa_maxima=config.taxa_maxima / processos
+    )
+    filhos = [CONTEXTO.Process(target=_trabalhador, args=(pasta, config_processo)) for _ in range(processos)]
+    for filho in filhos:
+        filho.start()
+    for filho in filhos:
+        filho.join()
+
+    log = configurar_log("execucao_particionada", config.nivel_log, config.formato_log)
+    _conferir_filhos(Path(pasta), filhos, log)
+    return juntar(pasta, destino, config.exportar_excel, log)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="execucao_particionada",
+        description="Divide a lista de IDs em partições, processa em vários processos/máquinas e junta na ordem.",
+    )
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    def opcoes_ids(sub):
+        sub.add_argument("--ids-file", type=Path, help="arquivo com um ID por linha (# para comentário)")
+        sub.add_argument("--ids", type=int, nargs="+", help="IDs direto na linha de comando")
+        sub.add_argument("--particoes", type=int, help="quantas partições (padrão: 4 por processo)")
+        sub.add_argument("--modo", choices=["faixa", "hash"], default="faixa", help="como dividir (padrão: faixa)")
+
+    def opcoes_consulta(sub):
+        sub.add_argument("--concorrencia", type=int, help="consultas simultâneas por processo (padrão: 16)")
+        sub.add_argument("--lote", type=int, help="IDs por consulta em lote (0 = um GET por ID; padrão: 50)")
+        sub.add_argument("--taxa-maxima", type=float, help="req/s (no 'executar', dividido entre os processos)")
+        sub.add_argument("--log-nivel", choices=["DEBUG", "INFO", "WARNING"], help="padrão: INFO")
+
+    def opcoes_saida(sub):
+        sub.add_argument("--out", type=Path, required=True, help="relatório final (a extensão define o formato)")
+        sub.add_argument("--sem-excel", action="store_true", help="não gera a cópia em Excel")
+
+    sub = comandos.add_parser("planejar", help="cria a pasta com as partições")
+    sub.add_argument("--pasta", type=Path, required=True)
+    opcoes_ids(sub)
+    sub.add_argument("--formato", default=".parquet", help="formato dos pedaços (padrão: .parquet)")
+
+    sub = comandos.add_parser("trabalhar", help="processa partições pendentes (rode em quantas máquinas quiser)")
+    sub.add_argument("--pasta", type=Path, required=True)
+    sub.add_argument("--particao", type=int, nargs="+", help="só estas partições (ex: refazer a que falhou)")
+    sub.add_argument("--refazer", action="store_true", help="processa de novo mesmo se já estiver concluída")
+    opcoes_consulta(sub)
+
+    sub = comandos.add_parser("juntar", help="junta os pedaços na ordem original")
+    sub.add_argument("--pasta", type=Path, required=True)
+    opcoes_saida(sub)
+
+    sub = comandos.add_parser("situacao", help="mostra o estado de cada partição")
+    sub.add_argument("--pasta", type=Path, required=True)
+
+    sub = comandos.add_parser("executar", help="planejar + trabalhar com N processos locais + juntar")
+    sub.add_argument("--pasta", type=Path, required=True)
+    sub.add_argument("--processos", type=int, help="padrão: número de CPUs")
+    opcoes_ids(sub)
+    opcoes_consulta(sub)
+    opcoes_saida(sub)
+
+    opcoes = parser.parse_args(argv)
+
+    config = ConfiguracaoCRM(exportar_excel=not getattr(opcoes, "sem_excel", True))
+    if getattr(opcoes, "concorrencia", None) is not None:
+        config.max_concorrencia = opcoes.concorrencia
+    if getattr(opcoes, "lote", None) is not None:
+        config.tamanho_lote = opcoes.lote or None
+    if getattr(opcoes, "taxa_maxima", None) is not None:
+        config.taxa_maxima = opcoes.taxa_maxima
+        config.taxa_inicial = min(config.taxa_inicial, opcoes.taxa_maxima)
+    if getattr(opcoes, "log_nivel", None) is not None:
+        config.nivel_log = opcoes.log_nivel
+
+    if opcoes.comando in ("planejar", "executar"):
+        if opcoes.ids_file is not None and opcoes.ids is not None:
+            parser.error("use --ids-file OU --ids")
+        try:
+            ids = ler_ids(opcoes.ids_file) if opcoes.ids_file is not None else opcoes.ids or IDS_EXEMPLO
+        except (OSError, ValueError) as erro:
+            parser.error(f"não foi possível ler {opcoes.ids_file}: {erro}")
+
+    try:
+        if opcoes.comando == "planejar":
+            planejar(ids, opcoes.pasta, opcoes.particoes or os.cpu_count() or 4, opcoes.modo, opcoes.formato)
+            print(f"Plano criado em {opcoes.pasta}: {ler_plano(opcoes.pasta)}")
+        elif opcoes.comando == "trabalhar":
+            return 1 if trabalhar(opcoes.pasta, config, opcoes.particao, opcoes.refazer) else 0
+        elif opcoes.comando == "situacao":
+            for indice, estado in situacao(opcoes.pasta).items():
+                print(f"{_nome(indice)}: {estado}")
+        elif opcoes.comando == "juntar":
+            print(juntar(opcoes.pasta, opcoes.out, config.exportar_excel))
+        else:
+            print(executar(ids, opcoes.pasta, opcoes.out, opcoes.processos, opcoes.particoes, opcoes.modo, config))
+    except (FileExistsError, FileNotFoundError, RuntimeError) as erro:
+        print(f"ERRO: {erro}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,99 +1,286 @@
-import requests
-import pandas as pd
+import argparse
+import sys
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 
-# --- DESAFIO: INTEGRAÇÃO CRM (REQUESTS + PANDAS) ---
+import caminhos  # noqa: F401  (coloca snippets/ no sys.path)
+from checkpoint import Checkpoint
+from escrita_relatorios import abrir_escritor, exportar_xlsx
+from instrumentacao import Instrumentacao, configurar_log, perfis_do_ambiente
+
+# --- DESAFIO: INTEGRAÇÃO CRM (REQUESTS + EXCEL) ---
 # Objetivo: Consultar uma lista de usuários na API e gerar um Excel para o Marketing.
 # Requisitos: Tratamento de erro para usuários inexistentes.
+#
+# Importar este módulo não faz nada além de definir funções: o trabalho roda em integrar()
+# (para usar de outro programa, ex: um orquestrador que fica ligado) ou pela linha de comando:
+#     python -m integracao_crm --ids-file ids.txt --out relatorio_leads.parquet
+# Bibliotecas pesadas só são importadas quando a etapa que precisa delas roda:
+# requests na consulta, pyarrow na escrita do Parquet/Arrow, openpyxl na cópia em Excel.
+# Um relatório em CSV sem cópia em Excel nem chega a carregar o pyarrow.
 
-# 1. Configuração Inicial
-# Lista de IDs que precisamos enriquecer com dados da API.
+# Lista de IDs usada quando nenhuma é passada.
 # Note que o ID 150 não existe propositalmente para testarmos o erro.
-ids_usuarios = [1, 3, 5, 150]
+IDS_EXEMPLO = [1, 3, 5, 150]
+
+
+@dataclass
+class ConfiguracaoCRM:
+    # Onde vamos salvar o relatório final?
+    # Usando pathlib para garantir que funcione em Windows/Mac/Linux
+    # O formato sai da extensão (.parquet, .arrow, .csv ou .xlsx; ver escrita_relatorios.py).
+    # Parquet é tipado, comprimido e muito mais rápido de gravar e ler que o Excel.
+    arquivo_saida: Path = field(default_factory=lambda: Path.cwd() / "relatorio_leads.parquet")
+
+    # Cópia em Excel para o Marketing, gerada a partir do relatório no final (passo opcional e o mais lento)
+    exportar_excel: bool = True
+
+    # Quantas consultas podem rodar ao mesmo tempo (ver enriquecimento.py)
+    max_concorrencia: int = 16
+
+    # Consultas em lote (ver enriquecimento.py): a API aceita /users?id=1&id=3...
+    # tamanho_lote = None desliga o lote (um GET por ID).
+    # total_catalogo: quantos usuários a API tem; se pedirmos a maioria, baixamos a listagem completa.
+    tamanho_lote: int = 50
+    total_catalogo: int = None
+
+    # Limite de requisições por segundo (ver controle_taxa.py).
+    # Começa em 20 req/s e se ajusta sozinho: sobe enquanto a API aceita e cai a cada 429.
+    taxa_inicial: float = 20
+    taxa_maxima: float = 200
+
+    # Cache das respostas da API entre execuções (ver cache_respostas.py).
+    # Usuários consultados há pouco tempo (e IDs inexistentes) não vão de novo na API.
+    arquivo_cache: Path = field(default_factory=lambda: Path.cwd() / "cache_crm.sqlite3")
+
+    # Modo incremental (ver checkpoint.py): só consulta IDs novos ou processados há mais de 24h,
+    # e retoma de onde parou se a execução anterior travou no meio.
+    # Com False, todos os IDs são consultados de novo (o checkpoint continua sendo atualizado).
+    modo_incremental: bool = True
+    arquivo_checkpoint: Path = field(default_factory=lambda: Path.cwd() / "checkpoint_crm.sqlite3")
 
-# Onde vamos salvar o relatório final?
-# Usando pathlib para garantir que funcione em Windows/Mac/Linux
-arquivo_saida = Path.cwd() / "relatorio_leads.xlsx"
+    # Log e métricas (ver snippets/instrumentacao.py)
+    # "DEBUG" mostra uma linha por lead; "INFO" só o andamento e o resumo
+    # (com 100 mil leads, imprimir cada linha no terminal já deixa a execução mais lenta).
+    nivel_log: str = "INFO"
+    formato_log: str = "texto"  # ou "json": uma linha JSON por evento
+    # Tempo por etapa, latência das requisições (p50/p95/p99), status HTTP, bytes e pico de memória
+    arquivo_resumo: Path = field(default_factory=lambda: Path.cwd() / "resumo_execucao.json")
+    # Perfil opcional: AUTOMACAO_PERFIL=cprofile,tracemalloc python integracao_crm.py
+    arquivo_perfil: Path = field(default_factory=lambda: Path.cwd() / "perfil_crm.prof")
 
-# Lista vazia para acumularmos os dados processados antes de criar o DataFrame
-dados_processados = []
+    @property
+    def arquivo_alteracoes(self):
+        # Só as linhas novas ou que mudaram desde a última execução (para quem só quer o delta)
+        return self.arquivo_saida.with_name(f"{self.arquivo_saida.stem}_alteracoes.csv")
 
-print("--- INICIANDO PROCESSAMENTO DE LEADS ---\n")
 
-# 2. Loop de Processamento
-# Para cada ID na nossa lista, vamos fazer uma chamada de API.
-for id_usuario in ids_usuarios:
-    print(f"Consultando usuário ID: {id_usuario}...", end="")
-    
-    url = f"https://jsonplaceholder.typicode.com/users/{id_usuario}"
-    
+def ler_ids(arquivo):
+    """Um ID por linha; linhas vazias e comentários (#) são ignorados."""
+    linhas = Path(arquivo).read_text(encoding="utf-8").splitlines()
+    return [int(linha) for linha in map(str.strip, linhas) if linha and not linha.startswith("#")]
+
+
+def abrir_relatorio(arquivo, colunas, tipos, log):
+    # As linhas vão para o arquivo em streaming (ver snippets/escrita_relatorios.py)
     try:
-        # Fazendo a requisição GET
-        response = requests.get(url)
-        
-        # AQUI ESTÁ O TRULO (A Regra de Ouro):
-        # O .raise_for_status() vai olhar o código HTTP.
-        # Se for 200 (OK), não faz nada.
-        # Se for 404 (Não Encontrado) ou 500 (Erro Servidor), lança um erro (exceção).
-        response.raise_for_status()
-        
-        # --- SUCESSO ---
-        # Se o código chegou aqui, significa que o usuário existe!
-        dados_api = response.json()
-        
-        # Extraindo apenas o que o Marketing pediu
-        # O JSON da API user tem campos aninhados (address -> city)
-        info_usuario = {
-            "ID": id_usuario,
-            "Nome": dados_api["name"],
-            "Email": dados_api["email"],
-            "Cidade": dados_api["address"]["city"],
-            "Status": "Ativo" # Campo extra que criamos
-        }
-        print(" OK!")
-        
-    except requests.exceptions.HTTPError as e:
-        # --- ERRO ---
-        # Aconteceu algum erro HTTP (ex: 404 Not Found)
-        print(" FALHOU (Não Encontrado)")
-        
-        # Estratégia de Fallback:
-        # Mesmo com erro, queremos registrar esse ID no relatório,
-        # mas com valores vazios, para o time saber que procuramos.
-        info_usuario = {
-            "ID": id_usuario,
-            "Nome": "Não Encontrado",
-            "Email": "-",
-            "Cidade": "-",
-            "Status": "Erro na Consulta"
+        return abrir_escritor(arquivo, colunas, tipos=tipos)
+    except ModuleNotFoundError as erro:
+        log.warning(
+            f"⚠️  Biblioteca '{erro.name}' não encontrada (pip install {erro.name}). "
+            f"Salvando em CSV em vez de {arquivo.suffix}..."
+        )
+        return abrir_escritor(arquivo.with_suffix(".csv"), colunas)
+
+
+def integrar(ids_usuarios, config=None):
+    """
+    Consulta os IDs na API e gera o relatório (e a cópia em Excel, se configurado).
+
+    Devolve o resumo da execução (o mesmo dicionário salvo em config.arquivo_resumo).
+    """
+    config = config or ConfiguracaoCRM()
+
+    # Imports da etapa de consulta (requests e companhia) só quando ela vai rodar de verdade
+    from cache_respostas import CacheRespostas
+    from cliente_http import criar_sessao, metricas_conexoes
+    from controle_taxa import LimitadorTaxa
+    from enriquecimento import COLUNAS_RELATORIO, TIPOS_RELATORIO, enriquecer_leads, planejar_consultas
+
+    log = configurar_log("integracao_crm", config.nivel_log, config.formato_log)
+    instrumentacao = Instrumentacao("integracao_crm")
+    limitador = LimitadorTaxa(taxa_inicial=config.taxa_inicial, taxa_maxima=config.taxa_maxima)
+    arquivo_alteracoes = config.arquivo_alteracoes
+    config.arquivo_saida.parent.mkdir(parents=True, exist_ok=True)
+
+    log.info("--- INICIANDO PROCESSAMENTO DE LEADS ---")
+
+    # 2. Loop de Processamento
+    # As chamadas de API agora rodam em paralelo (enriquecer_leads),
+    # mas os resultados chegam aqui na mesma ordem da lista de IDs.
+    # A sessão (cliente_http.py) reaproveita as conexões e aplica token e timeout.
+    # Nenhuma lista acumula as linhas: cada uma vai direto para o disco.
+    with (
+        instrumentacao.perfilar(**perfis_do_ambiente(), arquivo_perfil=config.arquivo_perfil),
+        criar_sessao(
+            max_por_host=config.max_concorrencia, limitador=limitador, instrumentacao=instrumentacao
+        ) as sessao,
+        CacheRespostas(config.arquivo_cache) as cache,
+        Checkpoint(config.arquivo_checkpoint) as checkpoint,
+        abrir_escritor(arquivo_alteracoes, COLUNAS_RELATORIO) as alteracoes,
+        # No modo completo, o relatório é escrito durante o loop;
+        # no incremental, ele é montado depois a partir do checkpoint.
+        nullcontext()
+        if config.modo_incremental
+        else abrir_relatorio(config.arquivo_saida, COLUNAS_RELATORIO, TIPOS_RELATORIO, log) as relatorio,
+    ):
+        with instrumentacao.etapa("planejamento"):
+            ids_para_consultar = checkpoint.ids_pendentes(ids_usuarios) if config.modo_incremental else ids_usuarios
+            plano = planejar_consultas(ids_para_consultar, config.tamanho_lote, config.total_catalogo)
+        log.info(f"{len(ids_para_consultar)} de {len(ids_usuarios)} IDs precisam ser consultados ({plano.motivo}).")
+
+        # "consulta": tempo esperando cada resultado (API + montagem da linha, nas threads)
+        resultados = enriquecer_leads(
+            ids_para_consultar, max_concorrencia=config.max_concorrencia, sessao=sessao, cache=cache, plano=plano
+        )
+        for resultado in instrumentacao.cronometrar(resultados, "consulta"):
+            if resultado.ignorado:
+                # Erros genéricos (ex: sem internet) ou 429/5xx que persistiram após as retentativas
+                erro = {"id": resultado.id_usuario, "erro": resultado.erro}
+                log.warning("ERRO CRÍTICO", extra={"campos": erro})
+                continue # Pula para o próximo ID
+
+            # Uma linha por lead só no nível DEBUG (no INFO nem chega a ser formatada).
+            # "Não Encontrado" = a API respondeu 404: o ID entra no relatório com valores vazios.
+            log.debug(
+                "Lead consultado",
+                extra={"campos": {"id": resultado.id_usuario, "status": resultado.registro.status}},
+            )
+
+            with instrumentacao.etapa("escrita"):
+                # A linha (seja de sucesso ou erro) vai direto para o relatório
+                if relatorio is not None:
+                    relatorio.escrever_valores(resultado.registro.valores())
+
+                # O checkpoint guarda a linha e diz se ela é nova/mudou desde a última execução
+                linha = resultado.linha
+                if checkpoint.registrar(linha):
+                    alteracoes.escrever(linha)
+
+        conexoes = metricas_conexoes(sessao)
+        log.info(f"Conexões: {conexoes}")
+        log.info(
+            f"Retentativas: {sessao.retentativas} | 429 recebidos: {limitador.limitacoes} | "
+            f"taxa final: {limitador.taxa:.1f} req/s"
+        )
+        log.info(f"Cache: {cache.contadores}")
+        log.info(f"Checkpoint: {checkpoint.contadores}")
+
+        # 3. Geração do Relatório
+        if config.modo_incremental:
+            log.info("--- GERANDO RELATÓRIO ---")
+            # O relatório completo sai do checkpoint (sem rede): linhas frescas + recém-consultadas.
+            # checkpoint.linhas() é um gerador, então a memória continua estável.
+            with (
+                instrumentacao.etapa("relatorio"),
+                abrir_relatorio(config.arquivo_saida, COLUNAS_RELATORIO, TIPOS_RELATORIO, log) as relatorio,
+            ):
+                for linha in checkpoint.linhas(ids_usuarios):
+                    relatorio.escrever(linha)
+
+    log.info(f"✅ SUCESSO! Relatório salvo em: {relatorio.arquivo} ({relatorio.linhas_escritas} linhas)")
+
+    # 4. Exportação para Excel (opcional)
+    arquivo_excel = None
+    if config.exportar_excel and relatorio.arquivo.suffix != ".xlsx":
+        try:
+            with instrumentacao.etapa("exportacao_excel"):
+                arquivo_excel = exportar_xlsx(relatorio.arquivo, tipos=TIPOS_RELATORIO)
+            log.info(f"Cópia em Excel salva em: {arquivo_excel}")
+        except ModuleNotFoundError:
+            log.warning(
+                "⚠️  Biblioteca 'openpyxl' não encontrada: cópia em Excel não gerada (pip install openpyxl)."
+            )
+
+    # Delta: apenas as linhas que entraram ou mudaram nesta execução
+    if alteracoes.linhas_escritas:
+        log.info(f"{alteracoes.linhas_escritas} linhas novas/alteradas salvas em: {arquivo_alteracoes}")
+    else:
+        # Apagamos o delta vazio para ninguém reprocessar alterações de uma execução passada
+        arquivo_alteracoes.unlink(missing_ok=True)
+        log.info("Nenhuma linha mudou desde a última execução.")
+
+    # 5. Resumo da execução (para comparar execuções e achar o gargalo)
+    instrumentacao.extras.update(
+        {
+            "leads": {
+                "total": len(ids_usuarios),
+                "consultados": len(ids_para_consultar),
+                "no_relatorio": relatorio.linhas_escritas,
+            },
+            "arquivos": {
+                "relatorio": str(relatorio.arquivo),
+                "excel": arquivo_excel and str(arquivo_excel),
+                "alteracoes": str(arquivo_alteracoes) if alteracoes.linhas_escritas else None,
+            },
+            "conexoes": asdict(conexoes),
+            "retentativas": sessao.retentativas,
+            "cache": asdict(cache.contadores),
+            "checkpoint": asdict(checkpoint.contadores),
         }
-        
-    except Exception as e:
-        # Captura erros genéricos (ex: sem internet)
-        print(f" ERRO CRÍTICO: {e}")
-        continue # Pula para o próximo ID
-
-    # Adicionamos o dicionário (seja de sucesso ou erro) na nossa lista principal
-    dados_processados.append(info_usuario)
-
-# 3. Geração do Relatório (PANDAS)
-print("\n--- GERANDO RELATÓRIO EXCEL ---")
-
-# Transformando a lista de dicionários em uma Tabela (DataFrame)
-df = pd.DataFrame(dados_processados)
-
-# Mostrando uma prévia no terminal
-print(df)
-
-# Salvando em Excel
-try:
-    # index=False: Não queremos salvar os números 0, 1, 2, 3... da margem do pandas
-    df.to_excel(arquivo_saida, index=False)
-    print(f"\n✅ SUCESSO! Relatório salvo em: {arquivo_saida}")
-except ModuleNotFoundError:
-    print("\n⚠️  AVISO: Biblioteca 'openpyxl' não encontrada.")
-    print("Para salvar em Excel, instale com: pip install openpyxl")
-    print("Salvando em CSV como alternativa...")
-    df.to_csv(arquivo_saida.with_suffix(".csv"), index=False)
-except Exception as e:
-    print(f"\n❌ Erro ao salvar arquivo: {e}")
+    )
+    log.info(f"\n{instrumentacao}")
+    log.info(f"Resumo da execução salvo em: {instrumentacao.salvar_resumo(config.arquivo_resumo)}")
+    return instrumentacao.resumo()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="integracao_crm",
+        description="Consulta uma lista de IDs na API e gera o relatório de leads (Parquet/Arrow/CSV/Excel).",
+    )
+    parser.add_argument("--ids-file", type=Path, help="arquivo com um ID por linha (# para comentário)")
+    parser.add_argument("--ids", type=int, nargs="+", help="IDs direto na linha de comando")
+    parser.add_argument(
+        "--out", type=Path, help="relatório (a extensão define o formato; padrão: relatorio_leads.parquet)"
+    )
+    parser.add_argument("--sem-excel", action="store_true", help="não gera a cópia em Excel")
+    parser.add_argument("--completo", action="store_true", help="consulta todos os IDs (desliga o modo incremental)")
+    parser.add_argument("--concorrencia", type=int, help="consultas simultâneas (padrão: 16)")
+    parser.add_argument("--lote", type=int, help="IDs por consulta em lote (0 = um GET por ID; padrão: 50)")
+    parser.add_argument("--log-nivel", choices=["DEBUG", "INFO", "WARNING"], help="padrão: INFO")
+    parser.add_argument("--log-formato", choices=["texto", "json"], help="padrão: texto")
+    parser.add_argument("--resumo", type=Path, help="JSON com o resumo da execução (padrão: resumo_execucao.json)")
+    opcoes = parser.parse_args(argv)
+
+    if opcoes.ids_file is not None and opcoes.ids is not None:
+        parser.error("use --ids-file OU --ids")
+    if opcoes.ids_file is not None:
+        try:
+            ids_usuarios = ler_ids(opcoes.ids_file)
+        except (OSError, ValueError) as erro:
+            parser.error(f"não foi possível ler {opcoes.ids_file}: {erro}")
+    else:
+        ids_usuarios = opcoes.ids or IDS_EXEMPLO
+
+    config = ConfiguracaoCRM(exportar_excel=not opcoes.sem_excel, modo_incremental=not opcoes.completo)
+    if opcoes.out is not None:
+        config.arquivo_saida = opcoes.out.resolve()
+    if opcoes.concorrencia is not None:
+        config.max_concorrencia = opcoes.concorrencia
+    if opcoes.lote is not None:
+        config.tamanho_lote = opcoes.lote or None
+    if opcoes.log_nivel is not None:
+        config.nivel_log = opcoes.log_nivel
+    if opcoes.log_formato is not None:
+        config.formato_log = opcoes.log_formato
+    if opcoes.resumo is not None:
+        config.arquivo_resumo = opcoes.resumo
+
+    integrar(ids_usuarios, config)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+import argparse
+import sys
+from pathlib import Path
+
+import caminhos  # noqa: F401  (coloca snippets/ no sys.path)
+from escrita_relatorios import abrir_escritor
+from integracao_crm import ConfiguracaoCRM, ler_ids
+
+# --- INTEGRAÇÃO CRM SOB DEMANDA (INBOX) ---
+# Em vez de agendar o integracao_crm.py a cada minuto, este script fica ligado
+# observando a pasta de entrada: solte um .txt com IDs (um por linha) em inbox_leads/
+# e o relatório enriquecido sai em relatorios/ em milissegundos + o tempo da API.
+# O .txt processado vai para processados/ (se der erro, vai para processados.erros/).
+#
+# Importar este módulo não liga o observador; pela linha de comando:
+#     python observar_inbox.py --inbox inbox_leads --formato .csv
+# Pare com Ctrl+C.
+
+# Formato do relatório de cada arquivo (ver escrita_relatorios.py)
+EXTENSAO_RELATORIO_PADRAO = ".parquet"
+
+
+def criar_processador(sessao, cache, pasta_relatorios, extensao_relatorio, max_concorrencia):
+    """Devolve a função que transforma um .txt de IDs em relatorios/<nome><extensao_relatorio>."""
+    from enriquecimento import COLUNAS_RELATORIO, TIPOS_RELATORIO, enriquecer_leads
+
+    def gerar_relatorio(arquivo_ids):
+        # Chamado com o arquivo já reivindicado (ninguém mais está processando ele)
+        ids = ler_ids(arquivo_ids)
+        destino = pasta_relatorios / f"{arquivo_ids.stem}{extensao_relatorio}"
+        ignorados = 0
+        with abrir_escritor(destino, COLUNAS_RELATORIO, tipos=TIPOS_RELATORIO) as relatorio:
+            for resultado in enriquecer_leads(ids, max_concorrencia=max_concorrencia, sessao=sessao, cache=cache):
+                if resultado.ignorado:
+                    ignorados += 1
+                    continue
+                relatorio.escrever_valores(resultado.registro.valores())
+        print(f"✅ {arquivo_ids.name}: {relatorio.linhas_escritas} leads -> {destino} ({ignorados} com erro crítico)")
+
+    return gerar_relatorio
+
+
+def observar(
+    pasta_inbox,
+    pasta_processados,
+    pasta_relatorios,
+    extensao_relatorio=EXTENSAO_RELATORIO_PADRAO,
+    config=None,
+):
+    """Fica ligado gerando um relatório para cada .txt que chega na inbox (até o Ctrl+C)."""
+    config = config or ConfiguracaoCRM()
+
+    # Imports da consulta (requests e companhia) e do inotify só quando o observador liga de verdade
+    from cache_respostas import CacheRespostas
+    from cliente_http import criar_sessao
+    from controle_taxa import LimitadorTaxa
+    from observador_inbox import ObservadorInbox, consumidor_mover, consumir
+
+    # O mesmo limite de taxa do integracao_crm.py: uma rajada de arquivos na inbox
+    # não pode virar uma rajada de 429 na API
+    limitador = LimitadorTaxa(taxa_inicial=config.taxa_inicial, taxa_maxima=config.taxa_maxima)
+    pasta_relatorios.mkdir(parents=True, exist_ok=True)
+
+    with (
+        criar_sessao(max_por_host=config.max_concorrencia, limitador=limitador) as sessao,
+        CacheRespostas(config.arquivo_cache) as cache,
+        ObservadorInbox(pasta_inbox, "*.txt") as observador,
+    ):
+        print(f"--- OBSERVANDO {pasta_inbox} ({observador.modo}) ---")
+        processar = criar_processador(sessao, cache, pasta_relatorios, extensao_relatorio, config.max_concorrencia)
+        try:
+            consumir(observador, consumidor_mover(pasta_inbox, pasta_processados, processar=processar))
+        except KeyboardInterrupt:
+            print("\nEncerrando...")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="observar_inbox",
+        description="Observa a inbox e gera um relatório de leads para cada arquivo de IDs que chega.",
+    )
+    parser.add_argument("--inbox", type=Path, default=Path("inbox_leads"), help="padrão: inbox_leads/")
+    parser.add_argument("--processados", type=Path, default=Path("processados"), help="padrão: processados/")
+    parser.add_argument("--relatorios", type=Path, default=Path("relatorios"), help="padrão: relatorios/")
+    parser.add_argument(
+        "--formato",
+        default=EXTENSAO_RELATORIO_PADRAO,
+        choices=[".parquet", ".arrow", ".csv", ".xlsx"],
+        help="formato de cada relatório (padrão: .parquet)",
+    )
+    parser.add_argument("--concorrencia", type=int, help="consultas simultâneas (padrão: 16)")
+    opcoes = parser.parse_args(argv)
+
+    config = ConfiguracaoCRM()
+    if opcoes.concorrencia is not None:
+        config.max_concorrencia = opcoes.concorrencia
+
+    observar(
+        opcoes.inbox.resolve(),
+        opcoes.processados.resolve(),
+        opcoes.relatorios.resolve(),
+        opcoes.formato,
+        config,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
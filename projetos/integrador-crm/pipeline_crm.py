@@ -0,0 +1,189 @@
+import argparse
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import asdict
+from itertools import islice
+from pathlib import Path
+
+import caminhos  # noqa: F401  (coloca snippets/ no sys.path)
+from escrita_relatorios import exportar_xlsx
+from instrumentacao import Instrumentacao, configurar_log
+from integracao_crm import IDS_EXEMPLO, ConfiguracaoCRM, abrir_relatorio, ler_ids
+from pipeline import Pipeline
+
+# --- INTEGRAÇÃO CRM EM PIPELINE ---
+# O mesmo relatório do integracao_crm.py (modo completo), montado por etapas que rodam ao mesmo tempo
+# (ver snippets/pipeline.py), ligadas por filas limitadas:
+#     fonte (blocos de IDs) -> consulta (API, várias threads) -> limpeza (pandas) -> escrita (na ordem da lista)
+# Enquanto a escrita grava um bloco, a limpeza já prepara o próximo e a consulta busca os seguintes.
+# Se a escrita ficar para trás (ex: .xlsx), as filas enchem e a consulta espera: a memória não cresce.
+# No fim, a utilização de cada etapa mostra qual delas é o gargalo.
+#
+# Uso:
+#     python pipeline_crm.py --ids-file ids.txt --out relatorio_leads.parquet --limpeza 2
+# Ctrl+C para de ler IDs e termina os blocos que já entraram (o relatório fecha válido); Ctrl+C de novo aborta.
+
+# IDs por item da pipeline: cada bloco é UMA consulta em lote (ou N GETs espalhados pelo pool de conexões)
+TAMANHO_BLOCO_PADRAO = 50
+TRABALHADORES_LIMPEZA_PADRAO = 1
+
+
+def limpar_bloco(resultados, colunas):
+    """Monta o DataFrame do bloco direto das colunas (sem lista de dicts), com o Status como category."""
+    import pandas as pd
+
+    registros = [resultado.registro.valores() for resultado in resultados if not resultado.ignorado]
+    if not registros:
+        return None  # None descarta o item: o bloco inteiro deu erro crítico
+    df = pd.DataFrame(dict(zip(colunas, zip(*registros))))
+    # Sem mexer nos valores: o relatório tem que sair igual ao do integracao_crm.py
+    # (no CSV, byte a byte: escrever_bloco termina as linhas em \r\n, como o escrever_valores)
+    df["Status"] = df["Status"].astype("category")
+    return df
+
+
+def integrar_em_pipeline(ids_usuarios, config=None, trabalhadores_limpeza=TRABALHADORES_LIMPEZA_PADRAO):
+    """Consulta os IDs e gera o relatório pela pipeline. Devolve o resumo da execução."""
+    from cache_respostas import CacheRespostas
+    from cliente_http import criar_sessao, metricas_conexoes, url_base
+    from controle_taxa import LimitadorTaxa
+    from enriquecimento import (
+        COLUNAS_RELATORIO,
+        TIPOS_RELATORIO,
+        consultar_bloco,
+        consultar_usuario,
+        planejar_consultas,
+    )
+
+    config = config or ConfiguracaoCRM()
+    log = configurar_log("pipeline_crm", config.nivel_log, config.formato_log)
+    instrumentacao = Instrumentacao("pipeline_crm")
+    limitador = LimitadorTaxa(taxa_inicial=config.taxa_inicial, taxa_maxima=config.taxa_maxima)
+    base_url = url_base()
+    plano = planejar_consultas(ids_usuarios, config.tamanho_lote, None)
+    tamanho_bloco = plano.tamanho_lote if plano.tamanho_lote > 1 else TAMANHO_BLOCO_PADRAO
+    ignorados = 0
+    trava_ignorados = threading.Lock()
+    config.arquivo_saida.parent.mkdir(parents=True, exist_ok=True)
+
+    log.info(f"--- INICIANDO PIPELINE: {len(ids_usuarios)} IDs em blocos de {tamanho_bloco} ({plano.motivo}) ---")
+    em_lote = plano.tamanho_lote > 1
+    # Com lote: uma thread de consulta por conexão do pool, cada uma com um bloco (uma requisição).
+    # Sem lote: os GETs de cada bloco se espalham por um pool com uma thread por conexão; duas threads de
+    # consulta bastam para o próximo bloco começar enquanto os últimos GETs do anterior terminam.
+    trabalhadores_consulta = config.max_concorrencia if em_lote else 2
+    with (
+        criar_sessao(
+            max_por_host=config.max_concorrencia, limitador=limitador, instrumentacao=instrumentacao
+        ) as sessao,
+        CacheRespostas(config.arquivo_cache) as cache,
+        abrir_relatorio(config.arquivo_saida, COLUNAS_RELATORIO, TIPOS_RELATORIO, log) as relatorio,
+        nullcontext() if em_lote else ThreadPoolExecutor(max_workers=config.max_concorrencia) as executor,
+    ):
+
+        def consultar(bloco):
+            if em_lote:
+                return consultar_bloco(sessao, bloco, base_url, cache)
+            # map devolve na ordem do bloco, igual ao GET um a um
+            return list(executor.map(lambda id_usuario: consultar_usuario(sessao, id_usuario, base_url, cache), bloco))
+
+        def limpar(resultados):
+            nonlocal ignorados
+            erros = [resultado for resultado in resultados if resultado.ignorado]
+            for resultado in erros:
+                erro = {"id": resultado.id_usuario, "erro": resultado.erro}
+                log.warning("ERRO CRÍTICO", extra={"campos": erro})
+            if erros:
+                # Pode haver mais de uma thread de limpeza somando ao mesmo tempo
+                with trava_ignorados:
+                    ignorados += len(erros)
+            return limpar_bloco(resultados, COLUNAS_RELATORIO)
+
+        pipeline = Pipeline(tamanho_fila=max(2, config.max_concorrencia // 2))
+        # A escrita recebe os blocos na ordem da lista
+        pipeline.etapa("consulta", consultar, trabalhadores=trabalhadores_consulta)
+        pipeline.etapa("limpeza", limpar, trabalhadores=trabalhadores_limpeza)
+        pipeline.etapa("escrita", relatorio.escrever_bloco, em_ordem=True)
+        ids = iter(ids_usuarios)
+        blocos = iter(lambda: list(islice(ids, tamanho_bloco)), [])
+        relatorio_pipeline = pipeline.executar(blocos, instrumentacao)
+        conexoes = metricas_conexoes(sessao)
+
+    if relatorio_pipeline.cancelado:
+        log.warning("⚠️  Cancelado: o relatório tem só os blocos que já tinham entrado na pipeline.")
+    log.info(
+        f"✅ Relatório salvo em: {relatorio.arquivo} ({relatorio.linhas_escritas} linhas, {ignorados} ignorados)"
+    )
+    log.info(f"\n{relatorio_pipeline}")
+
+    arquivo_excel = None
+    if config.exportar_excel and relatorio.arquivo.suffix != ".xlsx" and not relatorio_pipeline.cancelado:
+        try:
+            with instrumentacao.etapa("exportacao_excel"):
+                arquivo_excel = exportar_xlsx(relatorio.arquivo, tipos=TIPOS_RELATORIO)
+            log.info(f"Cópia em Excel salva em: {arquivo_excel}")
+        except ModuleNotFoundError:
+            log.warning(
+                "⚠️  Biblioteca 'openpyxl' não encontrada: cópia em Excel não gerada (pip install openpyxl)."
+            )
+
+    instrumentacao.extras.update(
+        {
+            "leads": {"total": len(ids_usuarios), "no_relatorio": relatorio.linhas_escritas, "ignorados": ignorados},
+            "arquivos": {"relatorio": str(relatorio.arquivo), "excel": arquivo_excel and str(arquivo_excel)},
+            "conexoes": asdict(conexoes),
+            "retentativas": sessao.retentativas,
+            "cache": asdict(cache.contadores),
+        }
+    )
+    log.info(f"\n{instrumentacao}")
+    log.info(f"Resumo da execução salvo em: {instrumentacao.salvar_resumo(config.arquivo_resumo)}")
+    return instrumentacao.resumo()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="pipeline_crm",
+        description="Gera o relatório de leads com consulta, limpeza e escrita rodando ao mesmo tempo.",
+    )
+    parser.add_argument("--ids-file", type=Path, help="arquivo com um ID por linha (# para comentário)")
+    parser.add_argument("--ids", type=int, nargs="+", help="IDs direto na linha de comando")
+    parser.add_argument(
+        "--out", type=Path, help="relatório (a extensão define o formato; padrão: relatorio_leads.parquet)"
+    )
+    parser.add_argument("--sem-excel", action="store_true", help="não gera a cópia em Excel")
+    parser.add_argument("--consultas", type=int, help="threads de consulta (padrão: 16)")
+    parser.add_argument("--limpeza", type=int, default=TRABALHADORES_LIMPEZA_PADRAO, help="threads de limpeza")
+    parser.add_argument("--lote", type=int, help="IDs por consulta em lote (0 = um GET por ID; padrão: 50)")
+    parser.add_argument("--log-nivel", choices=["DEBUG", "INFO", "WARNING"], help="padrão: INFO")
+    parser.add_argument("--resumo", type=Path, help="JSON com o resumo da execução (padrão: resumo_execucao.json)")
+    opcoes = parser.parse_args(argv)
+
+    if opcoes.ids_file is not None and opcoes.ids is not None:
+        parser.error("use --ids-file OU --ids")
+    try:
+        ids_usuarios = ler_ids(opcoes.ids_file) if opcoes.ids_file is not None else opcoes.ids or IDS_EXEMPLO
+    except (OSError, ValueError) as erro:
+        parser.error(f"não foi possível ler {opcoes.ids_file}: {erro}")
+
+    config = ConfiguracaoCRM(exportar_excel=not opcoes.sem_excel, modo_incremental=False)
+    if opcoes.out is not None:
+        config.arquivo_saida = opcoes.out.resolve()
+    if opcoes.consultas is not None:
+        config.max_concorrencia = opcoes.consultas
+    if opcoes.lote is not None:
+        config.tamanho_lote = opcoes.lote or None
+    if opcoes.log_nivel is not None:
+        config.nivel_log = opcoes.log_nivel
+    if opcoes.resumo is not None:
+        config.arquivo_resumo = opcoes.resumo
+
+    resumo = integrar_em_pipeline(ids_usuarios, config, opcoes.limpeza)
+    # 130: o código de saída de costume para "interrompido com Ctrl+C"
+    return 130 if resumo["pipeline"]["cancelado"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
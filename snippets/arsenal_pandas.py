@@ -1,99 +1,172 @@
-import pandas as pd
 from pathlib import Path
 
+from despachante import despachar
+from escrita_relatorios import salvar_dataframe
+
 # --- FUNDAMENTOS DE PANDAS PARA AUTOMAÇÃO ---
 # Instalação necessária: pip install pandas openpyxl
+# Cada seção virou uma função: importar este arquivo não grava nada e nem carrega o pandas
+# (o import do pandas leva centenas de ms; ele só acontece quando uma função precisa dele).
+# Para ver o passo a passo completo: python arsenal_pandas.py
 
 # 1. Criação de Dados (Simulando uma extração de dados)
 # Em automações, muitas vezes você extrai dados de APIs ou sites e monta uma lista de dicionários.
-dados_brutos = [
+DADOS_BRUTOS = [
     {"id": 1, "produto": "Notebook", "valor": 4500.00, "status": "entregue"},
     {"id": 2, "produto": "Mouse", "valor": 150.00, "status": "pendente"},
     {"id": 3, "produto": "Teclado", "valor": 300.00, "status": "entregue"},
     {"id": 4, "produto": "Monitor", "valor": 1200.00, "status": "cancelado"},
 ]
 
-# Criando o DataFrame (a tabela do Excel dentro do Python)
-df = pd.DataFrame(dados_brutos)
+# Dados sujos comuns em automação
+DADOS_SUJOS = [
+    {"data": "2024-01-15", "valor_texto": "R$ 1.000,00"},
+    {"data": "2024-01-20", "valor_texto": "R$ 500,50"},
+    {"data": "invalid_date", "valor_texto": "R$ 0,00"} # Erro proposital
+]
+
+
+def criar_dataframe(dados):
+    import pandas as pd
+
+    # Criando o DataFrame (a tabela do Excel dentro do Python)
+    return pd.DataFrame(dados)
 
-print("--- Tabela Original ---")
-print(df)
 
 # 2. Exportação de Dados (Salvando relatórios)
 # É comum salvar o resultado da automação em Excel ou CSV.
-arquivo_csv = Path.cwd() / "relatorio_vendas.csv"
-arquivo_excel = Path.cwd() / "relatorio_vendas.xlsx"
+def exportar_relatorio(df, pasta):
+    """Salva o relatório em CSV (e em Parquet, se o pyarrow estiver instalado). Devolve os arquivos."""
+    arquivo_csv = pasta / "relatorio_vendas.csv"
+    # arquivo_excel = pasta / "relatorio_vendas.xlsx"
+
+    # index=False remove a numeração das linhas (0, 1, 2...) do arquivo final
+    df.to_csv(arquivo_csv, index=False, encoding="utf-8")
+    # df.to_excel(arquivo_excel, index=False) # Requer biblioteca openpyxl
+    arquivos = [arquivo_csv]
+
+    # Para outros scripts (ou jobs) que vão LER o relatório, prefira Parquet:
+    # colunas tipadas e comprimidas, sem "re-parsear" texto (ver escrita_relatorios.py).
+    # Requer biblioteca pyarrow.
+    arquivo_parquet = pasta / "relatorio_vendas.parquet"
+    try:
+        salvar_dataframe(df, arquivo_parquet, tipos={"id": "int32", "status": "category"})
+        arquivos.append(arquivo_parquet)
+    except ModuleNotFoundError:
+        print("Para salvar em Parquet, instale com: pip install pyarrow")
+    return arquivos
 
-# index=False remove a numeração das linhas (0, 1, 2...) do arquivo final
-df.to_csv(arquivo_csv, index=False, encoding="utf-8")
-# df.to_excel(arquivo_excel, index=False) # Requer biblioteca openpyxl
-
-print(f"\nArquivo salvo em: {arquivo_csv}")
 
 # 3. Leitura de Dados
 # Lendo o arquivo que acabamos de criar (ou um que veio de outro lugar)
-df_lido = pd.read_csv(arquivo_csv)
+def ler_relatorio(arquivo_csv):
+    import pandas as pd
+
+    # Arquivos de vários GB não cabem na memória de uma vez: veja leitura_em_blocos.py
+    # (lê em blocos com dtypes/usecols explícitos, filtra e grava a saída bloco a bloco).
+    return pd.read_csv(arquivo_csv)
+
 
 # 4. Filtragem de Dados (Lógica de Negócio)
 # Cenário: Quero apenas os pedidos 'entregue' com valor acima de 1000.
-# A sintaxe é: df[ (condicao1) & (condicao2) ]
-filtro = (df_lido["status"] == "entregue") & (df_lido["valor"] > 1000)
-pedidos_vip = df_lido[filtro]
+def filtrar_pedidos_vip(df, valor_minimo=1000):
+    # A sintaxe é: df[ (condicao1) & (condicao2) ]
+    filtro = (df["status"] == "entregue") & (df["valor"] > valor_minimo)
+    return df[filtro]
 
-print("\n--- Pedidos VIP (Entregues e > 1000) ---")
-print(pedidos_vip)
 
-# 5. Iteração (Processando linha a linha)
+# 5. Iteração (Processando por status)
 # Embora o pandas seja otimizado para operações em massa (vetorizadas),
-# em automação as vezes precisamos iterar para fazer ações externas (ex: enviar um email para cada linha).
-
-print("\n--- Processando Fila de Pedidos ---")
-for index, linha in df_lido.iterrows():
-    # Acessando os dados da linha
-    produto = linha["produto"]
-    status = linha["status"]
-    
-    if status == "pendente":
-        print(f"ALERTA: O produto {produto} ainda está pendente. Enviando notificação...")
-    elif status == "cancelado":
-        print(f"Info: O produto {produto} foi cancelado. Atualizar estoque.")
-    else:
-        print(f"OK: {produto} processado.")
+# em automação as vezes precisamos fazer ações externas (ex: enviar um email para cada linha).
+# O clássico "for index, linha in df.iterrows()" cria uma Series para CADA linha: em centenas
+# de milhares de linhas isso fica lento. O despachante.py agrupa por status uma vez só
+# e entrega a cada função um LOTE de linhas daquele status.
+
+
+def notificar_pendentes(lote):
+    # itertuples: cada linha vira uma namedtuple (acesso por atributo, bem mais leve)
+    for linha in lote:
+        print(f"ALERTA: O produto {linha.produto} ainda está pendente. Enviando notificação...")
+
+
+def atualizar_estoque(lote):
+    for linha in lote:
+        print(f"Info: O produto {linha.produto} foi cancelado. Atualizar estoque.")
+
+
+def confirmar(lote):
+    for linha in lote:
+        print(f"OK: {linha.produto} processado.")
+
+
+def processar_fila(df):
+    despachar(
+        df,
+        "status",
+        {"pendente": notificar_pendentes, "cancelado": atualizar_estoque},
+        padrao=confirmar,  # qualquer outro status (ex: entregue)
+        como_tuplas=True,
+    )
+    # Para tratadores que fazem I/O (email, API), use paralelo=True e tamanho_lote=...
+
 
 # 6. Modificação de Dados
 # Adicionando uma coluna nova calculada (ex: imposto de 10%)
-df_lido["imposto"] = df_lido["valor"] * 0.10
+def adicionar_imposto(df, aliquota=0.10):
+    df["imposto"] = df["valor"] * aliquota
+    return df
 
-print("\n--- Tabela com Impostos ---")
-print(df_lido[["produto", "valor", "imposto"]])
 
 # 7. Limpeza e Datas (O Mundo Real)
+def limpar_dados_sujos(df_sujo):
+    import pandas as pd
 
-# Dados sujos comuns em automação
-dados_sujos = [
-    {"data": "2024-01-15", "valor_texto": "R$ 1.000,00"},
-    {"data": "2024-01-20", "valor_texto": "R$ 500,50"},
-    {"data": "invalid_date", "valor_texto": "R$ 0,00"} # Erro proposital
-]
-df_sujo = pd.DataFrame(dados_sujos)
+    # Converter coluna de texto para número real (Float)
+    # O replace troca 'R$ ' por nada e ',' por '.'
+    df_sujo["valor_real"] = df_sujo["valor_texto"].str.replace("R$ ", "").str.replace(".", "").str.replace(",", ".").astype(float)
+
+    # Converter texto para Data (Datetime)
+    # errors='coerce' transforma erros em NaT (Not a Time) em vez de travar o script
+    df_sujo["data_formatada"] = pd.to_datetime(df_sujo["data"], errors="coerce")
+
+    # Em exportações com milhões de linhas, use as funções de limpeza_dados.py:
+    # converter_moeda_brl() e converter_data() convertem cada valor distinto uma vez só,
+    # não criam uma Series intermediária a cada replace e transformam lixo em NaN/NaT.
+    # Também tem normalizar_cpf(), normalizar_cnpj() e converter_percentual().
+    return df_sujo
+
+
+def main():
+    df = criar_dataframe(DADOS_BRUTOS)
+    print("--- Tabela Original ---")
+    print(df)
+
+    for arquivo in exportar_relatorio(df, Path.cwd()):
+        print(f"\nArquivo salvo em: {arquivo}")
+
+    df_lido = ler_relatorio(Path.cwd() / "relatorio_vendas.csv")
+
+    print("\n--- Pedidos VIP (Entregues e > 1000) ---")
+    print(filtrar_pedidos_vip(df_lido))
 
-# Converter coluna de texto para número real (Float)
-# O replace troca 'R$ ' por nada e ',' por '.'
-df_sujo["valor_real"] = df_sujo["valor_texto"].str.replace("R$ ", "").str.replace(".", "").str.replace(",", ".").astype(float)
+    print("\n--- Processando Fila de Pedidos ---")
+    processar_fila(df_lido)
 
-# Converter texto para Data (Datetime)
-# errors='coerce' transforma erros em NaT (Not a Time) em vez de travar o script
-df_sujo["data_formatada"] = pd.to_datetime(df_sujo["data"], errors="coerce")
+    print("\n--- Tabela com Impostos ---")
+    print(adicionar_imposto(df_lido)[["produto", "valor", "imposto"]])
 
-print("\n--- Tabela Sujos ---")
-print(df_sujo)
-print(f"Tipos de dados:\n{df_sujo.dtypes}")
+    df_sujo = limpar_dados_sujos(criar_dataframe(DADOS_SUJOS))
+    print("\n--- Tabela Sujos ---")
+    print(df_sujo)
+    print(f"Tipos de dados:\n{df_sujo.dtypes}")
 
-# Filtrar apenas onde a data é válida
-df_limpo = df_sujo.dropna(subset=["data_formatada"])
+    # Filtrar apenas onde a data é válida
+    df_limpo = df_sujo.dropna(subset=["data_formatada"])
 
-print("\n--- Tabela Limpa ---")
-print(df_limpo)
-print(f"Tipos de dados:\n{df_limpo.dtypes}")
+    print("\n--- Tabela Limpa ---")
+    print(df_limpo)
+    print(f"Tipos de dados:\n{df_limpo.dtypes}")
 
 
+if __name__ == "__main__":
+    main()
@@ -1,73 +1,138 @@
+import os
 import subprocess
+import sys
+from pathlib import Path
+
+from execucao_processos import Tarefa, executar_tarefas
 
 # --- FUNDAMENTOS DE SUBPROCESS PARA AUTOMAÇÃO ---
 # O módulo subprocess permite rodar comandos do sistema operacional (CMD/Terminal)
 # diretamente pelo Python. É útil para chamar outros scripts, executáveis ou comandos do sistema.
+# Cada seção virou uma função: importar este arquivo não executa nenhum comando.
+# Para ver o passo a passo completo: python arsenal_subprocess.py
+
+
+# --- 1. Execução Simples ---
+def execucao_simples():
+    # subprocess.run: A forma mais moderna e recomendada de rodar comandos.
+    # args: Lista com o comando e seus argumentos.
+    # shell=True: Necessário no Windows para alguns comandos internos (como 'dir', 'echo'),
+    # mas evite usar se possível por segurança. Para executáveis (.exe), não precisa.
+
+    # Exemplo: Rodando um 'echo' (imprimir no terminal)
+    # No Windows, 'echo' é um comando do shell, então shell=True ajuda.
+    resultado = subprocess.run(["echo", "Olá do subprocess!"], shell=True)
+    return resultado.returncode # 0 significa sucesso
+
+
+# --- 2. Capturando a Saída (Output) ---
+def versao_python():
+    # Muitas vezes queremos ler o que o comando respondeu.
+    # capture_output=True: Captura stdout (saída padrão) e stderr (erros).
+    # text=True: Já decodifica os bytes para string (senão viria b'texto').
+
+    # Exemplo: Verificando a versão do python instalada
+    cmd_versao = ["python", "--version"]
+    resultado_captura = subprocess.run(cmd_versao, capture_output=True, text=True)
+
+    print(f"Comando rodou com sucesso? {resultado_captura.returncode == 0}")
+    return resultado_captura.stdout.strip()
+
+
+# --- 3. Tratamento de Erros ---
+def rodar_com_checagem(comando):
+    """Devolve True se o comando deu certo; imprime o erro e devolve False se falhou."""
+    # check=True: Faz o Python lançar um erro (CalledProcessError) se o comando falhar (retorno != 0).
+    # Isso é vital para automações: se um passo falha, você quer saber e parar/tratar.
+    try:
+        subprocess.run(comando, capture_output=True, text=True, check=True)
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"ERRO CAPTURADO: O comando falhou com código {e.returncode}")
+        print(f"Detalhe do erro (stderr): {e.stderr.strip()}")
+    except FileNotFoundError:
+        # Acontece se o executável principal não for encontrado (ex: tentar rodar 'programa_x' e ele não existir)
+        print("ERRO: O executável não foi encontrado no sistema.")
+    return False
 
-print("--- 1. Execução Simples ---")
-# subprocess.run: A forma mais moderna e recomendada de rodar comandos.
-# args: Lista com o comando e seus argumentos.
-# shell=True: Necessário no Windows para alguns comandos internos (como 'dir', 'echo'),
-# mas evite usar se possível por segurança. Para executáveis (.exe), não precisa.
 
-# Exemplo: Rodando um 'echo' (imprimir no terminal)
-# No Windows, 'echo' é um comando do shell, então shell=True ajuda.
-resultado = subprocess.run(["echo", "Olá do subprocess!"], shell=True)
-print(f"Código de retorno: {resultado.returncode}") # 0 significa sucesso
+# --- 4. Timeout (Evitando travamentos) ---
+def rodar_com_timeout(comando, timeout):
+    """Devolve False se o comando passou do tempo (e foi cancelado)."""
+    # timeout=X: Mata o processo se ele demorar mais que X segundos.
+    try:
+        subprocess.run(comando, capture_output=True, timeout=timeout)
+        return True
+    except subprocess.TimeoutExpired:
+        print("ALERTA: O comando demorou muito e foi cancelado.")
+        return False
 
-print("\n--- 2. Capturando a Saída (Output) ---")
-# Muitas vezes queremos ler o que o comando respondeu.
-# capture_output=True: Captura stdout (saída padrão) e stderr (erros).
-# text=True: Já decodifica os bytes para string (senão viria b'texto').
 
-# Exemplo: Verificando a versão do python instalada
-cmd_versao = ["python", "--version"]
-resultado_captura = subprocess.run(cmd_versao, capture_output=True, text=True)
+# --- 5. Controlando o Ambiente de Execução ---
+def rodar_na_pasta(comando, pasta_alvo, variaveis_extras):
+    # Muitas vezes você precisa rodar um comando dentro de uma pasta específica.
+    # ex: rodar um git pull dentro da pasta do repositório
 
-print(f"Comando rodou com sucesso? {resultado_captura.returncode == 0}")
-print(f"Saída capturada: {resultado_captura.stdout.strip()}")
+    # Como injetar uma senha ou token no subprocesso sem salvar no arquivo ou no sistema global?
+    # Você passa um dicionário de ambiente customizado, um ambiente virtual.
+    # Copiamos as variáveis do sistema atual e adicionamos a nossa
+    meu_ambiente = os.environ.copy()
+    meu_ambiente.update(variaveis_extras)
 
-print("\n--- 3. Tratamento de Erros ---")
-# check=True: Faz o Python lançar um erro (CalledProcessError) se o comando falhar (retorno != 0).
-# Isso é vital para automações: se um passo falha, você quer saber e parar/tratar.
+    # cwd=... : Muda o diretório SÓ para este comando
+    # env=... : Passa as variáveis de ambiente SÓ para este comando
+    # Cada chamada dessas sobe um Python novo (e refaz os imports). Para milhares de scripts
+    # pequenos, veja trabalhadores_python.py: processos Python que ficam ligados com pandas/requests
+    # já importados, aceitando o mesmo env=... e cwd=... por tarefa.
+    return subprocess.run(comando, cwd=pasta_alvo, env=meu_ambiente, text=True)
 
-comando_invalido = ["python", "--comando-que-nao-existe"]
 
-try:
+# --- 6. Vários Comandos em Paralelo ---
+def rodar_em_paralelo(tarefas, max_paralelo=4):
+    # Para dezenas/centenas de comandos (ex: converter cada arquivo de um lote), rodar um por vez
+    # com subprocess.run desperdiça tempo, e o capture_output guarda toda a saída na memória.
+    # O execucao_processos.py roda N ao mesmo tempo, entrega a saída linha a linha
+    # e encerra o grupo de processos inteiro de quem passar do timeout.
+    for resultado in executar_tarefas(
+        tarefas,
+        max_paralelo=max_paralelo,
+        ao_imprimir=lambda nome, fluxo, linha: print(f"[{nome}] {linha}"),
+    ):
+        # Tempo, código de saída, CPU e memória de cada tarefa
+        print(resultado)
+
+
+def main():
+    print("--- 1. Execução Simples ---")
+    print(f"Código de retorno: {execucao_simples()}")
+
+    print("\n--- 2. Capturando a Saída (Output) ---")
+    print(f"Saída capturada: {versao_python()}")
+
+    print("\n--- 3. Tratamento de Erros ---")
     print("Tentando rodar comando inválido...")
-    subprocess.run(comando_invalido, capture_output=True, text=True, check=True)
-except subprocess.CalledProcessError as e:
-    print(f"ERRO CAPTURADO: O comando falhou com código {e.returncode}")
-    print(f"Detalhe do erro (stderr): {e.stderr.strip()}")
-except FileNotFoundError:
-    # Acontece se o executável principal não for encontrado (ex: tentar rodar 'programa_x' e ele não existir)
-    print("ERRO: O executável não foi encontrado no sistema.")
-
-print("\n--- 4. Timeout (Evitando travamentos) ---")
-# timeout=X: Mata o processo se ele demorar mais que X segundos.
-try:
+    rodar_com_checagem(["python", "--comando-que-nao-existe"])
+
+    print("\n--- 4. Timeout (Evitando travamentos) ---")
     # 'ping -n 5' tenta pingar 5 vezes (demora ~5s). Timeout de 2s vai falhar.
-    subprocess.run(["ping", "-n", "5", "8.8.8.8"], capture_output=True, timeout=2)
-except subprocess.TimeoutExpired:
-    print("ALERTA: O comando demorou muito e foi cancelado.")
-
-print("\n--- 5. Controlando o Ambiente de Execução ---")
-
-# Muitas vezes você precisa rodar um comando dentro de uma pasta específica.
-# ex: rodar um git pull dentro da pasta do repositório
-# Cenário: Quero rodar um comando dentro da pasta 'dados' sem mudar o meu script de lugar
-pasta_alvo = Path.cwd() / "dados"
-pasta_alvo.mkdir(exist_ok=True)
-
-# Como injetar uma senha ou token no subprocesso sem salvar no arquivo ou no sistema global? 
-# Você passa um dicionário de ambiente customizado, um ambiente virtual.
-# Cenário: O programa que vou chamar precisa de uma SENHA específica
-# Copiamos as variáveis do sistema atual e adicionamos a nossa
-meu_ambiente = os.environ.copy()
-meu_ambiente["SENHA_BANCO"] = "123456"
-
-# cwd=... : Muda o diretório SÓ para este comando
-# env=... : Passa as variáveis de ambiente SÓ para este comando
-cmd = ["python", "-c", "import os; print(f'Estou em: {os.getcwd()}'); print(f'Senha: {os.environ.get('SENHA_BANCO')}')"]
-
-subprocess.run(cmd, cwd=pasta_alvo, env=meu_ambiente, text=True)
+    rodar_com_timeout(["ping", "-n", "5", "8.8.8.8"], timeout=2)
+
+    print("\n--- 5. Controlando o Ambiente de Execução ---")
+    # Cenário: Quero rodar um comando dentro da pasta 'dados' sem mudar o meu script de lugar
+    pasta_alvo = Path.cwd() / "dados"
+    pasta_alvo.mkdir(exist_ok=True)
+    # Cenário: O programa que vou chamar precisa de uma SENHA específica
+    cmd = ["python", "-c", "import os; print(f'Estou em: {os.getcwd()}'); print(f'Senha: {os.environ.get('SENHA_BANCO')}')"]
+    rodar_na_pasta(cmd, pasta_alvo, {"SENHA_BANCO": "123456"})
+
+    print("\n--- 6. Vários Comandos em Paralelo ---")
+    tarefas = [
+        Tarefa([sys.executable, "-c", f"import time; time.sleep(0.5); print('arquivo {i} convertido')"], nome=f"conversor_{i}")
+        for i in range(4)
+    ]
+    tarefas.append(Tarefa([sys.executable, "-c", "import time; time.sleep(10)"], nome="travado", timeout=1))
+    rodar_em_paralelo(tarefas)
+
+
+if __name__ == "__main__":
+    main()
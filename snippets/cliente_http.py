@@ -0,0 +1,227 @@
+# Instalação necessária:
+# pip install requests python-dotenv
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from functools import cache
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from controle_taxa import STATUS_RETENTAVEIS, PoliticaRetry, ler_retry_after
+
+# --- CLIENTE HTTP COMPARTILHADO ---
+# Uma sessão (requests.Session) configurada uma vez e reaproveitada por todos os scripts.
+# - Pool de conexões: a conexão TCP (e o handshake TLS) é aberta uma vez e reutilizada.
+# - Headers padrão: o token de autenticação vem do API_TOKEN (arquivo .env).
+#   O .env só é lido na primeira vez que alguém precisa dele (headers_padrao, url_base):
+#   importar este módulo não toca em arquivo nenhum.
+# - Timeouts explícitos: sem timeout, um socket travado para a automação inteira!
+# - Retentativas e limite de taxa (controle_taxa.py): 429/5xx/timeouts não viram lead perdido
+#   (em POST/PATCH, só o que com certeza não foi processado é repetido: nada de pedido em dobro).
+# - Métricas opcionais (instrumentacao.py): latência, status e bytes de cada tentativa.
+# - ler_json: usa o orjson quando instalado (pip install orjson), com o json padrão como reserva.
+
+
+@cache
+def carregar_dotenv():
+    # Carrega o .env se o python-dotenv estiver instalado;
+    # sem ele, usamos só as variáveis de ambiente do sistema.
+    # @cache: só a primeira chamada lê o arquivo, as seguintes não fazem nada
+    try:
+        from dotenv import load_dotenv
+    except ModuleNotFoundError:
+        return
+    load_dotenv()
+
+
+def _escolher_leitor_json():
+    # orjson (opcional) lê JSON várias vezes mais rápido que o módulo json e aceita bytes direto,
+    # então não precisamos decodificar o corpo da resposta para texto antes
+    try:
+        import orjson
+    except ModuleNotFoundError:
+        import json
+
+        return json.loads
+    return orjson.loads
+
+
+# Use ler_json(response.content) no lugar de response.json() quando são milhares de respostas
+ler_json = _escolher_leitor_json()
+
+URL_BASE_PADRAO = "https://jsonplaceholder.typicode.com"
+
+
+def url_base():
+    """Endereço da API: API_BASE_URL (ambiente ou .env) ou a API pública de exemplo."""
+    carregar_dotenv()
+    return os.getenv("API_BASE_URL", URL_BASE_PADRAO)
+
+
+# (conexão, leitura) em segundos.
+# Conectar deve ser rápido; a leitura pode demorar mais (a API precisa processar).
+TIMEOUT_PADRAO = (3.05, 10)
+
+# Quantos hosts diferentes guardamos no pool e quantas conexões por host.
+# max_por_host deve ser >= número de threads usando a sessão ao mesmo tempo.
+TAMANHO_POOL_PADRAO = 10
+MAX_POR_HOST_PADRAO = 16
+
+
+def headers_padrao(token=None):
+    """Monta os headers de todas as requisições (Authorization a partir do API_TOKEN)."""
+    if token is None:
+        carregar_dotenv()
+        token = os.getenv("API_TOKEN", "token_ficticio_12345")
+
+    return {
+        "Authorization": f"Bearer {token}",
+        "User-Agent": "MeuScriptPython/1.0",
+        # HTTP/1.1 já mantém a conexão aberta por padrão; deixamos explícito
+        "Connection": "keep-alive",
+    }
+
+
+class SessaoHTTP(requests.Session):
+    """
+    requests.Session com timeout padrão, retentativas e (opcionalmente) limite de taxa.
+
+    Erros passageiros (timeout, conexão, 429, 5xx) são repetidos com backoff;
+    esgotadas as tentativas, a última resposta (ou exceção) chega normalmente a quem chamou.
+    POST/PATCH só são repetidos quando com certeza não foram processados (ver PoliticaRetry.metodos).
+    """
+
+    def __init__(self, timeout=TIMEOUT_PADRAO, politica_retry=None, limitador=None, instrumentacao=None):
+        super().__init__()
+        self.timeout = timeout
+        self.politica_retry = politica_retry
+        self.limitador = limitador
+        self.instrumentacao = instrumentacao
+        self.retentativas = 0
+        self._trava_contador = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        max_tentativas = self.politica_retry.max_tentativas if self.politica_retry else 1
+
+        for tentativa in range(max_tentativas):
+            ultima = tentativa == max_tentativas - 1
+            if self.limitador is not None:
+                self.limitador.adquirir()
+
+            enviada_em = time.monotonic()
+            inicio = time.perf_counter()
+            try:
+                response = super().request(method, url, **kwargs)
+            except requests.exceptions.RequestException as erro:
+                self._medir(inicio, type(erro).__name__)
+                if ultima or not self.politica_retry.retentavel(erro=erro, metodo=method):
+                    raise
+                self._esperar(tentativa)
+                continue
+
+            self._medir(inicio, response.status_code, response, kwargs.get("stream"))
+
+            retry_after = ler_retry_after(response) if response.status_code == 429 else None
+            if response.status_code == 429 and self.limitador is not None:
+                # Sinal da API de que estamos rápidos demais: o limitador freia todas as threads
+                self.limitador.registrar_limitacao(retry_after, enviada_em)
+
+            if (
+                ultima
+                or self.politica_retry is None
+                or not self.politica_retry.retentavel(response=response, metodo=method)
+            ):
+                if self.limitador is not None and response.status_code not in STATUS_RETENTAVEIS:
+                    self.limitador.registrar_sucesso()
+                return response
+
+            # Vamos descartar esta resposta: liberamos a conexão para o pool
+            response.close()
+            self._esperar(tentativa, retry_after)
+
+    def _medir(self, inicio, status, response=None, stream=False):
+        if self.instrumentacao is None:
+            return
+        bytes_recebidos = 0
+        if response is not None:
+            # Com stream=True o corpo ainda não foi lido: usamos o Content-Length (se houver)
+            bytes_recebidos = int(response.headers.get("Content-Length", 0)) if stream else len(response.content)
+        self.instrumentacao.registrar_requisicao(time.perf_counter() - inicio, status, bytes_recebidos)
+
+    def _esperar(self, tentativa, retry_after=None):
+        with self._trava_contador:
+            self.retentativas += 1
+        time.sleep(self.politica_retry.espera(tentativa, retry_after))
+
+
+def criar_sessao(
+    token=None,
+    timeout=TIMEOUT_PADRAO,
+    tamanho_pool=TAMANHO_POOL_PADRAO,
+    max_por_host=MAX_POR_HOST_PADRAO,
+    politica_retry=None,
+    limitador=None,
+    instrumentacao=None,
+):
+    """
+    Cria a sessão com pool de conexões ajustado. Use com 'with' para fechar ao final.
+
+    Sem politica_retry, usamos a PoliticaRetry padrão; limitador (LimitadorTaxa)
+    e instrumentacao (Instrumentacao) são opcionais.
+    """
+    sessao = SessaoHTTP(
+        timeout=timeout,
+        politica_retry=politica_retry or PoliticaRetry(),
+        limitador=limitador,
+        instrumentacao=instrumentacao,
+    )
+    sessao.headers.update(headers_padrao(token))
+
+    # pool_connections: quantos hosts ficam em cache
+    # pool_maxsize: quantas conexões abertas por host
+    # pool_block=True: se todas estiverem em uso, a thread ESPERA uma liberar
+    # (em vez de abrir uma conexão extra que seria jogada fora depois)
+    adaptador = HTTPAdapter(
+        pool_connections=tamanho_pool,
+        pool_maxsize=max_por_host,
+        pool_block=True,
+    )
+    sessao.mount("https://", adaptador)
+    sessao.mount("http://", adaptador)
+    return sessao
+
+
+@dataclass
+class MetricasConexao:
+    requisicoes: int = 0
+    conexoes_abertas: int = 0
+
+    @property
+    def conexoes_reutilizadas(self):
+        return self.requisicoes - self.conexoes_abertas
+
+    def __str__(self):
+        return (
+            f"{self.requisicoes} requisições | "
+            f"{self.conexoes_abertas} conexões abertas | "
+            f"{self.conexoes_reutilizadas} reutilizadas"
+        )
+
+
+def metricas_conexoes(sessao):
+    """Soma os contadores dos pools do urllib3: conexões novas x requisições feitas."""
+    metricas = MetricasConexao()
+    # A mesma instância de adaptador pode estar montada em http:// e https://
+    adaptadores = {id(a): a for a in sessao.adapters.values()}.values()
+
+    for adaptador in adaptadores:
+        pools = adaptador.poolmanager.pools
+        for chave in pools.keys():
+            pool = pools[chave]
+            metricas.requisicoes += pool.num_requests
+            metricas.conexoes_abertas += pool.num_connections
+    return metricas
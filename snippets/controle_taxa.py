@@ -0,0 +1,173 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+
+# --- CONTROLE DE TAXA E RETENTATIVAS ---
+# Quando aumentamos a vazão, a API começa a responder 429 (Too Many Requests) e 5xx.
+# Duas peças resolvem isso sem perder leads:
+# 1. LimitadorTaxa: um "balde de fichas" (token bucket). Cada requisição gasta uma ficha,
+#    e as fichas voltam numa taxa fixa. A taxa se ajusta sozinha (AIMD, como no TCP):
+#    dobra a cada segundo até o primeiro 429 ("partida lenta"), depois sobe devagar
+#    a cada sucesso e cai quando vêm 429. A queda acontece no máximo UMA vez por janela:
+#    os 429 das requisições que já estavam em voo são o mesmo excesso (senão 16 threads
+#    derrubariam a taxa 16 vezes seguidas), e o tamanho do corte acompanha a fração de 429
+#    na janela (2% de 429 soltos cortam ~1%; tudo 429 corta pela metade).
+#    A pausa do Retry-After sempre vale, mesmo quando a taxa não cai.
+# 2. PoliticaRetry: decide O QUE vale a pena tentar de novo e QUANTO esperar
+#    (backoff exponencial com jitter, para as threads não voltarem todas juntas).
+
+# Códigos que indicam problema passageiro: vale tentar de novo.
+# 404 (e os outros 4xx) são definitivos: repetir não muda a resposta.
+STATUS_RETENTAVEIS = {429, 500, 502, 503, 504}
+
+# Métodos que podem ser repetidos sem efeito colateral (a RFC 9110 chama de "idempotentes").
+# POST e PATCH ficam de fora: se a primeira tentativa chegou a ser processada (e só a resposta se perdeu),
+# repetir cria o pedido duas vezes. Para liberar (ex: a API aceita uma chave de idempotência):
+#     PoliticaRetry(metodos=METODOS_IDEMPOTENTES | {"POST"})
+METODOS_IDEMPOTENTES = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+def ler_retry_after(response):
+    """Converte o header Retry-After (segundos ou data HTTP) em segundos de espera."""
+    valor = response.headers.get("Retry-After")
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        data = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if data.tzinfo is None:
+        # Datas terminadas em "-0000" voltam sem fuso; pela RFC elas estão em UTC
+        data = data.replace(tzinfo=timezone.utc)
+    return max(0.0, (data - datetime.now(timezone.utc)).total_seconds())
+
+
+class LimitadorTaxa:
+    """Token bucket adaptativo, compartilhado entre threads."""
+
+    def __init__(
+        self,
+        taxa_inicial=20.0,
+        taxa_minima=1.0,
+        taxa_maxima=500.0,
+        incremento=5.0,
+        capacidade=None,
+        janela_corte=1.0,
+    ):
+        self.taxa = taxa_inicial
+        self.taxa_minima = taxa_minima
+        self.taxa_maxima = taxa_maxima
+        # Depois do primeiro 429: ~+incremento req/s a cada segundo sem novos 429
+        self.incremento = incremento
+        # Quantas requisições podem sair "de rajada" depois de um tempo parado
+        self.capacidade = capacidade or max(1.0, taxa_inicial)
+        # Intervalo mínimo (s) entre dois cortes da taxa
+        self.janela_corte = janela_corte
+        self.limitacoes = 0
+        self.cortes = 0
+
+        self._fichas = self.capacidade
+        self._ultima_reposicao = time.monotonic()
+        self._pausado_ate = 0.0
+        self._partida_lenta = True
+        self._ultimo_corte = float("-inf")
+        # Respostas e 429 desde o último corte (definem o tamanho do próximo)
+        self._respostas_janela = 0
+        self._limitacoes_janela = 0
+        self._trava = threading.Lock()
+
+    def adquirir(self):
+        """Bloqueia até existir uma ficha disponível (e a pausa do Retry-After ter passado)."""
+        while True:
+            with self._trava:
+                agora = time.monotonic()
+                if agora >= self._pausado_ate:
+                    self._repor(agora)
+                    if self._fichas >= 1:
+                        self._fichas -= 1
+                        return
+                    espera = (1 - self._fichas) / self.taxa
+                else:
+                    espera = self._pausado_ate - agora
+            # Dormimos FORA do lock, para não travar as outras threads
+            time.sleep(espera)
+
+    def registrar_sucesso(self):
+        with self._trava:
+            self._respostas_janela += 1
+            # Na partida lenta, +1 req/s por sucesso: com 'taxa' sucessos por segundo, a taxa dobra
+            aumento = 1.0 if self._partida_lenta else self.incremento / self.taxa
+            self.taxa = min(self.taxa_maxima, self.taxa + aumento)
+
+    def registrar_limitacao(self, retry_after=None, enviada_em=None):
+        """
+        Recebemos um 429: respeitamos o Retry-After e, se a janela já passou, cortamos a taxa.
+
+        enviada_em: time.monotonic() de quando a requisição saiu. Se ela saiu antes do último corte,
+        o 429 é do excesso que já foi corrigido e não entra na conta.
+        """
+        with self._trava:
+            agora = time.monotonic()
+            self.limitacoes += 1
+            if retry_after:
+                self._pausado_ate = max(self._pausado_ate, agora + retry_after)
+            if enviada_em is not None and enviada_em < self._ultimo_corte:
+                return
+            self._respostas_janela += 1
+            self._limitacoes_janela += 1
+            if agora - self._ultimo_corte < self.janela_corte:
+                return
+
+            if self._partida_lenta:
+                # O primeiro 429 encerra a partida lenta: a taxa dobrou até passar do limite
+                fator = 0.5
+                self._partida_lenta = False
+            else:
+                fracao = self._limitacoes_janela / self._respostas_janela
+                fator = max(0.5, 1 - fracao / 2)
+            self.taxa = max(self.taxa_minima, self.taxa * fator)
+            self.cortes += 1
+            self._ultimo_corte = agora
+            self._respostas_janela = self._limitacoes_janela = 0
+            # Zera as fichas: a rajada acumulada foi justamente o que causou o 429
+            self._fichas = 0
+
+    def _repor(self, agora):
+        self._fichas = min(self.capacidade, self._fichas + (agora - self._ultima_reposicao) * self.taxa)
+        self._ultima_reposicao = agora
+
+
+class PoliticaRetry:
+    """Backoff exponencial com jitter: espera aleatória entre 0 e base * 2^tentativa."""
+
+    def __init__(self, max_tentativas=5, espera_base=0.5, espera_maxima=30.0, metodos=METODOS_IDEMPOTENTES):
+        self.max_tentativas = max_tentativas
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.metodos = metodos
+
+    def retentavel(self, response=None, erro=None, metodo="GET"):
+        if metodo.upper() not in self.metodos:
+            # Só repetimos um POST/PATCH quando ele com certeza NÃO foi processado:
+            # não conseguiu nem conectar, ou a API recusou com 429 antes de processar
+            if erro is not None:
+                return isinstance(erro, requests.exceptions.ConnectTimeout)
+            return response.status_code == 429
+        if erro is not None:
+            # Timeout e falha de conexão: a rede soluçou, a requisição pode dar certo depois
+            return isinstance(erro, (requests.exceptions.Timeout, requests.exceptions.ConnectionError))
+        return response.status_code in STATUS_RETENTAVEIS
+
+    def espera(self, tentativa, retry_after=None):
+        # "Full jitter": sorteamos a espera inteira, espalhando as retentativas no tempo
+        espera = random.uniform(0, min(self.espera_maxima, self.espera_base * 2**tentativa))
+        # O servidor sabe melhor que nós: nunca esperamos menos que o Retry-After
+        return max(espera, retry_after or 0)
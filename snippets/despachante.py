@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor
+
+# --- DESPACHANTE DE AÇÕES POR STATUS ---
+# Substitui o padrão "for index, linha in df.iterrows(): if status == ...".
+# O iterrows cria uma Series para CADA linha (lento em centenas de milhares de linhas).
+# Aqui o DataFrame é separado por status uma vez só (groupby, vetorizado)
+# e cada tratador recebe um LOTE de linhas do seu status.
+#
+# Uso:
+#     def notificar_pendentes(lote):       # lote é um DataFrame
+#         enviar_emails(lote["email"])
+#
+#     despachar(df, "status", {"pendente": notificar_pendentes, "cancelado": atualizar_estoque})
+
+# Tamanho máximo de cada lote entregue a um tratador (None = o grupo inteiro de uma vez)
+TAMANHO_LOTE_PADRAO = None
+
+
+def _fatiar(grupo, tamanho_lote):
+    if not tamanho_lote:
+        yield grupo
+        return
+    for inicio in range(0, len(grupo), tamanho_lote):
+        yield grupo.iloc[inicio : inicio + tamanho_lote]
+
+
+def despachar(
+    df,
+    coluna_status,
+    tratadores,
+    padrao=None,
+    como_tuplas=False,
+    tamanho_lote=TAMANHO_LOTE_PADRAO,
+    paralelo=False,
+    max_workers=8,
+):
+    """
+    Agrupa o DataFrame por coluna_status e chama tratadores[status](lote) para cada grupo.
+
+    - padrao: tratador para status sem entrada em 'tratadores' e para status vazio (None/NaN);
+      sem padrao, essas linhas são ignoradas.
+    - como_tuplas: o tratador recebe um iterador de namedtuples (itertuples) em vez do DataFrame.
+    - tamanho_lote: quebra grupos grandes em lotes menores (útil com paralelo=True).
+    - paralelo: roda os lotes num pool de threads (para tratadores que fazem I/O: e-mail, API...).
+
+    Devolve {status: [retorno do tratador para cada lote]} (status vazio aparece como None).
+    """
+    import pandas as pd
+
+    # sort=False mantém os status na ordem em que aparecem; observed=True ignora
+    # categorias sem nenhuma linha (quando a coluna é do tipo category).
+    # dropna=False: sem ele, o groupby descarta CALADO as linhas com status vazio
+    # (no iterrows elas caíam no "else", ou seja, no padrao)
+    grupos = df.groupby(coluna_status, sort=False, observed=True, dropna=False)
+
+    tarefas = []
+    for status, grupo in grupos:
+        if pd.isna(status):
+            status, tratador = None, padrao
+        else:
+            tratador = tratadores.get(status, padrao)
+        if tratador is None:
+            continue
+        for lote in _fatiar(grupo, tamanho_lote):
+            if como_tuplas:
+                # name="Linha": acesso por atributo (linha.produto), bem mais leve que uma Series
+                lote = lote.itertuples(index=False, name="Linha")
+            tarefas.append((status, tratador, lote))
+
+    resultados = {}
+    if paralelo:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futuros = [(status, executor.submit(tratador, lote)) for status, tratador, lote in tarefas]
+            for status, futuro in futuros:
+                # .result() relança aqui qualquer erro que aconteceu dentro do tratador
+                resultados.setdefault(status, []).append(futuro.result())
+    else:
+        for status, tratador, lote in tarefas:
+            resultados.setdefault(status, []).append(tratador(lote))
+    return resultados
@@ -0,0 +1,397 @@
+import csv
+from itertools import islice
+from pathlib import Path
+
+# --- ESCRITA DE RELATÓRIOS EM STREAMING ---
+# Em vez de juntar tudo numa lista -> DataFrame -> to_excel no final,
+# cada linha (ou bloco de linhas) vai para o arquivo assim que fica pronta:
+# - A memória fica estável, seja com 100 ou 1 milhão de linhas.
+# - Se o script quebrar no meio, o que já foi escrito não se perde.
+#
+# O formato sai da extensão do arquivo:
+# - .parquet / .arrow (.feather): colunares, tipados e comprimidos. Muito mais rápidos
+#   de gravar e ler que XLSX, e quem lê depois não precisa "re-parsear" texto como no CSV.
+# - .csv: texto simples, abre em qualquer lugar.
+# - .xlsx: para pessoas (Marketing). É o formato mais lento; prefira gerar Parquet
+#   e usar exportar_xlsx() só quando alguém for abrir no Excel.
+#
+# Uso:
+#     with abrir_escritor(Path("relatorio.xlsx"), ["ID", "Nome"]) as escritor:
+#         escritor.escrever({"ID": 1, "Nome": "Ana"})   # uma linha (dict)
+#         escritor.escrever_valores((2, "Bia"))          # uma linha (valores na ordem das colunas)
+#         escritor.escrever_bloco(df)                    # um DataFrame inteiro
+#
+# escrever_valores é o caminho mais barato para milhões de linhas: nenhum dict é montado
+# só para ser desmontado de novo dentro do escritor.
+
+# Buffer de escrita do CSV: os dados vão para o disco em blocos de 1 MB (poucas chamadas ao SO)
+TAMANHO_BUFFER_CSV = 1024 * 1024
+
+# A cada N linhas forçamos o flush: se o processo morrer, perdemos no máximo esse bloco
+LINHAS_POR_FLUSH = 10_000
+
+# Parquet grava em "row groups": juntamos as linhas avulsas até esse tamanho antes de gravar
+LINHAS_POR_GRUPO_PARQUET = 64_000
+
+
+class Escritor:
+    """Base dos escritores: guarda arquivo/colunas, conta linhas e funciona com 'with'."""
+
+    def __init__(self, arquivo, colunas, tipos=None, compressao=None):
+        self.arquivo = Path(arquivo)
+        self.colunas = list(colunas)
+        self.tipos = tipos
+        self.compressao = compressao
+        self.linhas_escritas = 0
+
+    def escrever_valores(self, valores):
+        # Padrão: monta o dict. Os formatos que sabem gravar os valores direto sobrescrevem.
+        self.escrever(dict(zip(self.colunas, valores)))
+
+    def escrever_bloco(self, df):
+        # Padrão: linha a linha. Os formatos que sabem gravar um DataFrame direto sobrescrevem.
+        for linha in df[self.colunas].to_dict("records"):
+            self.escrever(linha)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+class EscritorCsv(Escritor):
+    def __init__(self, arquivo, colunas, tipos=None, compressao=None):
+        super().__init__(arquivo, colunas, tipos, compressao)
+        # newline="": o módulo csv cuida das quebras de linha (evita linhas em branco no Windows)
+        self._arquivo = open(self.arquivo, "w", newline="", encoding="utf-8", buffering=TAMANHO_BUFFER_CSV)
+        self._escritor = csv.DictWriter(self._arquivo, fieldnames=self.colunas)
+        self._escritor.writeheader()
+
+    def escrever(self, linha):
+        self._escritor.writerow(linha)
+        self._contar_linha()
+
+    def escrever_valores(self, valores):
+        # O DictWriter guarda por dentro um csv.writer comum, que grava a sequência direto
+        self._escritor.writer.writerow(valores)
+        self._contar_linha()
+
+    def _contar_linha(self):
+        self.linhas_escritas += 1
+        if self.linhas_escritas % LINHAS_POR_FLUSH == 0:
+            self._arquivo.flush()
+
+    def escrever_bloco(self, df):
+        # O cabeçalho já foi escrito no __init__. O módulo csv termina as linhas em "\r\n" e o
+        # to_csv em "\n": sem o lineterminator, um arquivo escrito em blocos misturaria os dois
+        df[self.colunas].to_csv(self._arquivo, header=False, index=False, lineterminator="\r\n")
+        self.linhas_escritas += len(df)
+        self._arquivo.flush()
+
+    def fechar(self):
+        self._arquivo.close()
+
+
+class EscritorXlsx(Escritor):
+    def __init__(self, arquivo, colunas, tipos=None, compressao=None):
+        # Import aqui dentro: openpyxl é opcional (sem ele, quem chamou cai no CSV)
+        from openpyxl import Workbook
+
+        super().__init__(arquivo, colunas, tipos, compressao)
+        # write_only=True: o openpyxl não guarda as células na memória,
+        # elas vão sendo serializadas conforme as linhas chegam
+        self._planilha = Workbook(write_only=True)
+        self._aba = self._planilha.create_sheet()
+        self._aba.append(self.colunas)
+
+    def escrever(self, linha):
+        self._aba.append([linha.get(coluna) for coluna in self.colunas])
+        self.linhas_escritas += 1
+
+    def escrever_valores(self, valores):
+        self._aba.append(list(valores))
+        self.linhas_escritas += 1
+
+    def fechar(self):
+        # O .xlsx é um zip: só fica válido depois do save().
+        # Por isso fechar() roda mesmo quando o 'with' termina com erro.
+        self._planilha.save(self.arquivo)
+
+
+def _tipo_arrow(pa, tipo):
+    # Nomes simples (os mesmos do pandas) -> tipos do Arrow
+    tipos = {
+        "int32": pa.int32(),
+        "int64": pa.int64(),
+        "float32": pa.float32(),
+        "float64": pa.float64(),
+        "bool": pa.bool_(),
+        "string": pa.string(),
+        # Poucos valores distintos (ex: Status): guarda cada texto uma vez + um índice por linha
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "datetime": pa.timestamp("ms"),
+    }
+    return tipos[tipo] if isinstance(tipo, str) else tipo
+
+
+class EscritorColunar(Escritor):
+    """
+    Base dos formatos colunares (Parquet e Arrow IPC), que precisam do pyarrow.
+
+    Com 'tipos' ({coluna: "int64" | "string" | "category" | ...}) essas colunas têm tipo fixo;
+    as demais têm o tipo deduzido do primeiro bloco gravado.
+
+    As linhas avulsas esperam o próximo row group em uma lista por coluna (e não em uma lista de dicts):
+    é o formato que o Arrow monta sem conversão, e ocupa uma fração da memória.
+    """
+
+    def __init__(self, arquivo, colunas, tipos=None, compressao=None):
+        # pyarrow é opcional: pip install pyarrow
+        import pyarrow as pa
+
+        super().__init__(arquivo, colunas, tipos, compressao)
+        self._pa = pa
+        self._tipos_arrow = {coluna: _tipo_arrow(pa, tipo) for coluna, tipo in (tipos or {}).items()}
+        self._esquema = None
+        self._gravador = None
+        self._pendentes = [[] for _ in self.colunas]
+        self._linhas_pendentes = 0
+
+    def escrever(self, linha):
+        for pendentes, coluna in zip(self._pendentes, self.colunas):
+            pendentes.append(linha.get(coluna))
+        self._contar_linha()
+
+    def escrever_valores(self, valores):
+        for pendentes, valor in zip(self._pendentes, valores):
+            pendentes.append(valor)
+        self._contar_linha()
+
+    def _contar_linha(self):
+        self.linhas_escritas += 1
+        self._linhas_pendentes += 1
+        if self._linhas_pendentes >= LINHAS_POR_GRUPO_PARQUET:
+            self._gravar_pendentes()
+
+    def escrever_bloco(self, df):
+        self._gravar_pendentes()
+        tabela = self._pa.Table.from_pandas(df[self.colunas], preserve_index=False)
+        self._gravar_tabela(tabela)
+        self.linhas_escritas += len(df)
+
+    def fechar(self):
+        self._gravar_pendentes()
+        if self._gravador is None:
+            # Nenhuma linha: ainda assim geramos um arquivo válido, só com as colunas
+            esquema = self._pa.schema(
+                [(coluna, self._tipos_arrow.get(coluna, self._pa.string())) for coluna in self.colunas]
+            )
+            self._gravar_tabela(esquema.empty_table())
+        self._gravador.close()
+
+    def _gravar_pendentes(self):
+        if self._linhas_pendentes:
+            # Uma lista por coluna -> um array Arrow por coluna, sem passar por dicts
+            self._gravar_tabela(self._pa.table(dict(zip(self.colunas, self._pendentes))))
+            self._pendentes = [[] for _ in self.colunas]
+            self._linhas_pendentes = 0
+
+    def _gravar_tabela(self, tabela):
+        if self._gravador is None:
+            self._esquema = self._montar_esquema(tabela.schema)
+            self._gravador = self._abrir_gravador(self._esquema)
+        # Todos os blocos seguem o mesmo esquema (ex: category com outro tipo de índice)
+        self._gravador.write_table(self._preparar(tabela.cast(self._esquema)))
+
+    def _montar_esquema(self, esquema_bloco):
+        # O esquema sai de 'tipos' ou do primeiro bloco gravado
+        pa = self._pa
+        campos = []
+        for campo in esquema_bloco:
+            tipo = self._tipos_arrow.get(campo.name, campo.type)
+            if pa.types.is_null(tipo):
+                # Coluna toda vazia no primeiro bloco não tem tipo: tratamos como texto
+                tipo = pa.string()
+            elif pa.types.is_dictionary(tipo):
+                # O pandas escolhe o menor índice que cabe no bloco (int8...); blocos
+                # seguintes podem ter mais categorias, então fixamos int32
+                tipo = pa.dictionary(pa.int32(), tipo.value_type)
+            campos.append((campo.name, tipo))
+        return pa.schema(campos)
+
+    def _preparar(self, tabela):
+        # Ajuste final de cada bloco antes de gravar (o Arrow IPC precisa de um)
+        return tabela
+
+
+class EscritorParquet(EscritorColunar):
+    # zstd: arquivos bem menores que o snappy padrão, e ainda rápido para ler
+    COMPRESSAO_PADRAO = "zstd"
+
+    def _abrir_gravador(self, esquema):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(self.arquivo, esquema, compression=self.compressao or self.COMPRESSAO_PADRAO)
+
+
+class EscritorArrow(EscritorColunar):
+    # Arrow IPC (o mesmo formato do Feather v2): leitura praticamente sem conversão.
+    # lz4 comprime pouco, mas quase não custa tempo; use "zstd" para arquivos menores.
+    COMPRESSAO_PADRAO = "lz4"
+
+    def __init__(self, arquivo, colunas, tipos=None, compressao=None):
+        super().__init__(arquivo, colunas, tipos, compressao)
+        # Valores já gravados de cada coluna category, na ordem em que apareceram
+        self._dicionarios = {}
+
+    def _abrir_gravador(self, esquema):
+        # emit_dictionary_deltas: cada bloco só acrescenta ao dicionário os valores novos
+        opcoes = self._pa.ipc.IpcWriteOptions(
+            compression=self.compressao or self.COMPRESSAO_PADRAO, emit_dictionary_deltas=True
+        )
+        return self._pa.ipc.new_file(str(self.arquivo), esquema, options=opcoes)
+
+    def _preparar(self, tabela):
+        # O arquivo Arrow não aceita trocar o dicionário de uma coluna category entre blocos
+        # (cada bloco do pandas/pyarrow traz o seu). Recodificamos cada bloco contra um
+        # dicionário único que só cresce: os valores antigos mantêm o mesmo código.
+        pa = self._pa
+        import pyarrow.compute as pc
+
+        colunas = []
+        for campo, coluna in zip(tabela.schema, tabela.columns):
+            if pa.types.is_dictionary(campo.type):
+                valores = coluna.cast(campo.type.value_type)
+                conhecidos = self._dicionarios.get(campo.name, pa.array([], campo.type.value_type))
+                novos = pc.unique(valores.filter(pc.invert(pc.is_in(valores, value_set=conhecidos))))
+                conhecidos = pa.concat_arrays([conhecidos, novos.drop_null()])
+                self._dicionarios[campo.name] = conhecidos
+
+                indices = pc.index_in(valores, value_set=conhecidos)
+                coluna = pa.chunked_array(
+                    [pa.DictionaryArray.from_arrays(pedaco, conhecidos) for pedaco in indices.chunks],
+                    type=campo.type,
+                )
+            colunas.append(coluna)
+        return pa.table(colunas, names=tabela.column_names)
+
+
+ESCRITORES = {
+    ".csv": EscritorCsv,
+    ".xlsx": EscritorXlsx,
+    ".parquet": EscritorParquet,
+    ".arrow": EscritorArrow,
+    ".feather": EscritorArrow,
+}
+
+
+def abrir_escritor(arquivo, colunas, tipos=None, compressao=None):
+    """
+    Escolhe o escritor pela extensão do arquivo (.csv, .xlsx, .parquet, .arrow ou .feather).
+
+    'tipos' e 'compressao' valem para os formatos colunares (Parquet/Arrow).
+    Para .xlsx sem openpyxl (ou Parquet/Arrow sem pyarrow) instalado, lança ModuleNotFoundError
+    (quem chamou decide se cai para CSV).
+    """
+    arquivo = Path(arquivo)
+    try:
+        classe = ESCRITORES[arquivo.suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Formato não suportado: {arquivo.suffix} (use {', '.join(ESCRITORES)})") from None
+    return classe(arquivo, colunas, tipos, compressao)
+
+
+def salvar_dataframe(df, arquivo, tipos=None, compressao=None):
+    """Atalho para gravar um DataFrame inteiro no formato indicado pela extensão."""
+    with abrir_escritor(arquivo, df.columns, tipos, compressao) as escritor:
+        escritor.escrever_bloco(df)
+    return escritor.arquivo
+
+
+def ler_em_lotes(arquivo, linhas_por_lote=LINHAS_POR_GRUPO_PARQUET):
+    """Lê um relatório (.csv, .parquet, .arrow/.feather) devolvendo listas de linhas (tuplas)."""
+    arquivo = Path(arquivo)
+    sufixo = arquivo.suffix.lower()
+
+    if sufixo == ".csv":
+        with open(arquivo, newline="", encoding="utf-8") as entrada:
+            leitor = csv.reader(entrada)
+            next(leitor, None)  # pula o cabeçalho
+            while lote := list(islice(leitor, linhas_por_lote)):
+                yield lote
+        return
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if sufixo == ".parquet":
+        lotes = pq.ParquetFile(arquivo).iter_batches(batch_size=linhas_por_lote)
+    elif sufixo in (".arrow", ".feather"):
+        leitor = pa.ipc.open_file(arquivo)
+        lotes = (leitor.get_batch(i) for i in range(leitor.num_record_batches))
+    else:
+        raise ValueError(f"Formato não suportado para leitura: {sufixo}")
+
+    for lote in lotes:
+        colunas = [coluna.to_pylist() for coluna in lote.columns]
+        yield list(zip(*colunas))
+
+
+def _conversor_csv(tipo):
+    # Texto do CSV -> valor Python do tipo da coluna (célula vazia = None)
+    if tipo in ("int32", "int64"):
+        return lambda texto: int(texto) if texto else None
+    if tipo in ("float32", "float64"):
+        return lambda texto: float(texto) if texto else None
+    if tipo == "bool":
+        return lambda texto: texto == "True" if texto else None
+    return None  # texto continua texto
+
+
+def exportar_xlsx(origem, destino=None, tipos=None):
+    """
+    Exportação opcional para Excel (para o time de Marketing), a partir do relatório já gravado.
+
+    O openpyxl é o passo mais lento da geração; deixá-lo separado permite pular quando
+    ninguém precisa do .xlsx. As linhas são copiadas em lotes (memória estável).
+
+    Parquet/Arrow já guardam o tipo de cada coluna. No CSV tudo é texto: passe 'tipos'
+    (o mesmo dict do abrir_escritor) para IDs e números saírem como número no Excel.
+    """
+    from openpyxl import Workbook
+
+    origem = Path(origem)
+    destino = Path(destino) if destino else origem.with_suffix(".xlsx")
+
+    if origem.suffix.lower() == ".csv":
+        with open(origem, newline="", encoding="utf-8") as entrada:
+            cabecalho = next(csv.reader(entrada))
+    else:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if origem.suffix.lower() == ".parquet":
+            cabecalho = pq.read_schema(origem).names
+        else:
+            cabecalho = pa.ipc.open_file(origem).schema.names
+
+    conversores = []
+    if origem.suffix.lower() == ".csv":
+        conversores = [
+            (posicao, conversor)
+            for posicao, coluna in enumerate(cabecalho)
+            if (conversor := _conversor_csv((tipos or {}).get(coluna))) is not None
+        ]
+
+    planilha = Workbook(write_only=True)
+    aba = planilha.create_sheet()
+    aba.append(cabecalho)
+    for lote in ler_em_lotes(origem):
+        for linha in lote:
+            linha = list(linha)
+            for posicao, conversor in conversores:
+                linha[posicao] = conversor(linha[posicao])
+            aba.append(linha)
+    planilha.save(destino)
+    return destino
@@ -0,0 +1,273 @@
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# --- EXECUÇÃO DE VÁRIOS PROCESSOS EM PARALELO ---
+# Versão "de produção" do arsenal_subprocess.py para quando disparamos centenas de
+# conversores externos por lote. O subprocess.run(capture_output=True) guarda TODA a saída
+# na memória e bloqueia até o processo terminar; aqui:
+# - N processos rodam ao mesmo tempo (cada um acompanhado por uma thread do pool).
+# - stdout/stderr são lidos linha a linha e vão para um callback e/ou arquivos de log.
+#   Do stderr guardamos só as últimas linhas (para a mensagem de erro).
+# - Timeout por tarefa e timeout global. No timeout, o GRUPO de processos inteiro é encerrado
+#   (SIGTERM, e SIGKILL se não sair): um conversor que abriu subprocessos não deixa órfãos.
+# - Cada resultado traz tempo, código de saída, CPU e memória máxima (rusage, no Linux/macOS).
+#
+# Uso:
+#     tarefas = [Tarefa(["convert", str(png), str(png.with_suffix(".webp"))]) for png in pngs]
+#     for resultado in executar_tarefas(tarefas, max_paralelo=8, timeout_global=600):
+#         print(resultado)
+
+MAX_PARALELO_PADRAO = os.cpu_count() or 4
+
+# Depois do SIGTERM, quanto tempo o processo tem para sair sozinho antes do SIGKILL
+ESPERA_ENCERRAR = 2.0
+
+# Quantas linhas finais do stderr ficam guardadas no resultado
+LINHAS_ERRO_GUARDADAS = 20
+
+POSIX = os.name == "posix"
+
+
+@dataclass
+class Tarefa:
+    comando: list
+    nome: str = None
+    cwd: str = None
+    env: dict = None
+    # Segundos (None = sem limite próprio; o timeout global continua valendo)
+    timeout: float = None
+
+    def __post_init__(self):
+        if self.nome is None:
+            self.nome = Path(self.comando[0]).name
+
+
+@dataclass
+class ResultadoTarefa:
+    nome: str
+    # Posição da tarefa na lista de entrada (os resultados saem na ordem em que terminam)
+    indice: int
+    codigo_saida: int = None
+    segundos: float = 0.0
+    expirou: bool = False
+    # Tempo de CPU (usuário/sistema) e pico de memória, via rusage (None no Windows)
+    cpu_usuario: float = None
+    cpu_sistema: float = None
+    memoria_maxima_mb: float = None
+    ultimas_linhas_erro: list = field(default_factory=list)
+    # Erro para iniciar o processo (ex: executável não encontrado)
+    erro: Exception = None
+
+    @property
+    def sucesso(self):
+        return self.codigo_saida == 0 and not self.expirou
+
+    def __str__(self):
+        if self.erro is not None:
+            return f"{self.nome}: NÃO INICIOU ({self.erro})"
+        situacao = "TIMEOUT" if self.expirou else f"código {self.codigo_saida}"
+        texto = f"{self.nome}: {situacao} em {self.segundos:.2f}s"
+        if self.cpu_usuario is not None:
+            texto += (
+                f" | CPU {self.cpu_usuario:.2f}s usuário + {self.cpu_sistema:.2f}s sistema"
+                f" | memória máx. {self.memoria_maxima_mb:.1f} MB"
+            )
+        return texto
+
+
+def _iniciar(tarefa):
+    # Cada tarefa vira líder de um grupo de processos novo: no timeout matamos o grupo inteiro
+    opcoes = {"start_new_session": True} if POSIX else {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return subprocess.Popen(
+        tarefa.comando,
+        cwd=tarefa.cwd,
+        env=tarefa.env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+        bufsize=1,
+        **opcoes,
+    )
+
+
+def _sinalizar_grupo(processo, forcar=False):
+    try:
+        if POSIX:
+            os.killpg(processo.pid, signal.SIGKILL if forcar else signal.SIGTERM)
+        elif forcar:
+            # No Windows, taskkill /T derruba a árvore de processos
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(processo.pid)], capture_output=True)
+        else:
+            processo.send_signal(signal.CTRL_BREAK_EVENT)
+    except (ProcessLookupError, PermissionError, OSError):
+        # O grupo já tinha terminado
+        pass
+
+
+def _encerrar_grupo(processo, terminou, espera=ESPERA_ENCERRAR):
+    # Pedimos com educação (SIGTERM: o conversor pode apagar arquivos temporários)...
+    _sinalizar_grupo(processo)
+    # ... e forçamos se ele não sair a tempo
+    if not terminou.wait(espera):
+        _sinalizar_grupo(processo, forcar=True)
+
+
+def _ler_fluxo(fluxo, nome_fluxo, tarefa, ao_imprimir, log, guardadas):
+    # "for linha in fluxo" devolve cada linha assim que o processo a escreve
+    with fluxo:
+        for linha in fluxo:
+            linha = linha.rstrip("\n")
+            if guardadas is not None:
+                guardadas.append(linha)
+            if log is not None:
+                log.write(linha + "\n")
+            if ao_imprimir is not None:
+                ao_imprimir(tarefa.nome, nome_fluxo, linha)
+
+
+def _abrir_logs(pasta_logs, tarefa, indice):
+    if pasta_logs is None:
+        return None, None
+    base = Path(pasta_logs) / f"{indice:05d}_{tarefa.nome}"
+    return (
+        open(base.with_name(base.name + ".stdout.log"), "w", encoding="utf-8"),
+        open(base.with_name(base.name + ".stderr.log"), "w", encoding="utf-8"),
+    )
+
+
+def _esperar(processo):
+    """Espera o processo terminar e devolve (codigo_saida, rusage ou None)."""
+    # O timeout fica a cargo do timer de quem chamou: ele encerra o grupo e a espera acaba
+    if hasattr(os, "wait4"):
+        # wait4 devolve também o rusage do filho
+        _, status, uso = os.wait4(processo.pid, 0)
+        # Avisamos o Popen que o processo já foi "recolhido" (senão ele tentaria de novo)
+        processo.returncode = os.waitstatus_to_exitcode(status)
+        return processo.returncode, uso
+    return processo.wait(), None
+
+
+def _executar(tarefa, indice, prazo_global, ao_imprimir, pasta_logs, em_execucao, trava):
+    resultado = ResultadoTarefa(tarefa.nome, indice)
+
+    timeout = tarefa.timeout
+    if prazo_global is not None:
+        restante = prazo_global - time.monotonic()
+        if restante <= 0:
+            # O timeout global estourou antes desta tarefa começar: nem iniciamos
+            resultado.expirou = True
+            return resultado
+        timeout = restante if timeout is None else min(timeout, restante)
+
+    inicio = time.monotonic()
+    try:
+        processo = _iniciar(tarefa)
+    except OSError as e:
+        resultado.erro = e
+        return resultado
+
+    with trava:
+        em_execucao.add(processo)
+
+    terminou = threading.Event()
+    expirou = threading.Event()
+
+    def ao_expirar():
+        expirou.set()
+        _encerrar_grupo(processo, terminou)
+
+    log_saida, log_erro = _abrir_logs(pasta_logs, tarefa, indice)
+    guardadas = deque(maxlen=LINHAS_ERRO_GUARDADAS)
+    leitores = [
+        threading.Thread(target=_ler_fluxo, args=(processo.stdout, "stdout", tarefa, ao_imprimir, log_saida, None)),
+        threading.Thread(target=_ler_fluxo, args=(processo.stderr, "stderr", tarefa, ao_imprimir, log_erro, guardadas)),
+    ]
+    for leitor in leitores:
+        leitor.start()
+
+    cronometro = threading.Timer(timeout, ao_expirar) if timeout is not None else None
+    if cronometro is not None:
+        cronometro.start()
+    try:
+        resultado.codigo_saida, uso = _esperar(processo)
+    finally:
+        terminou.set()
+        if cronometro is not None:
+            cronometro.cancel()
+
+    # Algum "neto" ainda segurando o stdout aberto? Derrubamos o resto do grupo
+    for leitor in leitores:
+        leitor.join(timeout=ESPERA_ENCERRAR)
+        if leitor.is_alive():
+            _sinalizar_grupo(processo, forcar=True)
+            leitor.join()
+
+    with trava:
+        em_execucao.discard(processo)
+    for log in (log_saida, log_erro):
+        if log is not None:
+            log.close()
+
+    resultado.segundos = time.monotonic() - inicio
+    resultado.expirou = expirou.is_set()
+    resultado.ultimas_linhas_erro = list(guardadas)
+    if uso is not None:
+        resultado.cpu_usuario = uso.ru_utime
+        resultado.cpu_sistema = uso.ru_stime
+        # ru_maxrss vem em KB no Linux e em bytes no macOS. No Linux ele inclui a memória do
+        # instante do fork (antes do exec), então nunca fica abaixo de uns poucos MB.
+        resultado.memoria_maxima_mb = uso.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return resultado
+
+
+def executar_tarefas(
+    tarefas,
+    max_paralelo=MAX_PARALELO_PADRAO,
+    timeout_global=None,
+    ao_imprimir=None,
+    pasta_logs=None,
+):
+    """
+    Roda as tarefas com no máximo 'max_paralelo' processos ao mesmo tempo.
+
+    Gerador: cada ResultadoTarefa sai assim que a tarefa termina (use .indice para a ordem original).
+    - timeout_global: segundos para o lote inteiro; tarefas que não começaram a tempo
+      voltam com expirou=True sem rodar.
+    - ao_imprimir(nome, "stdout" | "stderr", linha): chamado a cada linha (de várias threads).
+    - pasta_logs: grava <indice>_<nome>.stdout.log / .stderr.log para cada tarefa.
+
+    Se quem chamou parar no meio (break, Ctrl+C), os processos em andamento são encerrados.
+    """
+    if pasta_logs is not None:
+        Path(pasta_logs).mkdir(parents=True, exist_ok=True)
+    prazo_global = time.monotonic() + timeout_global if timeout_global is not None else None
+    em_execucao = set()
+    trava = threading.Lock()
+
+    executor = ThreadPoolExecutor(max_workers=max_paralelo)
+    futuros = [
+        executor.submit(_executar, tarefa, indice, prazo_global, ao_imprimir, pasta_logs, em_execucao, trava)
+        for indice, tarefa in enumerate(tarefas)
+    ]
+    try:
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+    finally:
+        # Saída antecipada: cancelamos o que não começou e derrubamos o que está rodando
+        for futuro in futuros:
+            futuro.cancel()
+        with trava:
+            rodando = list(em_execucao)
+        for processo in rodando:
+            _sinalizar_grupo(processo, forcar=True)
+        executor.shutdown(wait=True)
@@ -0,0 +1,322 @@
+import cProfile
+import io
+import json
+import logging
+import math
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import resource  # Só existe em Linux/macOS
+except ImportError:
+    resource = None
+
+# --- INSTRUMENTAÇÃO DAS AUTOMAÇÕES ---
+# Para saber ONDE o tempo vai, sem encher o terminal de print:
+# - Etapas: tempo total de cada fase (consulta, escrita, relatório...).
+# - Requisições: latência (p50/p95/p99), contagem por status HTTP e bytes recebidos
+#   (a SessaoHTTP do cliente_http.py registra sozinha, com instrumentacao=...).
+# - Pico de memória (RSS) do processo.
+# - Resumo em JSON no final da execução (fácil de comparar entre execuções).
+# - Perfil opcional: cProfile (onde a CPU foi gasta) e tracemalloc (quem alocou memória),
+#   ligados por parâmetro ou pela variável de ambiente AUTOMACAO_PERFIL=cprofile,tracemalloc.
+# - Log estruturado (texto ou uma linha JSON por evento) no lugar dos prints por linha:
+#   com 100 mil leads, escrever no terminal já pesa. Eventos por lead ficam no nível DEBUG.
+#
+# Uso:
+#     instrumentacao = Instrumentacao("integracao_crm")
+#     with instrumentacao.etapa("escrita"):
+#         ...
+#     instrumentacao.salvar_resumo("resumo_execucao.json")
+
+PERCENTIS = (50, 95, 99)
+
+# Histograma de latência com baldes de tamanho fixo em escala logarítmica (como o HdrHistogram):
+# memória constante e percentil sem ordenar nada, não importa se são 100 ou 10 milhões de requisições.
+# 16 baldes por "oitava" (cada vez que a latência dobra): cada balde tem ~4,4% de largura,
+# então o percentil sai com erro de ~2% (o meio do balde). De 0,1 ms a ~17 min; acima disso vai no último.
+LATENCIA_MINIMA_S = 0.0001
+BALDES_POR_OITAVA = 16
+TOTAL_BALDES = 24 * BALDES_POR_OITAVA + 1
+
+# Quantas funções/linhas entram no resumo do cProfile e do tracemalloc
+TOP_PERFIL = 15
+
+
+def pico_memoria_mb():
+    """Maior uso de memória (RSS) do processo até agora. None no Windows."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em KB no Linux e em bytes no macOS
+    return pico / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _balde(segundos):
+    # Balde 0: até 0,1 ms; o balde i cobre de MIN * 2^((i-1)/B) até MIN * 2^(i/B)
+    if segundos <= LATENCIA_MINIMA_S:
+        return 0
+    return min(TOTAL_BALDES - 1, int(math.log2(segundos / LATENCIA_MINIMA_S) * BALDES_POR_OITAVA) + 1)
+
+
+def _meio_do_balde(balde):
+    # Média geométrica das bordas: o erro fica igual para os dois lados
+    if balde == 0:
+        return LATENCIA_MINIMA_S
+    return LATENCIA_MINIMA_S * 2 ** ((balde - 0.5) / BALDES_POR_OITAVA)
+
+
+def _percentil(baldes, total, percentil):
+    # Método "nearest rank": o balde que deixa percentil% das amostras abaixo (ou iguais)
+    posicao = max(1, int(round(percentil / 100 * total)))
+    acumulado = 0
+    for balde, quantidade in enumerate(baldes):
+        acumulado += quantidade
+        if acumulado >= posicao:
+            return _meio_do_balde(balde)
+    return _meio_do_balde(TOTAL_BALDES - 1)
+
+
+class Instrumentacao:
+    """Coleta métricas de uma execução. Pode ser usada por várias threads ao mesmo tempo."""
+
+    def __init__(self, nome="execucao"):
+        self.nome = nome
+        self.inicio = datetime.now(timezone.utc)
+        # Contadores livres de cada script (ex: cache, checkpoint), que entram no resumo
+        self.extras = {}
+
+        self._relogio = time.perf_counter()
+        self._etapas = {}  # nome -> [segundos, vezes]
+        # Histograma de latência (contagem por balde) + menor/maior exatos
+        self._baldes = [0] * TOTAL_BALDES
+        self._requisicoes = 0
+        self._latencia_min = math.inf
+        self._latencia_max = 0.0
+        self._status = Counter()
+        self._bytes = 0
+        self._perfil = {}
+        self._trava = threading.Lock()
+
+    # --- Etapas ---
+
+    @contextmanager
+    def etapa(self, nome):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.somar_etapa(nome, time.perf_counter() - inicio)
+
+    def somar_etapa(self, nome, segundos, vezes=1):
+        # Etapas que rodam em várias threads somam o tempo de todas (pode passar do tempo total)
+        with self._trava:
+            total = self._etapas.setdefault(nome, [0.0, 0])
+            total[0] += segundos
+            total[1] += vezes
+
+    def cronometrar(self, iteravel, nome):
+        """Repassa os itens de 'iteravel', somando na etapa 'nome' o tempo esperando cada um."""
+        iterador = iter(iteravel)
+        while True:
+            inicio = time.perf_counter()
+            try:
+                item = next(iterador)
+            except StopIteration:
+                self.somar_etapa(nome, time.perf_counter() - inicio, vezes=0)
+                return
+            self.somar_etapa(nome, time.perf_counter() - inicio)
+            yield item
+
+    # --- Requisições ---
+
+    def registrar_requisicao(self, segundos, status, bytes_recebidos=0):
+        """status: código HTTP, ou o nome da exceção quando não houve resposta (ex: "ConnectTimeout")."""
+        balde = _balde(segundos)  # o log fica fora do lock
+        with self._trava:
+            self._baldes[balde] += 1
+            self._requisicoes += 1
+            self._latencia_min = min(self._latencia_min, segundos)
+            self._latencia_max = max(self._latencia_max, segundos)
+            self._status[status] += 1
+            self._bytes += bytes_recebidos
+
+    def latencias_ms(self):
+        with self._trava:
+            baldes = list(self._baldes)
+            total, menor, maior = self._requisicoes, self._latencia_min, self._latencia_max
+        if not total:
+            return {}
+        # O meio do balde nunca passa dos extremos que realmente aconteceram
+        resumo = {
+            f"p{percentil}": min(maior, max(menor, _percentil(baldes, total, percentil))) * 1000
+            for percentil in PERCENTIS
+        }
+        resumo["max"] = maior * 1000
+        return {nome: round(valor, 1) for nome, valor in resumo.items()}
+
+    # --- Perfil (opcional) ---
+
+    @contextmanager
+    def perfilar(self, cprofile=False, alocacoes=False, arquivo_perfil=None):
+        """
+        Liga o cProfile e/ou o tracemalloc durante o bloco 'with'.
+
+        O resultado entra no resumo (funções mais caras, linhas que mais alocaram);
+        com arquivo_perfil, as estatísticas completas do cProfile vão para um .prof
+        (abra com: python -m pstats arquivo.prof, ou snakeviz).
+        """
+        perfilador = cProfile.Profile() if cprofile else None
+        if alocacoes:
+            tracemalloc.start()
+        if perfilador is not None:
+            perfilador.enable()
+        try:
+            yield
+        finally:
+            if perfilador is not None:
+                perfilador.disable()
+                self._resumir_cprofile(perfilador, arquivo_perfil)
+            if alocacoes:
+                self._resumir_tracemalloc()
+                tracemalloc.stop()
+
+    def _resumir_cprofile(self, perfilador, arquivo_perfil):
+        if arquivo_perfil is not None:
+            perfilador.dump_stats(arquivo_perfil)
+        estatisticas = pstats.Stats(perfilador, stream=io.StringIO()).sort_stats("cumulative")
+        funcoes = []
+        for (arquivo, linha, funcao), (_, chamadas, proprio, acumulado, _) in estatisticas.stats.items():
+            funcoes.append(
+                {
+                    "funcao": f"{os.path.basename(arquivo)}:{linha}({funcao})",
+                    "chamadas": chamadas,
+                    "proprio_s": round(proprio, 4),
+                    "acumulado_s": round(acumulado, 4),
+                }
+            )
+        funcoes.sort(key=lambda item: item["acumulado_s"], reverse=True)
+        self._perfil["cprofile"] = {"arquivo": arquivo_perfil and str(arquivo_perfil), "top": funcoes[:TOP_PERFIL]}
+
+    def _resumir_tracemalloc(self):
+        _, pico = tracemalloc.get_traced_memory()
+        linhas = tracemalloc.take_snapshot().statistics("lineno")[:TOP_PERFIL]
+        self._perfil["tracemalloc"] = {
+            "pico_mb": round(pico / 1024 / 1024, 2),
+            "top": [
+                {"linha": str(estatistica.traceback[0]), "mb": round(estatistica.size / 1024 / 1024, 3)}
+                for estatistica in linhas
+            ],
+        }
+
+    # --- Resumo ---
+
+    def resumo(self):
+        with self._trava:
+            etapas = {nome: {"segundos": round(s, 3), "vezes": n} for nome, (s, n) in self._etapas.items()}
+            requisicoes = {
+                "total": self._requisicoes,
+                # Chaves em texto: o JSON não aceita número como chave
+                "por_status": {str(status): n for status, n in sorted(self._status.items(), key=str)},
+                "bytes_recebidos": self._bytes,
+            }
+        requisicoes["latencia_ms"] = self.latencias_ms()
+        memoria = pico_memoria_mb()
+        resumo = {
+            "nome": self.nome,
+            "inicio": self.inicio.isoformat(timespec="seconds"),
+            "duracao_s": round(time.perf_counter() - self._relogio, 3),
+            "etapas": etapas,
+            "requisicoes": requisicoes,
+            "memoria_pico_mb": memoria and round(memoria, 1),
+            **self.extras,
+        }
+        if self._perfil:
+            resumo["perfil"] = self._perfil
+        return resumo
+
+    def salvar_resumo(self, arquivo):
+        with open(arquivo, "w", encoding="utf-8") as saida:
+            json.dump(self.resumo(), saida, ensure_ascii=False, indent=2, default=str)
+        return arquivo
+
+    def __str__(self):
+        resumo = self.resumo()
+        etapas = " | ".join(f"{nome}: {dados['segundos']:.2f}s" for nome, dados in resumo["etapas"].items())
+        requisicoes = resumo["requisicoes"]
+        latencia = " ".join(f"{nome}={valor:.0f}ms" for nome, valor in requisicoes["latencia_ms"].items())
+        status = ", ".join(f"{codigo}: {n}" for codigo, n in requisicoes["por_status"].items())
+        memoria = resumo["memoria_pico_mb"]
+        return (
+            f"Tempo total: {resumo['duracao_s']:.2f}s ({etapas})\n"
+            f"Requisições: {requisicoes['total']} ({status}) | {latencia} | "
+            f"{requisicoes['bytes_recebidos'] / 1024:.1f} KB recebidos\n"
+            f"Pico de memória: {'-' if memoria is None else f'{memoria:.1f} MB'}"
+        )
+
+
+def perfis_do_ambiente(variavel="AUTOMACAO_PERFIL"):
+    """Lê AUTOMACAO_PERFIL=cprofile,tracemalloc e devolve as opções de Instrumentacao.perfilar."""
+    pedidos = {item.strip().lower() for item in os.getenv(variavel, "").split(",") if item.strip()}
+    return {"cprofile": "cprofile" in pedidos, "alocacoes": "tracemalloc" in pedidos}
+
+
+# --- Log estruturado ---
+
+
+class FormatadorJson(logging.Formatter):
+    """Uma linha JSON por evento: fácil de filtrar (jq) e de mandar para ferramentas de log."""
+
+    def format(self, registro):
+        evento = {
+            "ts": datetime.fromtimestamp(registro.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "nivel": registro.levelname,
+            "logger": registro.name,
+            "msg": registro.getMessage(),
+            # Campos passados com extra={"campos": {...}}
+            **getattr(registro, "campos", {}),
+        }
+        if registro.exc_info:
+            evento["erro"] = self.formatException(registro.exc_info)
+        return json.dumps(evento, ensure_ascii=False, default=str)
+
+
+class FormatadorTexto(logging.Formatter):
+    def format(self, registro):
+        texto = super().format(registro)
+        campos = getattr(registro, "campos", None)
+        if campos:
+            texto += " " + " ".join(f"{chave}={valor}" for chave, valor in campos.items())
+        return texto
+
+
+def configurar_log(nome, nivel="INFO", formato="texto", arquivo=None):
+    """
+    Logger com saída em texto ou JSON (no terminal ou num arquivo).
+
+    Eventos por linha/lead devem ir em log.debug(...): com nivel="INFO" eles nem são formatados.
+    """
+    log = logging.getLogger(nome)
+    log.setLevel(nivel)
+    # Reconfigurar (ex: uma partição depois da outra) troca a saída: fechamos a anterior,
+    # senão cada FileHandler antigo fica com o arquivo aberto até o fim do processo
+    for antigo in list(log.handlers):
+        log.removeHandler(antigo)
+        antigo.close()
+    # Não repassa para o logger raiz (evita linhas duplicadas se alguém configurar o logging global)
+    log.propagate = False
+
+    destino = logging.FileHandler(arquivo, encoding="utf-8") if arquivo else logging.StreamHandler(sys.stdout)
+    if formato == "json":
+        destino.setFormatter(FormatadorJson())
+    else:
+        destino.setFormatter(FormatadorTexto("%(asctime)s %(levelname)s %(message)s", "%H:%M:%S"))
+    log.addHandler(destino)
+    return log
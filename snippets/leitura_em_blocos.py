@@ -0,0 +1,128 @@
+from pathlib import Path
+
+import pandas as pd
+
+from escrita_relatorios import abrir_escritor
+
+# --- LEITURA DE CSV GIGANTE EM BLOCOS ---
+# pd.read_csv(arquivo) carrega o arquivo INTEIRO na memória antes de filtrar.
+# Com CSVs de vários GB isso estoura a RAM. Aqui o arquivo é lido em blocos (chunksize):
+# cada bloco é filtrado, ganha as colunas calculadas, entra nas agregações
+# e já é gravado na saída (CSV ou Parquet). O pico de memória depende do tamanho
+# do bloco, não do tamanho do arquivo.
+#
+# Dicas que reduzem (muito) a memória de cada bloco:
+# - usecols: leia só as colunas que vai usar.
+# - dtype explícito: o pandas não precisa adivinhar (e não usa int64/float64 à toa).
+# - "category" para colunas com poucos valores distintos (ex: status): guarda um código
+#   pequeno por linha em vez de uma string inteira.
+#
+# Uso:
+#     resumo = processar_csv_em_blocos(
+#         "vendas.csv",
+#         "vip.parquet",
+#         colunas=["id", "produto", "valor", "status"],
+#         tipos={"id": "int32", "valor": "float32", "status": "category"},
+#         filtro=lambda df: (df["status"] == "entregue") & (df["valor"] > 1000),
+#         derivadas={"imposto": lambda df: df["valor"] * 0.10},
+#         agrupar_por=["status"],
+#         somar=["valor", "imposto"],
+#         memoria_maxima_mb=256,
+#     )
+
+MEMORIA_MAXIMA_PADRAO_MB = 256
+
+# Linhas lidas para estimar quantos bytes cada linha ocupa na memória
+LINHAS_AMOSTRA = 10_000
+
+# Além do bloco em si, o filtro e as colunas novas criam cópias temporárias.
+# Dividimos o orçamento por este fator para sobrar espaço para elas.
+FATOR_SEGURANCA = 4
+
+
+def estimar_linhas_por_bloco(arquivo, memoria_maxima_mb, **opcoes_leitura):
+    """Lê uma amostra e calcula quantas linhas cabem no orçamento de memória."""
+    amostra = pd.read_csv(arquivo, nrows=LINHAS_AMOSTRA, **opcoes_leitura)
+    if amostra.empty:
+        return LINHAS_AMOSTRA
+    # deep=True conta o tamanho real das strings (não só o ponteiro)
+    bytes_por_linha = amostra.memory_usage(index=True, deep=True).sum() / len(amostra)
+    orcamento = memoria_maxima_mb * 1024 * 1024 / FATOR_SEGURANCA
+    return max(1_000, int(orcamento / bytes_por_linha))
+
+
+def _somar_parciais(total, parcial):
+    # Somas e contagens parciais de cada bloco podem ser somadas entre si no final
+    if total is None:
+        return parcial
+    return total.add(parcial, fill_value=0)
+
+
+def processar_csv_em_blocos(
+    arquivo_entrada,
+    arquivo_saida=None,
+    colunas=None,
+    tipos=None,
+    filtro=None,
+    derivadas=None,
+    agrupar_por=None,
+    somar=None,
+    memoria_maxima_mb=MEMORIA_MAXIMA_PADRAO_MB,
+    linhas_por_bloco=None,
+    **opcoes_leitura,
+):
+    """
+    Processa um CSV grande bloco a bloco.
+
+    - filtro(df) -> máscara booleana com as linhas que ficam.
+    - derivadas: {nova_coluna: funcao(df) -> Series}, calculadas depois do filtro.
+    - arquivo_saida (.csv ou .parquet): as linhas filtradas vão sendo gravadas nele.
+    - agrupar_por + somar: devolve um DataFrame com soma, contagem e média por grupo.
+
+    Sem agregação, devolve o número de linhas gravadas.
+    """
+    opcoes_leitura = {"usecols": colunas, "dtype": tipos, **opcoes_leitura}
+    if linhas_por_bloco is None:
+        linhas_por_bloco = estimar_linhas_por_bloco(arquivo_entrada, memoria_maxima_mb, **opcoes_leitura)
+
+    escritor = None
+    total = None
+    linhas_gravadas = 0
+
+    try:
+        # chunksize devolve um iterador: só UM bloco fica na memória por vez
+        for bloco in pd.read_csv(arquivo_entrada, chunksize=linhas_por_bloco, **opcoes_leitura):
+            if filtro is not None:
+                bloco = bloco[filtro(bloco)]
+            if derivadas:
+                # assign chama cada função com o bloco (e as colunas novas podem usar as anteriores)
+                bloco = bloco.assign(**derivadas)
+
+            if arquivo_saida is not None:
+                if escritor is None:
+                    # O escritor é aberto no primeiro bloco, quando já sabemos as colunas finais
+                    escritor = abrir_escritor(Path(arquivo_saida), bloco.columns)
+                escritor.escrever_bloco(bloco)
+                linhas_gravadas += len(bloco)
+
+            if agrupar_por and somar:
+                # Somamos em float64: float32 perde precisão ao acumular milhões de valores.
+                # observed=True: com category, ignora categorias que não aparecem no bloco
+                parcial = (
+                    bloco.astype({coluna: "float64" for coluna in somar})
+                    .groupby(agrupar_por, observed=True)[somar]
+                    .agg(["sum", "count"])
+                )
+                total = _somar_parciais(total, parcial)
+    finally:
+        if escritor is not None:
+            escritor.fechar()
+
+    if not (agrupar_por and somar):
+        return linhas_gravadas
+
+    if total is None:
+        return pd.DataFrame()
+    for coluna in somar:
+        total[(coluna, "mean")] = total[(coluna, "sum")] / total[(coluna, "count")]
+    return total.sort_index(axis=1)
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+# --- LIMPEZA DE DADOS BRASILEIROS (VETORIZADA) ---
+# Versão "de produção" da seção 7 do arsenal_pandas.py.
+# - Moeda/percentual: valores repetidos (muito comum em exportações) são convertidos uma vez só
+#   (pd.factorize). Com texto em dtype object, cada .str.replace da cadeia original é um loop
+#   em Python criando uma Series nova; aqui fazemos UM passe (translate + float) por valor.
+#   Com texto em dtype string do pyarrow (padrão no pandas 3), o .str.replace já roda em C,
+#   então mantemos os replaces vetorizados. Valor inválido vira NaN em vez de quebrar o script.
+# - Datas: formatos conhecidos explícitos (bem mais rápido que deixar o pandas adivinhar).
+# - CPF/CNPJ: só dígitos, zeros à esquerda e validação dos dígitos verificadores com numpy.
+
+# Tabela de tradução para moeda: None apaga o caractere, "," vira "."
+TABELA_MOEDA = str.maketrans({"R": None, "$": None, " ": None, "\xa0": None, ".": None, ",": "."})
+
+# Tabela para percentual: "12,5%" -> "12.5"
+TABELA_PERCENTUAL = str.maketrans({"%": None, " ": None, "\xa0": None, ".": None, ",": "."})
+
+# Formatos de data mais comuns nas nossas exportações, na ordem em que tentamos
+FORMATOS_DATA = ["%Y-%m-%d", "%d/%m/%Y", "%d/%m/%Y %H:%M:%S", "%Y-%m-%d %H:%M:%S"]
+
+# Pesos oficiais dos dígitos verificadores
+PESOS_CPF_1 = np.arange(10, 1, -1)
+PESOS_CPF_2 = np.arange(11, 1, -1)
+PESOS_CNPJ_1 = np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+PESOS_CNPJ_2 = np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+
+
+def _texto_para_float(valores, tabela):
+    # Um passe por valor: translate limpa o texto e float converte (ou NaN se não der)
+    resultado = np.empty(len(valores))
+    for i, valor in enumerate(valores):
+        try:
+            resultado[i] = float(valor.translate(tabela))
+        except (AttributeError, TypeError, ValueError):
+            resultado[i] = np.nan
+    return resultado
+
+
+def _converter_unicos(serie, tabela):
+    # Converte só os valores distintos e "espalha" o resultado de volta para todas as linhas.
+    # Com 1 milhão de linhas e 5 mil valores diferentes, fazemos 5 mil conversões.
+    codigos, unicos = pd.factorize(serie)
+
+    if pd.api.types.is_object_dtype(unicos.dtype):
+        convertidos = _texto_para_float(unicos, tabela)
+    else:
+        # Strings do pyarrow: cada replace roda em C sobre o array inteiro
+        texto = pd.Series(unicos).astype("string")
+        for antigo, novo in tabela.items():
+            texto = texto.str.replace(chr(antigo), novo or "", regex=False)
+        convertidos = pd.to_numeric(texto, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+    # Valores nulos recebem o código -1, que aponta para o NaN colocado no fim do array
+    convertidos = np.append(convertidos, np.nan)
+    return pd.Series(convertidos[codigos], index=serie.index, name=serie.name)
+
+
+def converter_moeda_brl(serie):
+    """Converte "R$ 1.000,00" em 1000.0. Valores inválidos viram NaN."""
+    return _converter_unicos(serie, TABELA_MOEDA)
+
+
+def converter_percentual(serie):
+    """Converte "12,5%" em 0.125. Valores inválidos viram NaN."""
+    return _converter_unicos(serie, TABELA_PERCENTUAL) / 100
+
+
+def converter_data(serie, formatos=FORMATOS_DATA):
+    """Tenta cada formato conhecido, só nos valores que ainda não converteram. Inválidas viram NaT."""
+    # Datas se repetem MUITO (um ano tem 365 dias): convertemos só os valores distintos
+    codigos, unicos = pd.factorize(serie)
+    texto = pd.Series(unicos, dtype="string").str.strip()
+    convertidos = pd.Series(pd.NaT, index=texto.index, dtype="datetime64[ns]")
+
+    for formato in formatos:
+        faltando = convertidos.isna()
+        if not faltando.any():
+            break
+        convertidos[faltando] = pd.to_datetime(texto[faltando], format=formato, errors="coerce")
+
+    # Código -1 (valor nulo na entrada) aponta para o NaT colocado no fim
+    valores = np.append(convertidos.to_numpy(), np.datetime64("NaT", "ns"))
+    return pd.Series(valores[codigos], index=serie.index, name=serie.name)
+
+
+def _somente_digitos(serie, tamanho):
+    # Remove pontos, traços, barras e espaços
+    texto = serie.astype("string").str.strip()
+    digitos = texto.str.replace(r"\D", "", regex=True)
+    # Zeros à esquerda só para número puro com dígitos a menos (o Excel costuma comer os zeros).
+    # Sem isso, "" ou "abc" viravam "00000000000", com cara de documento válido.
+    faltam_zeros = ((digitos.str.len() < tamanho) & texto.str.fullmatch(r"\d+")).fillna(False)
+    digitos = digitos.mask(faltam_zeros, digitos.str.zfill(tamanho))
+    # Nenhum dígito ou dígitos demais: NA
+    return digitos.where((digitos.str.len() == tamanho).fillna(False))
+
+
+def _digitos_verificadores_ok(digitos, tamanho, pesos_1, pesos_2):
+    validos = digitos.notna().to_numpy()
+    ok = np.zeros(len(digitos), dtype=bool)
+    if not validos.any():
+        return ok
+
+    # Matriz (linhas x dígitos) de inteiros: o cálculo roda em bloco, sem loop em Python
+    texto = digitos[validos].to_numpy(dtype=str).astype(f"S{tamanho}")
+    matriz = np.frombuffer(texto.tobytes(), dtype=np.uint8).reshape(-1, tamanho) - ord("0")
+
+    n = len(pesos_1)
+    dv1 = (matriz[:, :n] @ pesos_1) % 11
+    dv1 = np.where(dv1 < 2, 0, 11 - dv1)
+    dv2 = (matriz[:, : n + 1] @ pesos_2) % 11
+    dv2 = np.where(dv2 < 2, 0, 11 - dv2)
+
+    # Sequências repetidas (000.000.000-00, 111...) passam na conta, mas não são válidas
+    repetido = (matriz == matriz[:, :1]).all(axis=1)
+    ok[validos] = (matriz[:, n] == dv1) & (matriz[:, n + 1] == dv2) & ~repetido
+    return ok
+
+
+def normalizar_cpf(serie, validar=True):
+    """Converte "123.456.789-09" em "12345678909". Inválidos (tamanho ou dígito verificador) viram NA."""
+    digitos = _somente_digitos(serie, 11)
+    if validar:
+        digitos = digitos.where(_digitos_verificadores_ok(digitos, 11, PESOS_CPF_1, PESOS_CPF_2))
+    return digitos
+
+
+def normalizar_cnpj(serie, validar=True):
+    """Converte "12.345.678/0001-95" em "12345678000195". Inválidos viram NA."""
+    digitos = _somente_digitos(serie, 14)
+    if validar:
+        digitos = digitos.where(_digitos_verificadores_ok(digitos, 14, PESOS_CNPJ_1, PESOS_CNPJ_2))
+    return digitos
@@ -0,0 +1,252 @@
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+
+# --- MOVIMENTAÇÃO EM LOTE: INBOX -> PROCESSADOS ---
+# Versão "de produção" da seção 9 do arsenal_pathlib.py (exists() + replace()).
+# - Sem exists() antes de mover: entre o exists() e o replace() outro processo pode pegar o
+#   arquivo. Tentamos direto e tratamos o FileNotFoundError (é uma chamada ao SO a menos, também).
+# - "Reivindicação" atômica: o arquivo primeiro é renomeado para a pasta de trabalho.
+#   O rename é atômico no mesmo disco: se dois workers (ou dois scripts) tentarem pegar o
+#   mesmo arquivo, só um consegue; o outro recebe FileNotFoundError e segue para o próximo.
+# - Os arquivos são divididos em lotes e os lotes rodam num pool de threads.
+#
+# Fluxo de cada arquivo:  inbox/a/x.txt -> em_andamento/<lote>/a/x.txt -> processar() -> processed/a/x.txt
+# Cada lote reivindica para uma subpasta própria (<lote> é um uuid): se um x.txt novo chega na inbox
+# enquanto o anterior ainda está em processar(), os dois não disputam o mesmo caminho em em_andamento/.
+# Se processar() falhar, o arquivo volta para a inbox (e é tentado de novo na próxima execução),
+# ou vai para a pasta_erros, quando ela é informada. Quem observa a inbox sem parar (observador_inbox.py)
+# PRECISA da pasta_erros: devolvido, o arquivo gera um evento novo e falha de novo em seguida, para sempre.
+# Nada é sobrescrito: se processed/ (ou a pasta_erros, ou a inbox na devolução) já tem um arquivo
+# com o mesmo nome (o mesmo x.txt chegou de novo), o novo vira "x (1).txt", "x (2).txt"...
+#
+# Uso:
+#     resultado = mover_arquivos(varrer("inbox", "*.txt"), "inbox", "processed", processar=importar_pedido)
+#     print(resultado)   # 10000 movidos | 0 já pegos por outro worker | 0 falhas | 2.1s (4761 arquivos/s)
+
+MAX_WORKERS_PADRAO = 8
+TAMANHO_LOTE_PADRAO = 100
+
+
+@dataclass
+class ResultadoMovimentacao:
+    movidos: int = 0
+    # Arquivos que outro worker/processo reivindicou primeiro (não é erro)
+    ja_reivindicados: int = 0
+    falhas: int = 0
+    segundos: float = 0.0
+    # (caminho, exceção) de cada falha, para o log
+    erros: list = field(default_factory=list)
+
+    @property
+    def arquivos_por_segundo(self):
+        return self.movidos / self.segundos if self.segundos else 0.0
+
+    def somar(self, outro):
+        self.movidos += outro.movidos
+        self.ja_reivindicados += outro.ja_reivindicados
+        self.falhas += outro.falhas
+        self.erros.extend(outro.erros)
+
+    def __str__(self):
+        return (
+            f"{self.movidos} movidos | {self.ja_reivindicados} já pegos por outro worker | "
+            f"{self.falhas} falhas | {self.segundos:.1f}s ({self.arquivos_por_segundo:.0f} arquivos/s)"
+        )
+
+
+def pasta_trabalho_padrao(pasta_destino):
+    # Ao lado da pasta de destino (processed -> processed.em_andamento): mesmo disco, rename atômico
+    pasta_destino = Path(pasta_destino)
+    return pasta_destino.with_name(pasta_destino.name + ".em_andamento")
+
+
+def pasta_erros_padrao(pasta_destino):
+    # Quarentena ao lado da pasta de destino (processed -> processed.erros)
+    pasta_destino = Path(pasta_destino)
+    return pasta_destino.with_name(pasta_destino.name + ".erros")
+
+
+def _mover_sem_sobrescrever(origem, destino):
+    """Move 'origem' para 'destino'; se o nome já existe lá, usa 'nome (1).ext', 'nome (2).ext'..."""
+    base, extensao = os.path.splitext(destino)
+    candidato, numero = destino, 0
+    while True:
+        try:
+            # O link falha com FileExistsError se o nome já existe: conferir e ocupar o nome
+            # é uma chamada atômica só (exists() + replace() deixaria outro worker passar no meio)
+            os.link(origem, candidato)
+        except FileExistsError:
+            pass
+        except OSError:
+            # Sistema de arquivos sem hard link: exists() + replace() (não é atômico, mas é o que dá)
+            if not os.path.exists(candidato):
+                os.replace(origem, candidato)
+                return candidato
+        else:
+            os.unlink(origem)
+            return candidato
+        numero += 1
+        candidato = f"{base} ({numero}){extensao}"
+
+
+class _Pastas:
+    """Cria cada pasta de destino uma vez só (em vez de um mkdir por arquivo)."""
+
+    def __init__(self):
+        self._criadas = set()
+        self._trava = threading.Lock()
+
+    def garantir(self, pasta):
+        if pasta in self._criadas:
+            return
+        os.makedirs(pasta, exist_ok=True)
+        with self._trava:
+            self._criadas.add(pasta)
+
+
+def _apagar_pastas_vazias(pasta):
+    # Remove a subpasta do lote (e as subpastas dela) se ficou vazia; se sobrou arquivo, fica
+    for atual, _, _ in os.walk(pasta, topdown=False):
+        try:
+            os.rmdir(atual)
+        except OSError:
+            pass
+
+
+def _mover_lote(lote, raiz, pasta_trabalho, pasta_destino, processar, pastas, pasta_erros):
+    resultado = ResultadoMovimentacao()
+    # Subpasta só deste lote: o rename da reivindicação nunca cai em cima de um arquivo
+    # que outro lote (ou este mesmo, mais cedo) ainda está processando
+    pasta_lote = os.path.join(pasta_trabalho, uuid.uuid4().hex)
+    usados = set()
+    for origem in lote:
+        origem = os.fspath(origem)
+        # O caminho relativo à raiz mantém as subpastas (e evita colisão de nomes iguais)
+        relativo = os.path.relpath(origem, raiz)
+        if relativo in usados:
+            # O mesmo nome duas vezes no lote (chegou de novo): outra subpasta para ele
+            _apagar_pastas_vazias(pasta_lote)
+            pasta_lote = os.path.join(pasta_trabalho, uuid.uuid4().hex)
+            usados.clear()
+        usados.add(relativo)
+        reivindicado = os.path.join(pasta_lote, relativo)
+        destino = os.path.join(pasta_destino, relativo)
+
+        pastas.garantir(os.path.dirname(reivindicado))
+        try:
+            os.rename(origem, reivindicado)
+        except FileNotFoundError:
+            resultado.ja_reivindicados += 1
+            continue
+        except OSError as e:
+            resultado.falhas += 1
+            resultado.erros.append((origem, e))
+            continue
+
+        try:
+            if processar is not None:
+                processar(Path(reivindicado))
+            pastas.garantir(os.path.dirname(destino))
+            # Um x.txt processado antes não é sobrescrito: o novo vira "x (1).txt"
+            _mover_sem_sobrescrever(reivindicado, destino)
+            resultado.movidos += 1
+        except Exception as e:
+            resultado.falhas += 1
+            resultado.erros.append((origem, e))
+            try:
+                if pasta_erros is None:
+                    # Devolvemos para a inbox (sem pisar num x.txt novo que chegou): a próxima execução tenta de novo
+                    _mover_sem_sobrescrever(reivindicado, origem)
+                else:
+                    # Quarentena: alguém olha o erro, corrige e solta o arquivo de novo na inbox
+                    quarentena = os.path.join(pasta_erros, relativo)
+                    pastas.garantir(os.path.dirname(quarentena))
+                    _mover_sem_sobrescrever(reivindicado, quarentena)
+            except OSError as erro_devolucao:
+                # O arquivo fica em em_andamento/ (devolver_reivindicados recupera); o lote segue
+                resultado.erros.append((reivindicado, erro_devolucao))
+    _apagar_pastas_vazias(pasta_lote)
+    return resultado
+
+
+def mover_arquivos(
+    arquivos,
+    raiz,
+    pasta_destino,
+    processar=None,
+    pasta_trabalho=None,
+    pasta_erros=None,
+    max_workers=MAX_WORKERS_PADRAO,
+    tamanho_lote=TAMANHO_LOTE_PADRAO,
+):
+    """
+    Reivindica, processa (opcional) e move cada arquivo de 'raiz' para 'pasta_destino'.
+
+    - arquivos: caminhos ou os.DirEntry (ex: o gerador de varredura_arquivos.varrer),
+      consumidos aos poucos.
+    - processar(caminho): chamado com o arquivo já reivindicado; se lançar exceção,
+      o arquivo volta para a inbox (ou vai para 'pasta_erros', se informada) e conta como falha.
+    - pasta_trabalho: precisa estar no mesmo disco que a raiz (o rename só é atômico assim).
+    """
+    raiz = os.fspath(raiz)
+    pasta_destino = os.fspath(pasta_destino)
+    pasta_trabalho = os.fspath(pasta_trabalho or pasta_trabalho_padrao(pasta_destino))
+    pasta_erros = pasta_erros and os.fspath(pasta_erros)
+    pastas = _Pastas()
+
+    total = ResultadoMovimentacao()
+    inicio = time.perf_counter()
+    arquivos = iter(arquivos)
+    lotes = iter(lambda: list(islice(arquivos, tamanho_lote)), [])
+
+    # Mesma janela deslizante do enriquecimento: no máximo 2x max_workers lotes pendentes
+    tamanho_janela = max_workers * 2
+    pendentes = deque()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for lote in lotes:
+            pendentes.append(
+                executor.submit(
+                    _mover_lote, lote, raiz, pasta_trabalho, pasta_destino, processar, pastas, pasta_erros
+                )
+            )
+            if len(pendentes) >= tamanho_janela:
+                total.somar(pendentes.popleft().result())
+
+        while pendentes:
+            total.somar(pendentes.popleft().result())
+
+    total.segundos = time.perf_counter() - inicio
+    return total
+
+
+def devolver_reivindicados(raiz, pasta_destino, pasta_trabalho=None):
+    """
+    Devolve para a inbox os arquivos que ficaram na pasta de trabalho
+    (o script caiu no meio do processamento). Rode antes de uma nova execução.
+    """
+    raiz = os.fspath(raiz)
+    pasta_trabalho = os.fspath(pasta_trabalho or pasta_trabalho_padrao(pasta_destino))
+    devolvidos = 0
+    if not os.path.isdir(pasta_trabalho):
+        return devolvidos
+    # Um nível de subpastas por lote: em_andamento/<lote>/a/x.txt volta para inbox/a/x.txt
+    for entrada in os.scandir(pasta_trabalho):
+        if not entrada.is_dir():
+            continue
+        for pasta, _, nomes in os.walk(entrada.path):
+            for nome in nomes:
+                reivindicado = os.path.join(pasta, nome)
+                origem = os.path.join(raiz, os.path.relpath(reivindicado, entrada.path))
+                os.makedirs(os.path.dirname(origem), exist_ok=True)
+                _mover_sem_sobrescrever(reivindicado, origem)
+                devolvidos += 1
+        _apagar_pastas_vazias(entrada.path)
+    return devolvidos
@@ -0,0 +1,328 @@
+import ctypes
+import ctypes.util
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+from fnmatch import fnmatch
+
+from movimentacao_arquivos import mover_arquivos, pasta_erros_padrao
+from varredura_arquivos import varrer
+
+# --- OBSERVADOR DE INBOX (EVENTOS EM VEZ DE POLLING) ---
+# Em vez de um agendador rodar o script a cada minuto (e varrer a pasta inteira toda vez),
+# o observador fica ligado e avisa assim que um arquivo novo termina de ser escrito.
+# - Linux: inotify. O kernel avisa quando um arquivo é fechado após escrita (IN_CLOSE_WRITE)
+#   ou movido para dentro da pasta (IN_MOVED_TO). Nenhuma varredura depois da inicial.
+# - Outros sistemas (ou sem inotify): polling. Compara a listagem atual com a anterior
+#   (tamanho + data de modificação) a cada 'intervalo_polling' segundos.
+#
+# "Debounce": um arquivo só é entregue depois de 'espera_estabilizar' segundos sem novos
+# eventos. Assim não pegamos um arquivo pela metade (quem escreve em várias etapas,
+# ou um programa que abre/fecha o arquivo várias vezes).
+#
+# Os arquivos prontos vão para uma fila com tamanho máximo: se o consumidor ficar para trás,
+# o observador espera (e o kernel segura os eventos). Se até o buffer do kernel encher,
+# fazemos uma varredura completa para não perder nada.
+#
+# Uso:
+#     with ObservadorInbox("inbox", "*.txt") as observador:
+#         consumir(observador, consumidor_mover("inbox", "processed", processar=importar_pedido))
+
+ESPERA_ESTABILIZAR_PADRAO = 0.1
+INTERVALO_POLLING_PADRAO = 1.0
+TAMANHO_FILA_PADRAO = 10_000
+
+# Constantes do inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+MASCARA_INOTIFY = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+# Cabeçalho de cada evento: wd (int), mask, cookie, len (unsigned) + 'len' bytes de nome
+CABECALHO_EVENTO = struct.Struct("iIII")
+
+# Intervalo máximo sem checar se pediram para parar
+INTERVALO_CHECAGEM = 0.5
+
+
+def inotify_disponivel():
+    return sys.platform.startswith("linux") and _carregar_libc() is not None
+
+
+def _carregar_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class _Estabilizador:
+    """Guarda o último evento de cada arquivo e libera os que ficaram quietos por 'espera' segundos."""
+
+    def __init__(self, espera):
+        self.espera = espera
+        self._marcas = {}
+
+    def marcar(self, caminho):
+        self._marcas[caminho] = time.monotonic()
+
+    def pendente(self, caminho):
+        return caminho in self._marcas
+
+    def prontos(self):
+        agora = time.monotonic()
+        prontos = [caminho for caminho, marca in self._marcas.items() if agora - marca >= self.espera]
+        for caminho in prontos:
+            del self._marcas[caminho]
+        return prontos
+
+    def proximo_prazo(self):
+        # Quanto falta para o próximo arquivo ficar pronto (None = nenhum pendente)
+        if not self._marcas:
+            return None
+        return max(0.0, min(self._marcas.values()) + self.espera - time.monotonic())
+
+
+class ObservadorInbox:
+    """Observa uma pasta e entrega, numa fila, cada arquivo novo depois de completamente escrito."""
+
+    def __init__(
+        self,
+        pasta,
+        padrao="*",
+        recursivo=True,
+        espera_estabilizar=ESPERA_ESTABILIZAR_PADRAO,
+        intervalo_polling=INTERVALO_POLLING_PADRAO,
+        tamanho_fila=TAMANHO_FILA_PADRAO,
+        usar_inotify=None,
+    ):
+        self.pasta = os.fspath(pasta)
+        self.padrao = padrao
+        self.recursivo = recursivo
+        self.intervalo_polling = intervalo_polling
+        # None = inotify se disponível, senão polling
+        self.usar_inotify = inotify_disponivel() if usar_inotify is None else usar_inotify
+        self.fila = queue.Queue(maxsize=tamanho_fila)
+        self.entregues = 0
+        self.varreduras_completas = 0
+
+        self._estabilizador = _Estabilizador(espera_estabilizar)
+        self._parar = threading.Event()
+        self._thread = None
+
+    @property
+    def modo(self):
+        return "inotify" if self.usar_inotify else f"polling ({self.intervalo_polling}s)"
+
+    def iniciar(self):
+        os.makedirs(self.pasta, exist_ok=True)
+        alvo = self._laco_inotify if self.usar_inotify else self._laco_polling
+        # daemon=True: um Ctrl+C no programa principal não fica preso esperando esta thread
+        self._thread = threading.Thread(target=alvo, name="observador-inbox", daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    @property
+    def ativo(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def eventos(self, timeout=INTERVALO_CHECAGEM):
+        """Gerador com os caminhos prontos, até o observador parar."""
+        while self.ativo or not self.fila.empty():
+            try:
+                yield self.fila.get(timeout=timeout)
+            except queue.Empty:
+                continue
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.parar()
+
+    # --- Entrega ---
+
+    def _aceita(self, caminho):
+        return fnmatch(os.path.basename(caminho), self.padrao)
+
+    def _entregar_prontos(self):
+        for caminho in self._estabilizador.prontos():
+            # O arquivo pode ter sido apagado/movido durante a espera
+            if not os.path.isfile(caminho):
+                continue
+            # Fila cheia: esperamos o consumidor (backpressure), checando se pediram para parar
+            while not self._parar.is_set():
+                try:
+                    self.fila.put(caminho, timeout=INTERVALO_CHECAGEM)
+                    self.entregues += 1
+                    break
+                except queue.Full:
+                    continue
+
+    def _marcar_existentes(self, pasta):
+        # Arquivos que já estavam lá (no início, ou numa subpasta recém-criada/movida)
+        if pasta == self.pasta:
+            self.varreduras_completas += 1
+        for entrada in varrer(pasta, self.padrao, self.recursivo, com_stat=False):
+            self._estabilizador.marcar(entrada.path)
+
+    # --- Linux: inotify ---
+
+    def _laco_inotify(self):
+        libc = _carregar_libc()
+        fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        pastas = {}  # wd -> caminho da pasta
+
+        def observar(pasta):
+            wd = libc.inotify_add_watch(fd, os.fsencode(pasta), MASCARA_INOTIFY)
+            if wd >= 0:
+                pastas[wd] = pasta
+            if not self.recursivo:
+                return
+            # Cada pasta precisa do seu próprio "watch": registramos as subpastas também
+            try:
+                with os.scandir(pasta) as entradas:
+                    subpastas = [entrada.path for entrada in entradas if entrada.is_dir(follow_symlinks=False)]
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                return
+            for subpasta in subpastas:
+                observar(subpasta)
+
+        try:
+            # Primeiro o watch, depois a varredura: um arquivo criado no meio aparece em
+            # pelo menos um dos dois (no pior caso, nos dois: o consumidor precisa tolerar repetição)
+            observar(self.pasta)
+            self._marcar_existentes(self.pasta)
+
+            while not self._parar.is_set():
+                prazo = self._estabilizador.proximo_prazo()
+                espera = INTERVALO_CHECAGEM if prazo is None else min(prazo, INTERVALO_CHECAGEM)
+                legiveis, _, _ = select.select([fd], [], [], espera)
+                if legiveis:
+                    self._ler_eventos(fd, pastas, observar)
+                self._entregar_prontos()
+        finally:
+            os.close(fd)
+
+    def _ler_eventos(self, fd, pastas, observar):
+        try:
+            dados = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        posicao = 0
+        while posicao < len(dados):
+            wd, mascara, _, tamanho = CABECALHO_EVENTO.unpack_from(dados, posicao)
+            posicao += CABECALHO_EVENTO.size
+            nome = dados[posicao : posicao + tamanho].rstrip(b"\0")
+            posicao += tamanho
+
+            if mascara & IN_Q_OVERFLOW:
+                # O kernel descartou eventos: só uma varredura completa garante que nada se perdeu
+                self._marcar_existentes(self.pasta)
+                continue
+            if mascara & IN_IGNORED:
+                # A pasta foi apagada (ou movida para fora)
+                pastas.pop(wd, None)
+                continue
+            pasta = pastas.get(wd)
+            if pasta is None or not nome:
+                continue
+            caminho = os.path.join(pasta, os.fsdecode(nome))
+
+            if mascara & IN_ISDIR:
+                if self.recursivo and mascara & (IN_CREATE | IN_MOVED_TO):
+                    observar(caminho)
+                    self._marcar_existentes(caminho)
+            elif not self._aceita(caminho):
+                continue
+            elif mascara & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                # Terminou de escrever (ou chegou pronto via rename): começa a contar o debounce
+                self._estabilizador.marcar(caminho)
+            elif mascara & IN_MODIFY and self._estabilizador.pendente(caminho):
+                # Reabriu para escrever durante a espera: reinicia a contagem
+                self._estabilizador.marcar(caminho)
+
+    # --- Portável: polling ---
+
+    def _laco_polling(self):
+        anteriores = {}  # caminho -> (tamanho, modificação) da última listagem
+        while not self._parar.is_set():
+            atuais = {}
+            for entrada in varrer(self.pasta, self.padrao, self.recursivo):
+                try:
+                    info = entrada.stat()
+                except OSError:
+                    continue
+                atuais[entrada.path] = (info.st_size, info.st_mtime_ns)
+            self.varreduras_completas += 1
+
+            for caminho, assinatura in atuais.items():
+                if anteriores.get(caminho) != assinatura:
+                    # Novo ou mudou desde a última olhada: ainda pode estar sendo escrito
+                    self._estabilizador.marcar(caminho)
+            anteriores = atuais
+
+            self._entregar_prontos()
+            self._parar.wait(self.intervalo_polling)
+
+
+def consumir(observador, consumidor, tamanho_lote=100, espera_lote=0.05):
+    """
+    Entrega os arquivos do observador ao consumidor em lotes (consumidor(lista_de_caminhos)).
+
+    Um lote fecha com 'tamanho_lote' arquivos ou 'espera_lote' segundos depois do primeiro:
+    um arquivo sozinho é processado na hora, uma rajada de milhares vai em lotes.
+    Roda até o observador parar (ou Ctrl+C).
+    """
+    while observador.ativo or not observador.fila.empty():
+        try:
+            lote = [observador.fila.get(timeout=INTERVALO_CHECAGEM)]
+        except queue.Empty:
+            continue
+        prazo = time.monotonic() + espera_lote
+        while len(lote) < tamanho_lote:
+            try:
+                lote.append(observador.fila.get(timeout=max(0.0, prazo - time.monotonic())))
+            except queue.Empty:
+                break
+
+        try:
+            consumidor(lote)
+        except Exception as e:
+            # Um lote com problema não derruba o observador (ele roda sem parar)
+            print(f"ERRO no consumidor ({len(lote)} arquivos): {e}")
+
+
+def consumidor_mover(raiz, pasta_destino, processar=None, pasta_erros=None, **opcoes):
+    """
+    Consumidor pronto: reivindica, processa e move cada lote para 'pasta_destino' (ver movimentacao_arquivos.py).
+
+    Os arquivos que falham vão para 'pasta_erros' (padrão: <pasta_destino>.erros), nunca de volta
+    para a inbox: lá eles gerariam um evento novo e o observador tentaria de novo sem parar.
+    """
+    pasta_erros = pasta_erros or pasta_erros_padrao(pasta_destino)
+
+    def mover(lote):
+        resultado = mover_arquivos(lote, raiz, pasta_destino, processar=processar, pasta_erros=pasta_erros, **opcoes)
+        for caminho, erro in resultado.erros:
+            print(f"FALHOU: {caminho} ({erro}) -> movido para {pasta_erros}")
+        return resultado
+
+    return mover
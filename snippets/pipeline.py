@@ -0,0 +1,350 @@
+import heapq
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+
+# --- PIPELINE COM FILAS LIMITADAS (BACKPRESSURE) ---
+# Automação típica: ler IDs -> consultar API -> limpar com pandas -> gravar relatório.
+# Rodando uma etapa depois da outra, a rede, a CPU e o disco se revezam: enquanto o pandas
+# limpa, ninguém está consultando a API, e enquanto o Excel grava, ninguém está limpando.
+#
+# Aqui cada etapa roda nas suas próprias threads, ligada à seguinte por uma fila de tamanho fixo:
+# - As etapas trabalham ao mesmo tempo (rede, CPU e disco se sobrepõem).
+# - Backpressure: se a escrita é lenta, a fila dela enche, a limpeza fica esperando para entregar,
+#   a fila da limpeza enche... até a fonte parar de ler IDs. A memória nunca passa do que cabe nas filas.
+# - Cada etapa tem quantos trabalhadores quiser (ex: 8 consultando a API, 1 gravando).
+# - em_ordem=True: a etapa recebe os itens na ordem da fonte, mesmo que as anteriores terminem fora de ordem.
+# - cancelar() (ou Ctrl+C): a fonte para de ler, e o que já entrou termina de passar (o relatório fecha certinho).
+#   Um erro em qualquer etapa interrompe tudo e é relançado por executar().
+# - No fim, a utilização de cada etapa: quem está ocupado quase 100% do tempo é o gargalo.
+#
+# Uso:
+#     pipeline = Pipeline(tamanho_fila=8)
+#     pipeline.etapa("consulta", buscar_lote, trabalhadores=8)      # I/O: várias threads
+#     pipeline.etapa("limpeza", limpar_lote, trabalhadores=2)       # pandas/numpy
+#     pipeline.etapa("escrita", relatorio.escrever_bloco, em_ordem=True)
+#     relatorio_pipeline = pipeline.executar(lotes_de_ids)
+#     print(relatorio_pipeline)
+#
+# Cada função recebe um item e devolve o item para a próxima etapa (None descarta o item).
+# Dica: passe lotes (ex: 100 IDs, um DataFrame de 5 mil linhas), e não itens avulsos:
+# a fila cobra um pouco por item, e o pandas rende muito mais com blocos.
+
+TAMANHO_FILA_PADRAO = 8
+
+# De quanto em quanto tempo uma thread bloqueada confere se a pipeline foi interrompida
+INTERVALO_VERIFICACAO_S = 0.1
+
+# Marca de fim da entrada (um por trabalhador) e de item descartado.
+# O descartado continua andando (sem chamar as funções) para as etapas em_ordem não esperarem por ele.
+_FIM = object()
+_DESCARTADO = object()
+
+
+class PipelineInterrompida(Exception):
+    """Sinal interno: a pipeline foi abortada enquanto a thread esperava uma fila."""
+
+
+@dataclass
+class EstatisticasEtapa:
+    nome: str
+    trabalhadores: int
+    tamanho_fila: int
+    itens: int = 0
+    ocupado_s: float = 0.0
+    # Tempo esperando item da etapa anterior: quem está antes é lento
+    esperando_entrada_s: float = 0.0
+    # Tempo esperando vaga na fila seguinte (backpressure): quem está depois é lento
+    esperando_saida_s: float = 0.0
+    fila_max: int = 0
+
+    def utilizacao(self, duracao_s):
+        """Fração do tempo em que os trabalhadores estavam de fato trabalhando (0 a 1)."""
+        if duracao_s <= 0:
+            return 0.0
+        return min(self.ocupado_s / (duracao_s * self.trabalhadores), 1.0)
+
+
+@dataclass
+class RelatorioPipeline:
+    duracao_s: float
+    etapas: list = field(default_factory=list)
+    cancelado: bool = False
+
+    @property
+    def gargalo(self):
+        # A etapa mais ocupada limita a vazão: é ela que vale a pena acelerar (ou dar mais trabalhadores)
+        return max(self.etapas, key=lambda etapa: etapa.utilizacao(self.duracao_s)).nome if self.etapas else None
+
+    def resumo(self):
+        return {
+            "duracao_s": round(self.duracao_s, 3),
+            "cancelado": self.cancelado,
+            "gargalo": self.gargalo,
+            "etapas": {
+                etapa.nome: {
+                    "trabalhadores": etapa.trabalhadores,
+                    "itens": etapa.itens,
+                    "utilizacao": round(etapa.utilizacao(self.duracao_s), 3),
+                    "ocupado_s": round(etapa.ocupado_s, 3),
+                    "esperando_entrada_s": round(etapa.esperando_entrada_s, 3),
+                    "esperando_saida_s": round(etapa.esperando_saida_s, 3),
+                    "fila_max": etapa.fila_max,
+                }
+                for etapa in self.etapas
+            },
+        }
+
+    def __str__(self):
+        linhas = [
+            f"Pipeline: {self.duracao_s:.2f}s{' (cancelada)' if self.cancelado else ''} | gargalo: {self.gargalo}",
+            f"  {'etapa':<12} {'trab':>4} {'itens':>8} {'util.':>6} {'ocupado':>9} "
+            f"{'esp. entrada':>13} {'esp. saída':>11} {'fila máx':>9}",
+        ]
+        for etapa in self.etapas:
+            linhas.append(
+                f"  {etapa.nome:<12} {etapa.trabalhadores:>4} {etapa.itens:>8} "
+                f"{etapa.utilizacao(self.duracao_s):>6.0%} {etapa.ocupado_s:>8.2f}s "
+                f"{etapa.esperando_entrada_s:>12.2f}s {etapa.esperando_saida_s:>10.2f}s "
+                + (f"{etapa.fila_max:>4}/{etapa.tamanho_fila}" if etapa.tamanho_fila else f"{'-':>9}")
+            )
+        return "\n".join(linhas)
+
+
+@dataclass
+class _Etapa:
+    nome: str
+    funcao: object
+    trabalhadores: int
+    tamanho_fila: int
+    em_ordem: bool
+
+
+class Pipeline:
+    """Etapas ligadas por filas limitadas; cada etapa roda em 'trabalhadores' threads."""
+
+    def __init__(self, tamanho_fila=TAMANHO_FILA_PADRAO, max_em_voo=None):
+        """
+        tamanho_fila: vagas da fila de entrada de cada etapa (padrão de etapa()).
+        max_em_voo: quantos itens podem estar dentro da pipeline ao mesmo tempo.
+        O padrão (vagas de todas as filas + 2 por trabalhador) só precisa ser mexido
+        quando uma etapa em_ordem fica segurando muitos itens à espera de um atrasado.
+        """
+        self.tamanho_fila = tamanho_fila
+        self.max_em_voo = max_em_voo
+        self._etapas = []
+        self._cancelado = threading.Event()
+        self._abortado = threading.Event()
+
+    def etapa(self, nome, funcao, trabalhadores=1, tamanho_fila=None, em_ordem=False):
+        if trabalhadores < 1:
+            raise ValueError("trabalhadores precisa ser pelo menos 1")
+        if em_ordem and trabalhadores > 1:
+            # Com 2 threads, a ordem de entrega se perderia de novo dentro da própria etapa
+            raise ValueError(f"A etapa '{nome}' é em_ordem: ela precisa ter um trabalhador só")
+        self._etapas.append(_Etapa(nome, funcao, trabalhadores, tamanho_fila or self.tamanho_fila, em_ordem))
+        return self
+
+    def cancelar(self):
+        """Para de ler a fonte; os itens que já entraram terminam de passar por todas as etapas."""
+        self._cancelado.set()
+
+    def executar(self, fonte, instrumentacao=None):
+        """
+        Passa cada item da fonte (qualquer iterável) por todas as etapas. Devolve um RelatorioPipeline.
+
+        Com uma Instrumentacao, o tempo ocupado de cada etapa entra no resumo dela, e o relatório
+        da pipeline vai em instrumentacao.extras["pipeline"].
+        """
+        if not self._etapas:
+            raise ValueError("A pipeline não tem etapas")
+        self._cancelado.clear()
+        self._abortado.clear()
+
+        filas = [queue.Queue(maxsize=etapa.tamanho_fila) for etapa in self._etapas]
+        estatisticas = [
+            EstatisticasEtapa(etapa.nome, etapa.trabalhadores, etapa.tamanho_fila) for etapa in self._etapas
+        ]
+        estatisticas_fonte = EstatisticasEtapa("fonte", 1, 0)
+        max_em_voo = self.max_em_voo or sum(e.tamanho_fila + 2 * e.trabalhadores for e in self._etapas)
+        self._vagas = threading.BoundedSemaphore(max_em_voo)
+        self._restantes = [etapa.trabalhadores for etapa in self._etapas]
+        self._fila_max = [0] * len(self._etapas)
+        self._trava = threading.Lock()
+        self._erro = None
+
+        threads = [
+            threading.Thread(
+                target=self._ler_fonte, args=(fonte, filas, estatisticas_fonte), name="fonte", daemon=True
+            )
+        ]
+        for indice, etapa in enumerate(self._etapas):
+            for numero in range(etapa.trabalhadores):
+                threads.append(
+                    threading.Thread(
+                        target=self._trabalhar,
+                        args=(indice, filas, estatisticas[indice]),
+                        name=f"{etapa.nome}-{numero}",
+                        daemon=True,
+                    )
+                )
+
+        inicio = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        self._esperar(threads)
+        for etapa, fila_max in zip(estatisticas, self._fila_max):
+            etapa.fila_max = fila_max
+        relatorio = RelatorioPipeline(
+            time.perf_counter() - inicio, [estatisticas_fonte, *estatisticas], self._cancelado.is_set()
+        )
+
+        if instrumentacao is not None:
+            for etapa in relatorio.etapas:
+                instrumentacao.somar_etapa(etapa.nome, etapa.ocupado_s, etapa.itens)
+            instrumentacao.extras["pipeline"] = relatorio.resumo()
+        if self._erro is not None:
+            raise self._erro
+        return relatorio
+
+    # --- Funcionamento interno ---
+
+    def _esperar(self, threads):
+        # join em fatias curtas: assim o Ctrl+C chega até aqui em vez de ficar preso no join
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(INTERVALO_VERIFICACAO_S)
+        except KeyboardInterrupt:
+            if self._cancelado.is_set():
+                # Segundo Ctrl+C: não espera mais nada
+                self._abortado.set()
+                raise
+            print("\nCancelando: terminando os itens que já entraram (Ctrl+C de novo para abortar)...")
+            self.cancelar()
+            self._esperar(threads)
+
+    def _falhar(self, erro):
+        with self._trava:
+            if self._erro is None:
+                self._erro = erro
+        self._abortado.set()
+
+    def _bloquear(self, operacao, *args):
+        # put/get/acquire em fatias curtas, para uma thread parada numa fila perceber o abort
+        while not self._abortado.is_set():
+            try:
+                return operacao(*args, timeout=INTERVALO_VERIFICACAO_S)
+            except (queue.Full, queue.Empty):
+                continue
+        raise PipelineInterrompida
+
+    def _entregar(self, filas, destino, item, estatisticas):
+        inicio = time.perf_counter()
+        self._bloquear(filas[destino].put, item)
+        estatisticas.esperando_saida_s += time.perf_counter() - inicio
+        # Ocupação da fila de entrada da etapa 'destino' (aproximada: várias threads atualizam sem trava)
+        ocupacao = filas[destino].qsize()
+        if ocupacao > self._fila_max[destino]:
+            self._fila_max[destino] = ocupacao
+
+    def _ler_fonte(self, fonte, filas, estatisticas):
+        try:
+            iterador = iter(fonte)
+            sequencia = 0
+            while not self._cancelado.is_set():
+                # A vaga é pega ANTES de ler o próximo item: com a pipeline cheia, a fonte nem lê
+                inicio = time.perf_counter()
+                while not self._vagas.acquire(timeout=INTERVALO_VERIFICACAO_S):
+                    if self._abortado.is_set():
+                        raise PipelineInterrompida
+                estatisticas.esperando_saida_s += time.perf_counter() - inicio
+
+                inicio = time.perf_counter()
+                try:
+                    item = next(iterador)
+                except StopIteration:
+                    self._vagas.release()
+                    break
+                estatisticas.ocupado_s += time.perf_counter() - inicio
+                estatisticas.itens += 1
+
+                self._entregar(filas, 0, (sequencia, item), estatisticas)
+                sequencia += 1
+            for _ in range(self._etapas[0].trabalhadores):
+                self._bloquear(filas[0].put, _FIM)
+        except PipelineInterrompida:
+            pass
+        except BaseException as erro:
+            self._falhar(erro)
+
+    def _proximo(self, entrada, estatisticas, pendentes, esperado):
+        # Próximo item da fila; numa etapa em_ordem, o próximo NA ORDEM da fonte
+        inicio = time.perf_counter()
+        try:
+            if esperado is None:
+                return self._bloquear(entrada.get)
+            while not pendentes or pendentes[0][0] != esperado:
+                item = self._bloquear(entrada.get)
+                if item is _FIM:
+                    if not pendentes:
+                        return _FIM
+                    # Todos os itens já chegaram: entregamos os que sobraram e devolvemos o FIM
+                    # para a próxima chamada (a etapa em_ordem é a única que lê esta fila, então há vaga)
+                    entrada.put_nowait(_FIM)
+                    return heapq.heappop(pendentes)
+                heapq.heappush(pendentes, item)
+            return heapq.heappop(pendentes)
+        finally:
+            estatisticas.esperando_entrada_s += time.perf_counter() - inicio
+
+    def _trabalhar(self, indice, filas, estatisticas):
+        etapa = self._etapas[indice]
+        entrada = filas[indice]
+        ultima_etapa = indice + 1 == len(filas)
+        # Cada thread conta no seu próprio objeto e soma no da etapa no fim (sem disputar trava por item)
+        minhas = EstatisticasEtapa(etapa.nome, 1, etapa.tamanho_fila)
+        pendentes = []
+        esperado = 0 if etapa.em_ordem else None
+        try:
+            while True:
+                envelope = self._proximo(entrada, minhas, pendentes, esperado)
+                if envelope is _FIM:
+                    break
+                sequencia, item = envelope
+                if esperado is not None:
+                    esperado = sequencia + 1
+
+                if item is not _DESCARTADO:
+                    inicio = time.perf_counter()
+                    item = etapa.funcao(item)
+                    minhas.ocupado_s += time.perf_counter() - inicio
+                    minhas.itens += 1
+                    if item is None:
+                        item = _DESCARTADO
+
+                if ultima_etapa:
+                    # Saiu da última etapa: libera a vaga para a fonte ler mais um item
+                    self._vagas.release()
+                else:
+                    self._entregar(filas, indice + 1, (sequencia, item), minhas)
+        except PipelineInterrompida:
+            pass
+        except BaseException as erro:
+            self._falhar(erro)
+        finally:
+            with self._trava:
+                estatisticas.itens += minhas.itens
+                estatisticas.ocupado_s += minhas.ocupado_s
+                estatisticas.esperando_entrada_s += minhas.esperando_entrada_s
+                estatisticas.esperando_saida_s += minhas.esperando_saida_s
+                self._restantes[indice] -= 1
+                ultimo = self._restantes[indice] == 0
+            if ultimo and not ultima_etapa and not self._abortado.is_set():
+                # O último trabalhador da etapa avisa a etapa seguinte que acabou
+                try:
+                    for _ in range(self._etapas[indice + 1].trabalhadores):
+                        self._bloquear(filas[indice + 1].put, _FIM)
+                except PipelineInterrompida:
+                    pass
@@ -0,0 +1,257 @@
+import contextlib
+import importlib
+import io
+import multiprocessing
+import os
+import queue
+import runpy
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+# --- TRABALHADORES PYTHON "QUENTES" ---
+# Rodar milhares de scripts Python pequenos com subprocess.run(["python", "-c", ...]) paga, a cada
+# chamada, a partida do interpretador + os imports (só o pandas leva centenas de ms).
+# Aqui mantemos um pool de processos Python que já nasceram com os imports comuns carregados;
+# cada tarefa (código, script ou função) vai pelo pipe e o resultado volta pelo mesmo caminho.
+#
+# Isolamento (o mesmo do env=meu_ambiente / cwd=pasta_alvo do arsenal_subprocess.py):
+# - env e cwd valem SÓ durante a tarefa: o trabalhador restaura os originais depois.
+# - stdout/stderr da tarefa são capturados e devolvidos no resultado.
+# - sys.exit() / exceções viram código de saída + traceback, sem derrubar o trabalhador.
+# - Timeout: o trabalhador que travou é morto e substituído por um novo.
+# Diferente de um processo novo: módulos importados (e o estado global deles) continuam
+# carregados entre tarefas. Use max_tarefas_por_trabalhador para reciclar de tempos em tempos.
+#
+# Uso:
+#     with PoolPython(tamanho=4, preimportar=["pandas", "requests"]) as pool:
+#         resultado = pool.executar("import pandas as pd; print(pd.__version__)", env=meu_ambiente, cwd=pasta_alvo)
+#         print(resultado.saida)
+
+PREIMPORTAR_PADRAO = ("pandas", "requests")
+TAMANHO_PADRAO = os.cpu_count() or 4
+
+# "spawn": cada trabalhador é um interpretador limpo (igual no Linux, Mac e Windows),
+# sem herdar threads/locks do processo pai como aconteceria com fork
+CONTEXTO = multiprocessing.get_context("spawn")
+
+
+@dataclass
+class ResultadoTrabalho:
+    codigo_saida: int = 0
+    # Retorno da função (em chamar); None para código/script
+    valor: object = None
+    saida: str = ""
+    erros: str = ""
+    segundos: float = 0.0
+    expirou: bool = False
+
+    @property
+    def sucesso(self):
+        return self.codigo_saida == 0 and not self.expirou
+
+
+# --- Lado do trabalhador (roda no processo filho) ---
+
+
+@contextlib.contextmanager
+def _ambiente_isolado(env, env_extra, cwd, argv):
+    env_original = os.environ.copy()
+    cwd_original = os.getcwd()
+    argv_original = sys.argv
+    path_original = list(sys.path)
+    try:
+        if env is not None:
+            # Mesmo comportamento do subprocess: env substitui o ambiente inteiro
+            os.environ.clear()
+            os.environ.update(env)
+        if env_extra:
+            os.environ.update(env_extra)
+        if cwd is not None:
+            os.chdir(cwd)
+        if argv is not None:
+            sys.argv = argv
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(env_original)
+        os.chdir(cwd_original)
+        sys.argv = argv_original
+        sys.path[:] = path_original
+
+
+def _rodar_pedido(pedido):
+    tipo, alvo, args, kwargs, env, env_extra, cwd = pedido
+    resultado = ResultadoTrabalho()
+    saida, erros = io.StringIO(), io.StringIO()
+    inicio = time.perf_counter()
+    argv = [alvo] if tipo == "script" else None
+    try:
+        with (
+            _ambiente_isolado(env, env_extra, cwd, argv),
+            contextlib.redirect_stdout(saida),
+            contextlib.redirect_stderr(erros),
+        ):
+            if tipo == "codigo":
+                # Como o python -c: o código roda como __main__, num namespace novo
+                exec(compile(alvo, "<tarefa>", "exec"), {"__name__": "__main__"})
+            elif tipo == "script":
+                runpy.run_path(alvo, run_name="__main__")
+            else:
+                resultado.valor = alvo(*args, **kwargs)
+    except SystemExit as e:
+        # sys.exit(3) -> código 3; sys.exit("mensagem") -> código 1, mensagem no stderr
+        if isinstance(e.code, int) or e.code is None:
+            resultado.codigo_saida = e.code or 0
+        else:
+            resultado.codigo_saida = 1
+            erros.write(f"{e.code}\n")
+    except BaseException:
+        resultado.codigo_saida = 1
+        erros.write(traceback.format_exc())
+    resultado.segundos = time.perf_counter() - inicio
+    resultado.saida = saida.getvalue()
+    resultado.erros = erros.getvalue()
+    return resultado
+
+
+def _laco_trabalhador(conexao, preimportar):
+    for modulo in preimportar:
+        try:
+            importlib.import_module(modulo)
+        except ImportError:
+            # Biblioteca opcional não instalada: a tarefa que precisar dela dá o erro
+            pass
+    conexao.send("pronto")
+    while True:
+        try:
+            pedido = conexao.recv()
+        except EOFError:
+            break
+        if pedido is None:
+            break
+        try:
+            conexao.send(_rodar_pedido(pedido))
+        except Exception:
+            # O retorno da função não pôde ser serializado (pickle)
+            conexao.send(ResultadoTrabalho(codigo_saida=1, erros=traceback.format_exc()))
+
+
+# --- Lado do pool (processo principal) ---
+
+
+class _Trabalhador:
+    def __init__(self, preimportar):
+        self.conexao, conexao_filho = CONTEXTO.Pipe()
+        # daemon=True: se o programa principal sair sem fechar o pool, os trabalhadores morrem junto
+        # (efeito colateral: uma tarefa não pode criar outro multiprocessing.Process)
+        self.processo = CONTEXTO.Process(target=_laco_trabalhador, args=(conexao_filho, preimportar), daemon=True)
+        self.processo.start()
+        conexao_filho.close()
+        self.tarefas = 0
+
+    def esperar_pronto(self):
+        # Bloqueia até os imports terminarem
+        return self.conexao.recv()
+
+    def encerrar(self, forcar=False):
+        if not forcar:
+            try:
+                self.conexao.send(None)
+            except (BrokenPipeError, OSError):
+                forcar = True
+        if forcar:
+            self.processo.kill()
+        self.processo.join()
+        self.conexao.close()
+
+
+class PoolPython:
+    """Pool de processos Python com imports pré-carregados. Pode ser usado por várias threads."""
+
+    def __init__(self, tamanho=TAMANHO_PADRAO, preimportar=PREIMPORTAR_PADRAO, max_tarefas_por_trabalhador=None):
+        self.tamanho = tamanho
+        self.preimportar = tuple(preimportar)
+        self.max_tarefas_por_trabalhador = max_tarefas_por_trabalhador
+        self.reinicios = 0
+        self._livres = queue.Queue()
+        self._trabalhadores = []
+        self._trava = threading.Lock()
+
+    def iniciar(self):
+        # Todos sobem ao mesmo tempo: o custo de partida é pago uma vez só, em paralelo
+        novos = [_Trabalhador(self.preimportar) for _ in range(self.tamanho)]
+        for trabalhador in novos:
+            trabalhador.esperar_pronto()
+            self._trabalhadores.append(trabalhador)
+            self._livres.put(trabalhador)
+        return self
+
+    def fechar(self):
+        for trabalhador in self._trabalhadores:
+            trabalhador.encerrar()
+        self._trabalhadores = []
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def executar(self, codigo, env=None, env_extra=None, cwd=None, timeout=None):
+        """Equivalente a subprocess.run(["python", "-c", codigo], env=env, cwd=cwd)."""
+        return self._enviar(("codigo", codigo, (), {}, env, env_extra, cwd), timeout)
+
+    def executar_script(self, arquivo, env=None, env_extra=None, cwd=None, timeout=None):
+        """Equivalente a subprocess.run(["python", arquivo], ...)."""
+        return self._enviar(("script", os.fspath(arquivo), (), {}, env, env_extra, cwd), timeout)
+
+    def chamar(self, funcao, *args, env=None, env_extra=None, cwd=None, timeout=None, **kwargs):
+        """Chama funcao(*args, **kwargs) num trabalhador. A função precisa estar num módulo importável."""
+        return self._enviar(("chamada", funcao, args, kwargs, env, env_extra, cwd), timeout)
+
+    def mapear(self, codigos, **opcoes):
+        """
+        Executa vários códigos em paralelo (um por trabalhador livre), devolvendo na ordem de entrada.
+        'opcoes' (env, env_extra, cwd, timeout) valem para todos.
+        """
+        with ThreadPoolExecutor(max_workers=self.tamanho) as executor:
+            yield from executor.map(lambda codigo: self.executar(codigo, **opcoes), codigos)
+
+    def _enviar(self, pedido, timeout):
+        trabalhador = self._livres.get()
+        try:
+            trabalhador.conexao.send(pedido)
+            # poll(timeout) espera a resposta sem bloquear para sempre
+            if trabalhador.conexao.poll(timeout):
+                resultado = trabalhador.conexao.recv()
+                trabalhador.tarefas += 1
+                if self.max_tarefas_por_trabalhador and trabalhador.tarefas >= self.max_tarefas_por_trabalhador:
+                    trabalhador = self._substituir(trabalhador, forcar=False)
+            else:
+                # Travou: matamos o processo (e o que ele estava fazendo) e subimos outro
+                trabalhador = self._substituir(trabalhador)
+                resultado = ResultadoTrabalho(codigo_saida=None, expirou=True, segundos=timeout)
+        except (EOFError, BrokenPipeError, OSError):
+            # O trabalhador morreu no meio da tarefa (ex: falha de segmentação, falta de memória)
+            morto = trabalhador
+            trabalhador = self._substituir(morto)
+            resultado = ResultadoTrabalho(
+                codigo_saida=morto.processo.exitcode, erros="O processo trabalhador morreu durante a tarefa."
+            )
+        finally:
+            # Só volta para a fila depois de substituído: nenhuma outra thread pega um trabalhador morto
+            self._livres.put(trabalhador)
+        return resultado
+
+    def _substituir(self, trabalhador, forcar=True):
+        trabalhador.encerrar(forcar=forcar)
+        novo = _Trabalhador(self.preimportar)
+        novo.esperar_pronto()
+        with self._trava:
+            self._trabalhadores[self._trabalhadores.index(trabalhador)] = novo
+            self.reinicios += 1
+        return novo
@@ -0,0 +1,71 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fnmatch import fnmatch
+
+# --- VARREDURA DE PASTAS EM PARALELO ---
+# Versão "de produção" da seção 6 do arsenal_pathlib.py (glob/rglob).
+# Com centenas de milhares de arquivos em subpastas, o rglob serial vira o gargalo:
+# - os.scandir já devolve o tipo de cada entrada (arquivo/pasta) junto com a listagem,
+#   sem um stat() extra por arquivo, e a entrada (DirEntry) guarda o stat depois da 1ª chamada.
+# - Cada subpasta é listada numa thread do pool: enquanto uma espera o disco
+#   (ou o compartilhamento de rede), as outras continuam trabalhando.
+# - Os arquivos saem num gerador assim que a pasta deles é listada
+#   (dá para começar a processar antes de a varredura terminar).
+#
+# Uso:
+#     for entrada in varrer("inbox", "*.txt"):
+#         print(entrada.path, entrada.stat().st_size)   # stat() já veio da varredura
+
+MAX_WORKERS_PADRAO = 8
+
+
+def _listar_pasta(pasta, padrao, recursivo, com_stat):
+    arquivos = []
+    subpastas = []
+    try:
+        with os.scandir(pasta) as entradas:
+            for entrada in entradas:
+                try:
+                    # follow_symlinks=False: um link para a pasta pai não vira loop infinito
+                    if entrada.is_dir(follow_symlinks=False):
+                        if recursivo:
+                            subpastas.append(entrada.path)
+                    elif entrada.is_file() and fnmatch(entrada.name, padrao):
+                        if com_stat:
+                            # O stat fica guardado na entrada: quem consumir não paga de novo
+                            entrada.stat()
+                        arquivos.append(entrada)
+                except OSError:
+                    # Arquivo apagado/movido entre a listagem e o stat (outro processo pegou antes)
+                    continue
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        # Pasta removida durante a varredura, ou sem permissão de leitura: seguimos com o resto
+        pass
+    return arquivos, subpastas
+
+
+def varrer(raiz, padrao="*", recursivo=True, max_workers=MAX_WORKERS_PADRAO, com_stat=True):
+    """
+    Gerador com os arquivos (os.DirEntry) de 'raiz' cujo nome casa com 'padrao' (ex: "*.pdf").
+
+    - recursivo: entra nas subpastas (como o rglob); False lista só a raiz (como o glob).
+    - com_stat: já faz o stat() na thread do pool (tamanho/data saem de graça depois).
+
+    A ordem não é garantida: cada pasta sai quando termina de ser listada.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pendentes = {executor.submit(_listar_pasta, os.fspath(raiz), padrao, recursivo, com_stat)}
+        try:
+            while pendentes:
+                prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                for futuro in prontos:
+                    arquivos, subpastas = futuro.result()
+                    # As subpastas entram na fila antes do yield: o pool continua trabalhando
+                    # enquanto quem chamou processa os arquivos desta pasta
+                    for subpasta in subpastas:
+                        pendentes.add(executor.submit(_listar_pasta, subpasta, padrao, recursivo, com_stat))
+                    yield from arquivos
+        finally:
+            # Quem chamou parou no meio (break): não listamos as pastas que ainda estavam na fila
+            for futuro in pendentes:
+                futuro.cancel()